@@ -135,6 +135,20 @@ def get_current_user(
     return user
 
 
+def get_current_user_for_stream(
+    access_token: Optional[str] = None,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+    db: Session = Depends(get_db)
+) -> User:
+    """
+    Same as get_current_user, but also accepts ?access_token=.
+    The browser EventSource API cannot send an Authorization header.
+    """
+    if credentials is None and access_token:
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=access_token)
+    return get_current_user(credentials=credentials, db=db)
+
+
 def get_current_user_optional(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
     db: Session = Depends(get_db)
@@ -189,6 +203,16 @@ require_doctor = require_role("DOCTOR")
 require_staff = require_role("NURSE", "DOCTOR")
 
 
+def require_staff_stream(user: User = Depends(get_current_user_for_stream)) -> User:
+    """NURSE or DOCTOR check for streaming endpoints (token may come from the query string)."""
+    if user.role not in ("NURSE", "DOCTOR"):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied. Required role: NURSE, DOCTOR",
+        )
+    return user
+
+
 # =============================================================================
 # User Authentication
 # =============================================================================
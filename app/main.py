@@ -10,10 +10,13 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 
 from .db import engine, Base
+from .models import PatientIntake, ClinicalSummary
 from sqlalchemy import text
 from .paths import STATIC_DIR
 from .routers import api, ui
 from .routers.auth_router import router as auth_router
+from .services.triage_queue import triage_queue
+from .services.search import ensure_search_index
 
 app = FastAPI(title="Clinic Co-Pilot", version="0.1.0")
 
@@ -43,6 +46,13 @@ def on_startup():
     """
     Base.metadata.create_all(bind=engine)
     _ensure_doctor_status_columns()
+    _ensure_summary_columns()
+    _ensure_user_columns()
+    _ensure_indexes()
+    _ensure_change_counter()
+    with engine.begin() as conn:
+        ensure_search_index(conn)
+    triage_queue.rebuild()
 
 
 def _ensure_doctor_status_columns() -> None:
@@ -72,6 +82,12 @@ def _ensure_doctor_status_columns() -> None:
             conn.execute(text("ALTER TABLE patient_intakes ADD COLUMN medications_original TEXT"))
         if "allergies_original" not in col_names:
             conn.execute(text("ALTER TABLE patient_intakes ADD COLUMN allergies_original TEXT"))
+        if "translation_status" not in col_names:
+            conn.execute(text("ALTER TABLE patient_intakes ADD COLUMN translation_status VARCHAR(20) DEFAULT 'NOT_NEEDED'"))
+        if "change_seq" not in col_names:
+            conn.execute(text("ALTER TABLE patient_intakes ADD COLUMN change_seq INTEGER DEFAULT 0"))
+        if "updated_at" not in col_names:
+            conn.execute(text("ALTER TABLE patient_intakes ADD COLUMN updated_at DATETIME"))
 
         # Normalize existing decisions into doctor_status
         conn.execute(text("""
@@ -101,3 +117,69 @@ def _ensure_doctor_status_columns() -> None:
                 ELSE 'PENDING'
             END;
         """))
+
+
+def _ensure_summary_columns() -> None:
+    """
+    Lightweight migration for clinical_summaries columns added after launch.
+    """
+    with engine.begin() as conn:
+        cols = conn.execute(text("PRAGMA table_info(clinical_summaries)")).fetchall()
+        col_names = {row[1] for row in cols}
+
+        if "source" not in col_names:
+            conn.execute(text("ALTER TABLE clinical_summaries ADD COLUMN source VARCHAR(20) DEFAULT 'ai'"))
+
+
+def _ensure_user_columns() -> None:
+    """
+    Lightweight migration for users columns added after launch.
+    """
+    with engine.begin() as conn:
+        cols = conn.execute(text("PRAGMA table_info(users)")).fetchall()
+        col_names = {row[1] for row in cols}
+
+        if "preferred_language" not in col_names:
+            conn.execute(text("ALTER TABLE users ADD COLUMN preferred_language VARCHAR(10) DEFAULT 'en'"))
+
+
+def _ensure_indexes() -> None:
+    """
+    create_all() skips indexes on tables that already exist,
+    so add any newer composite indexes to older SQLite files here.
+    """
+    with engine.begin() as conn:
+        for table in (PatientIntake.__table__, ClinicalSummary.__table__):
+            for index in table.indexes:
+                index.create(bind=conn, checkfirst=True)
+
+
+def _ensure_change_counter() -> None:
+    """
+    Seed the shared intake change counter so writers only ever UPDATE it.
+    Rows from before change_seq existed (still 0) get their own sequence above
+    the counter, and the counter moves past them, so /api/intakes/changes?since=0
+    returns them too.
+    """
+    with engine.begin() as conn:
+        conn.execute(
+            text("INSERT OR IGNORE INTO change_counters (name, value) VALUES (:name, 0)"),
+            {"name": "intakes"},
+        )
+        conn.execute(
+            text("""
+                UPDATE patient_intakes
+                SET change_seq = (SELECT value FROM change_counters WHERE name = :name) + id,
+                    updated_at = COALESCE(updated_at, created_at)
+                WHERE change_seq IS NULL OR change_seq = 0
+            """),
+            {"name": "intakes"},
+        )
+        conn.execute(
+            text("""
+                UPDATE change_counters
+                SET value = MAX(value, (SELECT COALESCE(MAX(change_seq), 0) FROM patient_intakes))
+                WHERE name = :name
+            """),
+            {"name": "intakes"},
+        )
@@ -4,7 +4,7 @@ models.py
 - Keeps data structure consistent and simple.
 """
 
-from sqlalchemy import String, Integer, DateTime, Text, ForeignKey, Boolean
+from sqlalchemy import String, Integer, DateTime, Text, ForeignKey, Boolean, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import datetime
 
@@ -24,6 +24,8 @@ class User(Base):
     role: Mapped[str] = mapped_column(String(20))  # NURSE or DOCTOR
     full_name: Mapped[str] = mapped_column(String(120))
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
+    # Display language for doctors (en, es, fr, ar, pt); new summaries are pre-translated into it
+    preferred_language: Mapped[str] = mapped_column(String(10), default="en")
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
 
@@ -33,6 +35,13 @@ class PatientIntake(Base):
     This is created first in the workflow.
     """
     __tablename__ = "patient_intakes"
+    __table_args__ = (
+        # Composite indexes backing keyset pagination + queue filters on /api/intakes
+        Index("ix_patient_intakes_created_id", "created_at", "id"),
+        Index("ix_patient_intakes_workflow_created_id", "workflow_status", "created_at", "id"),
+        Index("ix_patient_intakes_doctor_created_id", "doctor_status", "created_at", "id"),
+        Index("ix_patient_intakes_change_seq", "change_seq"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
 
@@ -59,6 +68,9 @@ class PatientIntake(Base):
     history_original: Mapped[str] = mapped_column(Text, default="")
     medications_original: Mapped[str] = mapped_column(Text, default="")
     allergies_original: Mapped[str] = mapped_column(Text, default="")
+    # English translation of the text fields: NOT_NEEDED, or PENDING -> TRANSLATED / FAILED
+    # (filled in by a background job; until then the text fields hold the original text)
+    translation_status: Mapped[str] = mapped_column(String(20), default="NOT_NEEDED")
 
     # Workflow status: PENDING_NURSE -> PENDING_DOCTOR -> COMPLETED
     workflow_status: Mapped[str] = mapped_column(String(30), default="PENDING_NURSE")
@@ -68,6 +80,11 @@ class PatientIntake(Base):
 
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
+    # Stamped from ChangeCounter on every write; used as the row's ETag version
+    # and as the delta-sync token for /api/intakes/changes
+    change_seq: Mapped[int] = mapped_column(Integer, default=0)
+    updated_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True, default=datetime.utcnow)
+
     # Relationships
     vitals: Mapped["VitalsEntry"] = relationship(
         back_populates="intake",
@@ -109,6 +126,9 @@ class ClinicalSummary(Base):
     Created after vitals are entered and AI is run.
     """
     __tablename__ = "clinical_summaries"
+    __table_args__ = (
+        Index("ix_clinical_summaries_priority_intake", "priority_level", "intake_id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     intake_id: Mapped[int] = mapped_column(ForeignKey("patient_intakes.id"), unique=True)
@@ -125,6 +145,81 @@ class ClinicalSummary(Base):
     doctor_note: Mapped[str] = mapped_column(Text, default="")
     decision: Mapped[str] = mapped_column(String(30), default="PENDING")  # ADMIT / NOT_ADMIT / PENDING
 
+    # "rules" while the provisional rule-based summary is shown, "ai" once Gemini has upgraded it
+    source: Mapped[str] = mapped_column(String(20), default="ai")
+
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
     intake: Mapped[PatientIntake] = relationship(back_populates="clinical_summary")
+
+
+class ChangeCounter(Base):
+    """
+    Monotonic counters shared by all worker processes.
+    The "intakes" row is bumped on every intake write and backs list ETags.
+    """
+    __tablename__ = "change_counters"
+
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    value: Mapped[int] = mapped_column(Integer, default=0)
+
+
+class IntakeEvent(Base):
+    """
+    Append-only log of intake changes.
+    Every worker's SSE broadcaster polls this table, so events written by
+    one uvicorn process reach clients connected to any other.
+    """
+    __tablename__ = "intake_events"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    intake_id: Mapped[int] = mapped_column(Integer, index=True)
+    event_type: Mapped[str] = mapped_column(String(30))  # intake_created / vitals_submitted / summary_updated / decision_updated
+    payload: Mapped[str] = mapped_column(Text, default="{}")  # compact JSON sent to clients
+
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class BackgroundJob(Base):
+    """
+    Durable work queue shared by the API and `python -m app.worker` processes.
+    Lower priority values are claimed first; failed jobs are retried after run_after.
+    """
+    __tablename__ = "background_jobs"
+    __table_args__ = (
+        Index("ix_background_jobs_claim", "status", "priority", "id"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    kind: Mapped[str] = mapped_column(String(40))  # e.g. clinical_summary
+    intake_id: Mapped[int | None] = mapped_column(Integer, index=True, nullable=True)
+    payload: Mapped[str] = mapped_column(Text, default="{}")  # JSON arguments for the handler
+    priority: Mapped[int] = mapped_column(Integer, default=1)  # 0 = HIGH, 1 = MED, 2 = LOW
+
+    # QUEUED -> RUNNING -> DONE / FAILED (RUNNING goes back to QUEUED on retry)
+    status: Mapped[str] = mapped_column(String(20), default="QUEUED")
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    run_after: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    locked_by: Mapped[str | None] = mapped_column(String(80), nullable=True)
+    locked_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    last_error: Mapped[str] = mapped_column(Text, default="")
+
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+
+class TranslationCacheEntry(Base):
+    """
+    Translations shared by every worker process, keyed by sha256(language + source text).
+    last_used_at drives LRU eviction once the table grows past its byte budget.
+    """
+    __tablename__ = "translation_cache"
+
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    language: Mapped[str] = mapped_column(String(10))
+    value: Mapped[str] = mapped_column(Text)  # translated text (JSON for whole payloads)
+    size_bytes: Mapped[int] = mapped_column(Integer, default=0)
+    hits: Mapped[int] = mapped_column(Integer, default=0)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    last_used_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
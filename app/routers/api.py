@@ -1,30 +1,88 @@
-from fastapi import APIRouter, Depends, HTTPException, Body
-from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
-from sqlalchemy import select
-from pydantic import BaseModel
+from fastapi import APIRouter, Depends, HTTPException, Body, Query, Header, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy.orm import Session, selectinload, contains_eager
+from sqlalchemy import select, and_, or_
+from sqlalchemy.exc import OperationalError
+from pydantic import BaseModel, ValidationError
+import asyncio
 import logging
 import os
+import time
 from typing import Any
+import csv
+import io
 import json
+import base64
 import hashlib
 from pathlib import Path
 from dotenv import load_dotenv
 
 from ..db import get_db
-from ..models import PatientIntake, VitalsEntry, ClinicalSummary, User
+from ..models import PatientIntake, VitalsEntry, ClinicalSummary, User, BackgroundJob
 from ..schemas import IntakeCreate, VitalsCreate, DecisionUpdate
 from datetime import datetime
 from ..services.ai import (
-    generate_clinical_summary,
-    translate_text,
+    fallback_summary,
+    generate_ai_summary_async,
+    stream_ai_summary_async,
+    parse_summary_output,
+    GEMINI_BREAKER,
+    GEMINI_GOVERNOR,
+    GEMINI_TIMEOUT_SECONDS,
     language_name,
     is_gemini_ready,
-    translate_text_with_status,
     gemini_status,
     translate_fields_payload,
 )
-from ..auth import require_nurse, require_doctor, require_staff
+from ..services.versioning import current_change_seq, intake_change_seq, touch_intake, touch_intakes
+from ..services.events import (
+    broadcaster,
+    events_since,
+    format_sse,
+    latest_event_id,
+    record_event,
+    record_events,
+    KEEPALIVE_SECONDS,
+    EVENT_BATCH_SIZE,
+)
+from ..services.triage_queue import triage_queue, entry_to_dict, OPEN_STAGES
+from ..services.payload_cache import payload_cache, dumps_bytes
+from ..services.search import search_intake_ids
+from ..services.summary_jobs import (
+    SOURCE_AI,
+    SOURCE_RULES,
+    SUMMARY_JOB,
+    apply_summary,
+    enqueue_summary_job,
+    is_current_vitals,
+    summary_payload,
+    upgrade_summary,
+    vitals_fingerprint,
+)
+from ..services.circuit_breaker import CircuitOpenError
+from ..services.jobs import (
+    JOB_QUEUED,
+    JOB_RUNNING,
+    claim_job_by_id,
+    complete_job,
+    defer_job,
+    fail_job,
+    job_payload,
+)
+from ..services.summary_stream import SharedTextStream, SummaryStreamParser
+from ..services.translation_cache import translation_cache
+from ..services.language_detect import language_detector
+from ..services.translation_jobs import (
+    INTAKE_TEXT_FIELDS,
+    TRANSLATION_DONE,
+    detect_language,
+    enqueue_intake_translation_job,
+    enqueue_pretranslate_job,
+    needs_translation,
+    translate_fields_cached_async,
+)
+from ..db import SessionLocal
+from ..auth import require_nurse, require_doctor, require_staff, require_staff_stream
 
 _ENV_PATH = Path(__file__).resolve().parents[2] / ".env"
 load_dotenv(dotenv_path=_ENV_PATH, override=True)
@@ -33,17 +91,15 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api", tags=["api"])
 
-_TRANSLATION_CACHE: dict[str, dict[str, Any]] = {}
-_TRANSLATION_CACHE_MAX = 200
+_INTAKE_PAGE_DEFAULT = 100
+_INTAKE_PAGE_MAX = 500
 
-
-def _cache_key(language: str, fields: dict[str, Any]) -> str:
-    try:
-        payload = json.dumps(fields, sort_keys=True, ensure_ascii=False)
-    except Exception:
-        payload = str(fields)
-    digest = hashlib.sha256(payload.encode("utf-8", errors="ignore")).hexdigest()
-    return f"{language}:{digest}"
+# _intake_to_dict touches both relationships; load them up front so a page of N
+# intakes costs a fixed number of queries instead of 2N+1 lazy loads.
+_INTAKE_EAGER_LOAD = (
+    selectinload(PatientIntake.vitals),
+    selectinload(PatientIntake.clinical_summary),
+)
 
 
 @router.get("/health")
@@ -56,6 +112,8 @@ def health_check(db: Session = Depends(get_db)):
             "status": "healthy",
             "database": "connected",
             "ai": gemini_status(),
+            "translation_cache": translation_cache.stats(),
+            "language_detect": language_detector.stats(),
         }
     except Exception as e:
         raise HTTPException(status_code=503, detail=f"Service unavailable: {str(e)}")
@@ -79,6 +137,7 @@ def _summary_to_dict(summary: ClinicalSummary | None) -> dict:
         "recommended_next_steps": _split_lines(summary.recommended_next_steps),
         "doctor_note": summary.doctor_note,
         "decision": summary.decision,
+        "source": summary.source,
         "created_at": summary.created_at.strftime("%Y-%m-%d %H:%M:%S"),
     }
 
@@ -120,10 +179,12 @@ def _intake_to_dict(intake: PatientIntake) -> dict:
         "history_original": getattr(intake, "history_original", ""),
         "medications_original": getattr(intake, "medications_original", ""),
         "allergies_original": getattr(intake, "allergies_original", ""),
+        "translation_status": intake.translation_status or "NOT_NEEDED",
         "workflow_status": getattr(intake, 'workflow_status', 'PENDING_NURSE'),
         "doctor_status": doctor_status,
         "doctor_status_updated_at": intake.doctor_status_updated_at.strftime("%Y-%m-%d %H:%M:%S") if intake.doctor_status_updated_at else None,
         "created_at": intake.created_at.strftime("%Y-%m-%d %H:%M"),
+        "updated_at": intake.updated_at.strftime("%Y-%m-%d %H:%M:%S") if intake.updated_at else None,
         "has_vitals": intake.vitals is not None,
         "has_summary": intake.clinical_summary is not None,
         "priority_level": intake.clinical_summary.priority_level if intake.clinical_summary else None,
@@ -140,131 +201,908 @@ def _intake_to_dict(intake: PatientIntake) -> dict:
         else None,
     }
 
+# Columns needed to render a queue card; everything else waits for the detail call.
+_CARD_COLUMNS = (
+    PatientIntake.id,
+    PatientIntake.full_name,
+    PatientIntake.age,
+    PatientIntake.sex,
+    PatientIntake.chief_complaint,
+    PatientIntake.preferred_language,
+    PatientIntake.translation_status,
+    PatientIntake.workflow_status,
+    PatientIntake.doctor_status,
+    PatientIntake.doctor_status_updated_at,
+    PatientIntake.created_at,
+    PatientIntake.updated_at,
+    PatientIntake.change_seq,
+    ClinicalSummary.priority_level,
+    ClinicalSummary.decision,
+    ClinicalSummary.created_at.label("summary_created_at"),
+    VitalsEntry.id.label("vitals_id"),
+    VitalsEntry.heart_rate,
+    VitalsEntry.respiratory_rate,
+    VitalsEntry.temperature_c,
+    VitalsEntry.spo2,
+    VitalsEntry.systolic_bp,
+    VitalsEntry.diastolic_bp,
+)
+
+
+def _card_select():
+    return (
+        select(*_CARD_COLUMNS)
+        .outerjoin(ClinicalSummary, ClinicalSummary.intake_id == PatientIntake.id)
+        .outerjoin(VitalsEntry, VitalsEntry.intake_id == PatientIntake.id)
+    )
+
+
+def _card_row_to_dict(row: Any) -> dict:
+    """Compact queue-card payload built from a _CARD_COLUMNS row."""
+    has_summary = row.summary_created_at is not None
+    return {
+        "id": row.id,
+        "full_name": row.full_name,
+        "age": row.age,
+        "sex": row.sex,
+        "chief_complaint": row.chief_complaint,
+        "preferred_language": row.preferred_language or "en",
+        "translation_status": row.translation_status or "NOT_NEEDED",
+        "workflow_status": row.workflow_status or "PENDING_NURSE",
+        "doctor_status": _normalize_doctor_status(row.doctor_status or row.decision),
+        "doctor_status_updated_at": row.doctor_status_updated_at.strftime("%Y-%m-%d %H:%M:%S") if row.doctor_status_updated_at else None,
+        "created_at": row.created_at.strftime("%Y-%m-%d %H:%M"),
+        "updated_at": row.updated_at.strftime("%Y-%m-%d %H:%M:%S") if row.updated_at else None,
+        "has_vitals": row.vitals_id is not None,
+        "has_summary": has_summary,
+        "priority_level": row.priority_level,
+        "clinical_summary": {
+            "priority_level": row.priority_level,
+            "decision": row.decision,
+            "created_at": row.summary_created_at.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        if has_summary
+        else {},
+        "vitals": {
+            "heart_rate": row.heart_rate,
+            "respiratory_rate": row.respiratory_rate,
+            "temperature_c": row.temperature_c,
+            "spo2": row.spo2,
+            "systolic_bp": row.systolic_bp,
+            "diastolic_bp": row.diastolic_bp,
+        }
+        if row.vitals_id is not None
+        else None,
+    }
+
+def _full_fragments(db: Session, refs: list[tuple[int, int]]) -> list[bytes]:
+    """
+    Encoded full payloads for (intake_id, change_seq) pairs, in the same order.
+    Only intakes missing from the payload cache are loaded from the DB.
+    """
+    fragments: dict[int, bytes] = {}
+    missing: list[int] = []
+    for intake_id, change_seq in refs:
+        cached = payload_cache.get(("full", intake_id, change_seq))
+        if cached is None:
+            missing.append(intake_id)
+        else:
+            fragments[intake_id] = cached
+    if missing:
+        intakes = db.execute(
+            select(PatientIntake).options(*_INTAKE_EAGER_LOAD).where(PatientIntake.id.in_(missing))
+        ).scalars().all()
+        for intake in intakes:
+            encoded = dumps_bytes(_intake_to_dict(intake))
+            payload_cache.put(("full", intake.id, intake.change_seq), encoded)
+            fragments[intake.id] = encoded
+    return [fragments[intake_id] for intake_id, _ in refs if intake_id in fragments]
+
+
+def _card_fragments(rows: list[Any]) -> list[bytes]:
+    return [
+        payload_cache.get_or_build(("card", row.id, row.change_seq), lambda row=row: _card_row_to_dict(row))
+        for row in rows
+    ]
+
+
+def _items_response(fragments: list[bytes], headers: dict | None = None, **fields: Any) -> Response:
+    """{"items": [...cached fragments...], **fields} without re-encoding the items."""
+    tail = dumps_bytes(fields)
+    body = b'{"items":[' + b",".join(fragments) + b"]," + tail[1:]
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 def _demo_seed_allowed() -> bool:
     value = os.getenv("ALLOW_DEMO_SEED", "")
     return value.strip().lower() in {"1", "true", "yes", "on"}
 
 
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against our ETag."""
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag.removeprefix("W/") in candidates
+
+
+def _not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers=_etag_headers(etag))
+
+
+def _etag_headers(etag: str) -> dict:
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+
+def _encode_cursor(row: Any) -> str:
+    raw = json.dumps([row.created_at.isoformat(), row.id])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        created_at, intake_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(intake_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _filter_intakes(
+    stmt,
+    workflow_status: str | None,
+    doctor_status: str | None,
+    priority_level: str | None,
+    created_after: datetime | None,
+    created_before: datetime | None,
+):
+    """Shared list/export filters (priority_level needs ClinicalSummary in the FROM clause)."""
+    if workflow_status:
+        stmt = stmt.where(PatientIntake.workflow_status == workflow_status.strip().upper())
+    if doctor_status:
+        stmt = stmt.where(PatientIntake.doctor_status == _normalize_doctor_status(doctor_status))
+    if priority_level:
+        stmt = stmt.where(ClinicalSummary.priority_level == priority_level.strip().upper())
+    if created_after:
+        stmt = stmt.where(PatientIntake.created_at >= created_after)
+    if created_before:
+        stmt = stmt.where(PatientIntake.created_at < created_before)
+    return stmt
+
+
 @router.get("/intakes")
-def list_intakes(db: Session = Depends(get_db), user: User = Depends(require_staff)):
-    """List all intakes. Requires NURSE or DOCTOR role."""
-    intakes = db.execute(select(PatientIntake).order_by(PatientIntake.created_at.desc())).scalars().all()
-    return [_intake_to_dict(i) for i in intakes]
+def list_intakes(
+    request: Request,
+    cursor: str | None = None,
+    limit: int = Query(default=_INTAKE_PAGE_DEFAULT, ge=1, le=_INTAKE_PAGE_MAX),
+    view: str = Query(default="full", pattern="^(full|card)$"),
+    workflow_status: str | None = None,
+    doctor_status: str | None = None,
+    priority_level: str | None = None,
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
+    if_none_match: str | None = Header(default=None),
+    db: Session = Depends(get_db),
+    user: User = Depends(require_staff),
+):
+    """
+    List intakes newest first, one keyset page at a time. Requires NURSE or DOCTOR role.
+    Pass the returned next_cursor back as ?cursor= to fetch the following page.
+    view=card returns only the columns the queue needs (no free text or summary lists).
+    Responds 304 when If-None-Match still matches the queue's change version.
+    """
+    # Read the version before the rows so a concurrent write can only make the ETag stale-low.
+    query_digest = hashlib.sha1(
+        "&".join(sorted(f"{k}={v}" for k, v in request.query_params.multi_items())).encode("utf-8")
+    ).hexdigest()[:12]
+    etag = f'W/"q{current_change_seq(db)}-{query_digest}"'
+    if _etag_matches(if_none_match, etag):
+        return _not_modified(etag)
+
+    if view == "card":
+        stmt = _card_select()
+    else:
+        # Page over (id, change_seq) only; payloads come from the cache or one batched load.
+        stmt = select(PatientIntake.id, PatientIntake.created_at, PatientIntake.change_seq)
+        if priority_level:
+            stmt = stmt.join(ClinicalSummary, ClinicalSummary.intake_id == PatientIntake.id)
+    stmt = _filter_intakes(stmt, workflow_status, doctor_status, priority_level, created_after, created_before)
+    if cursor:
+        cursor_created_at, cursor_id = _decode_cursor(cursor)
+        stmt = stmt.where(
+            or_(
+                PatientIntake.created_at < cursor_created_at,
+                and_(PatientIntake.created_at == cursor_created_at, PatientIntake.id < cursor_id),
+            )
+        )
+
+    # Fetch one extra row to know whether another page exists.
+    stmt = stmt.order_by(PatientIntake.created_at.desc(), PatientIntake.id.desc()).limit(limit + 1)
+    rows = db.execute(stmt).all()
+    next_cursor = _encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+    rows = rows[:limit]
+    fragments = _card_fragments(rows) if view == "card" else _full_fragments(db, [(r.id, r.change_seq) for r in rows])
+    return _items_response(fragments, _etag_headers(etag), next_cursor=next_cursor)
+
+
+_EXPORT_CHUNK_ROWS = 500
+_EXPORT_INTAKE_FIELDS = (
+    "id", "full_name", "age", "sex", "address",
+    "chief_complaint", "symptoms", "duration", "severity", "history", "medications", "allergies",
+    "preferred_language", "chief_complaint_original", "symptoms_original", "duration_original",
+    "history_original", "medications_original", "allergies_original", "translation_status",
+    "workflow_status", "doctor_status", "doctor_status_updated_at", "created_at", "updated_at",
+)
+_EXPORT_VITALS_FIELDS = ("heart_rate", "respiratory_rate", "temperature_c", "spo2", "systolic_bp", "diastolic_bp")
+_EXPORT_SUMMARY_FIELDS = (
+    "short_summary", "priority_level", "red_flags", "differential", "recommended_questions",
+    "recommended_next_steps", "doctor_note", "decision", "source", "created_at",
+)
+_EXPORT_CSV_COLUMNS = (
+    list(_EXPORT_INTAKE_FIELDS)
+    + [f"vitals_{f}" for f in _EXPORT_VITALS_FIELDS]
+    + [f"summary_{f}" for f in _EXPORT_SUMMARY_FIELDS]
+)
+
+
+def _export_rows(filters: dict[str, Any]):
+    """
+    Yield full intakes in created order, _EXPORT_CHUNK_ROWS at a time.
+    One outer-join query with contains_eager keeps it to a single streamed cursor.
+    Uses its own session because the response body outlives the request's dependencies.
+    """
+    stmt = (
+        select(PatientIntake)
+        .outerjoin(PatientIntake.vitals)
+        .outerjoin(PatientIntake.clinical_summary)
+        .options(contains_eager(PatientIntake.vitals), contains_eager(PatientIntake.clinical_summary))
+    )
+    stmt = _filter_intakes(stmt, **filters).order_by(PatientIntake.created_at.asc(), PatientIntake.id.asc())
+    with SessionLocal() as db:
+        result = db.execute(stmt.execution_options(yield_per=_EXPORT_CHUNK_ROWS)).scalars()
+        for chunk in result.partitions():
+            # The identity map holds weak references, so exported chunks are freed as we go
+            yield [_intake_to_dict(intake) for intake in chunk]
+
+
+def _export_ndjson(filters: dict[str, Any]):
+    for records in _export_rows(filters):
+        yield b"".join(dumps_bytes(record) + b"\n" for record in records)
+
+
+def _export_csv(filters: dict[str, Any]):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(_EXPORT_CSV_COLUMNS)
+    for records in _export_rows(filters):
+        for record in records:
+            vitals = record["vitals"] or {}
+            summary = record["clinical_summary"] or {}
+            writer.writerow(
+                [record[f] for f in _EXPORT_INTAKE_FIELDS]
+                + [vitals.get(f) for f in _EXPORT_VITALS_FIELDS]
+                + [" | ".join(v) if isinstance(v, list) else v for v in (summary.get(f) for f in _EXPORT_SUMMARY_FIELDS)]
+            )
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+@router.get("/intakes/export")
+def export_intakes(
+    format: str = Query(default="ndjson", pattern="^(ndjson|csv)$"),
+    workflow_status: str | None = None,
+    doctor_status: str | None = None,
+    priority_level: str | None = None,
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
+    user: User = Depends(require_staff),
+):
+    """
+    Stream every matching intake with its vitals and summary as NDJSON or CSV.
+    Requires NURSE or DOCTOR role. Memory use stays flat regardless of table size.
+    """
+    filters = {
+        "workflow_status": workflow_status,
+        "doctor_status": doctor_status,
+        "priority_level": priority_level,
+        "created_after": created_after,
+        "created_before": created_before,
+    }
+    stamp = datetime.utcnow().strftime("%Y%m%d%H%M%S")
+    if format == "csv":
+        body, media_type = _export_csv(filters), "text/csv; charset=utf-8"
+    else:
+        body, media_type = _export_ndjson(filters), "application/x-ndjson"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="intakes-{stamp}.{format}"'},
+    )
+
+
+@router.get("/intakes/search")
+def search_intakes(
+    q: str = Query(min_length=1, max_length=200),
+    limit: int = Query(default=20, ge=1, le=100),
+    offset: int = Query(default=0, ge=0),
+    db: Session = Depends(get_db),
+    user: User = Depends(require_staff),
+):
+    """
+    Full-text search over complaint, symptoms, history, medications and allergies
+    (English and original-language text). Requires NURSE or DOCTOR role.
+    Returns queue cards, best match first, each with a highlighted snippet.
+    """
+    try:
+        hits = search_intake_ids(db, q, limit + 1, offset)
+    except OperationalError:
+        raise HTTPException(status_code=503, detail="Search index unavailable")
+    has_more = len(hits) > limit
+    hits = hits[:limit]
+    rows = db.execute(_card_select().where(PatientIntake.id.in_([h["id"] for h in hits]))).all()
+    cards = {row.id: _card_row_to_dict(row) for row in rows}
+    items = [
+        {**cards[hit["id"]], "snippet": hit["snippet"], "rank": hit["rank"]}
+        for hit in hits
+        if hit["id"] in cards
+    ]
+    return {"items": items, "has_more": has_more, "next_offset": offset + limit if has_more else None}
+
+
+@router.get("/intakes/changes")
+def list_intake_changes(
+    since: str = "0",
+    limit: int = Query(default=_INTAKE_PAGE_DEFAULT, ge=1, le=_INTAKE_PAGE_MAX),
+    view: str = Query(default="full", pattern="^(full|card)$"),
+    db: Session = Depends(get_db),
+    user: User = Depends(require_staff),
+):
+    """
+    Intakes inserted or modified after the `since` token, oldest change first.
+    Requires NURSE or DOCTOR role. Store next_token and send it as ?since= next time;
+    keep calling while has_more is true.
+    """
+    try:
+        since_seq = int(since)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid since token")
+
+    # Read the counter first: anything committed after this shows up on the next call.
+    latest_seq = current_change_seq(db)
+    if view == "card":
+        stmt = _card_select()
+    else:
+        stmt = select(PatientIntake.id, PatientIntake.change_seq)
+    stmt = (
+        stmt.where(PatientIntake.change_seq > since_seq)
+        .order_by(PatientIntake.change_seq.asc())
+        .limit(limit + 1)
+    )
+    rows = db.execute(stmt).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if has_more:
+        next_seq = rows[-1].change_seq
+    else:
+        next_seq = max([latest_seq, since_seq] + [r.change_seq for r in rows])
+    fragments = _card_fragments(rows) if view == "card" else _full_fragments(db, [(r.id, r.change_seq) for r in rows])
+    return _items_response(fragments, next_token=str(next_seq), has_more=has_more)
 
 
 @router.get("/intakes/{intake_id}")
-def get_intake(intake_id: int, db: Session = Depends(get_db), user: User = Depends(require_staff)):
+def get_intake(
+    intake_id: int,
+    if_none_match: str | None = Header(default=None),
+    db: Session = Depends(get_db),
+    user: User = Depends(require_staff),
+):
     """Get a specific intake. Requires NURSE or DOCTOR role."""
-    intake = db.get(PatientIntake, intake_id)
-    if not intake:
+    change_seq = intake_change_seq(db, intake_id)
+    if change_seq is None:
         raise HTTPException(status_code=404, detail="Intake not found")
-    return _intake_to_dict(intake)
+    etag = f'W/"i{intake_id}-{change_seq}"'
+    if _etag_matches(if_none_match, etag):
+        return _not_modified(etag)
 
+    fragments = _full_fragments(db, [(intake_id, change_seq)])
+    if not fragments:
+        raise HTTPException(status_code=404, detail="Intake not found")
+    return Response(content=fragments[0], media_type="application/json", headers=_etag_headers(etag))
 
-@router.post("/intakes")
-def create_intake(payload: IntakeCreate, db: Session = Depends(get_db)):
+
+_BATCH_MAX_ITEMS = 100
+_BATCH_TRANSLATE_MAX_ITEMS = 10
+
+
+def _prepare_intake_data(payload: IntakeCreate) -> dict:
+    """Column values for a new intake; non-English text is also kept in the *_original columns."""
     intake_data = payload.model_dump()
-    preferred_language = (intake_data.get("preferred_language") or "en").lower()
+    preferred_language = intake_data.get("preferred_language") or detect_language(_intake_text_fields(intake_data))
+    preferred_language = preferred_language.lower()
     intake_data["preferred_language"] = preferred_language
-
     if preferred_language != "en":
-        intake_data["chief_complaint_original"] = intake_data.get("chief_complaint", "")
-        intake_data["symptoms_original"] = intake_data.get("symptoms", "")
-        intake_data["duration_original"] = intake_data.get("duration", "")
-        intake_data["history_original"] = intake_data.get("history", "")
-        intake_data["medications_original"] = intake_data.get("medications", "")
-        intake_data["allergies_original"] = intake_data.get("allergies", "")
-
-        fields = {
-            "chief_complaint": intake_data.get("chief_complaint", ""),
-            "symptoms": intake_data.get("symptoms", ""),
-            "duration": intake_data.get("duration", ""),
-            "history": intake_data.get("history", ""),
-            "medications": intake_data.get("medications", ""),
-            "allergies": intake_data.get("allergies", ""),
-        }
-        translated, ok, reason = translate_fields_payload(fields, "English")
-        if ok:
-            intake_data.update(translated)
-        else:
-            logger.warning("Intake translation skipped (%s); using original language.", reason or "failed")
+        for field in INTAKE_TEXT_FIELDS:
+            intake_data[f"{field}_original"] = intake_data.get(field, "")
+    return intake_data
+
+
+def _intake_text_fields(intake_data: dict) -> dict:
+    return {field: intake_data.get(field, "") for field in INTAKE_TEXT_FIELDS}
+
+
+def _apply_translation(intake_data: dict, translated: dict) -> None:
+    """Copy translated text fields back, ignoring anything else the model returned."""
+    for field in INTAKE_TEXT_FIELDS:
+        value = translated.get(field)
+        if isinstance(value, str):
+            intake_data[field] = value
+
 
+@router.post("/intakes")
+def create_intake(payload: IntakeCreate, db: Session = Depends(get_db)):
+    """
+    Public kiosk submit: one insert, no Gemini call. Non-English text is stored
+    as written and a translate_intake job fills in the English fields.
+    """
+    intake_data = _prepare_intake_data(payload)
     intake = PatientIntake(**intake_data)
     intake.workflow_status = "PENDING_NURSE"
     intake.doctor_status = "PENDING"
+    touch_intake(db, intake)
     db.add(intake)
+    db.flush()
+    if intake.preferred_language != "en":
+        enqueue_intake_translation_job(db, intake)
+    record_event(db, intake, "intake_created")
     db.commit()
     db.refresh(intake)
+    triage_queue.sync(db)
     return {"id": intake.id, "message": "Data successfully submitted to Nurse"}
 
 
+def _translate_intake_batch(items: list[dict]) -> None:
+    """
+    Translate non-English intakes to English in place, grouped by source language
+    so each group of up to _BATCH_TRANSLATE_MAX_ITEMS intakes costs one Gemini call.
+    Intakes left untranslated are handed to the translate_intake job after insert.
+    """
+    by_language: dict[str, list[dict]] = {}
+    for intake_data in items:
+        if intake_data["preferred_language"] != "en" and needs_translation(_intake_text_fields(intake_data), "en"):
+            by_language.setdefault(intake_data["preferred_language"], []).append(intake_data)
+
+    for language, group in by_language.items():
+        for start in range(0, len(group), _BATCH_TRANSLATE_MAX_ITEMS):
+            chunk = group[start:start + _BATCH_TRANSLATE_MAX_ITEMS]
+            fields = {str(idx): _intake_text_fields(intake_data) for idx, intake_data in enumerate(chunk)}
+            translated, ok, reason = translate_fields_payload(fields, "English")
+            if not ok:
+                logger.warning(
+                    "Batch intake translation skipped for %s (%s); using original language.",
+                    language,
+                    reason or "failed",
+                )
+                continue
+            for idx, intake_data in enumerate(chunk):
+                item = translated.get(str(idx))
+                if isinstance(item, dict):
+                    _apply_translation(intake_data, item)
+                    intake_data["translation_status"] = TRANSLATION_DONE
+
+
+@router.post("/intakes/batch")
+def create_intakes_batch(
+    payload: list[dict[str, Any]] = Body(...),
+    db: Session = Depends(get_db),
+    user: User = Depends(require_staff),
+):
+    """
+    Import a burst of intakes (kiosk / offline clinic sync). Requires NURSE or DOCTOR role.
+    Each item is validated on its own; valid ones are inserted in one transaction and
+    the per-item results say which were created and why the others were rejected.
+    """
+    if not payload:
+        raise HTTPException(status_code=400, detail="No intakes provided")
+    if len(payload) > _BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {_BATCH_MAX_ITEMS} intakes per batch")
+
+    results: list[dict[str, Any]] = []
+    valid: list[tuple[int, dict]] = []
+    for index, item in enumerate(payload):
+        try:
+            valid.append((index, _prepare_intake_data(IntakeCreate.model_validate(item))))
+        except ValidationError as e:
+            errors = [{"loc": list(err["loc"]), "msg": err["msg"]} for err in e.errors()]
+            results.append({"index": index, "status": "error", "errors": errors})
+
+    _translate_intake_batch([intake_data for _, intake_data in valid])
+
+    intakes = []
+    for _, intake_data in valid:
+        intake = PatientIntake(**intake_data)
+        intake.workflow_status = "PENDING_NURSE"
+        intake.doctor_status = "PENDING"
+        intake.clinical_summary = None  # new intake: no summary, and no lazy load in record_events
+        intakes.append(intake)
+    created_ids: list[int] = []
+    if intakes:
+        touch_intakes(db, intakes)
+        db.add_all(intakes)
+        db.flush()
+        created_ids = [intake.id for intake in intakes]
+        for intake in intakes:
+            if intake.preferred_language != "en" and intake.translation_status != TRANSLATION_DONE:
+                enqueue_intake_translation_job(db, intake)
+        record_events(db, intakes, "intake_created")
+        db.commit()
+        triage_queue.sync(db)
+
+    for (index, _), intake_id in zip(valid, created_ids):
+        results.append({"index": index, "status": "created", "id": intake_id})
+    results.sort(key=lambda r: r["index"])
+    return {
+        "created": len(intakes),
+        "failed": len(payload) - len(intakes),
+        "results": results,
+    }
+
+
+# Latency budget for Gemini on the vitals request; past it the rule-based summary is returned
+SUMMARY_AI_DEADLINE_SECONDS = float(os.getenv("SUMMARY_AI_DEADLINE_SECONDS", "2.5"))
+# Late in-flight summaries by intake id, kept referenced until they have been applied
+_LATE_SUMMARIES: dict[int, asyncio.Task] = {}
+
+
 @router.post("/intakes/{intake_id}/vitals")
-def submit_vitals(intake_id: int, payload: VitalsCreate, db: Session = Depends(get_db), user: User = Depends(require_nurse)):
-    """Submit vitals for an intake. Requires NURSE role."""
+async def submit_vitals(intake_id: int, payload: VitalsCreate, db: Session = Depends(get_db), user: User = Depends(require_nurse)):
+    """
+    Submit vitals for an intake. Requires NURSE role.
+    The rule-based summary is computed up front and Gemini gets
+    SUMMARY_AI_DEADLINE_SECONDS; whichever is ready by then is stored.
+    A late AI result still replaces the rules summary when it arrives.
+    """
+    payload_ai, fingerprint = await asyncio.to_thread(_save_vitals, db, intake_id, payload)
+    rules = fallback_summary(payload_ai)
+
+    ai_result, late_task = await _race_ai_summary(payload_ai)
+    source = SOURCE_AI if ai_result else SOURCE_RULES
+    # Hold the durable job back while our own call may still land
+    job_delay = GEMINI_GOVERNOR.queue_timeout + GEMINI_TIMEOUT_SECONDS if late_task else 0
+    result, summary_id, job_id = await asyncio.to_thread(
+        _store_summary, db, intake_id, ai_result or rules, source, fingerprint, job_delay
+    )
+
+    if late_task is not None:
+        finisher = asyncio.create_task(_finish_late_summary(late_task, summary_id, intake_id, fingerprint))
+        _LATE_SUMMARIES[intake_id] = finisher
+        finisher.add_done_callback(lambda done: _forget(_LATE_SUMMARIES, intake_id, done))
+
+    result["fallback"] = source == SOURCE_RULES
+    result["ai_pending"] = job_id is not None
+    result["message"] = "Vitals successfully sent to Doctor"
+    return result
+
+
+def _save_vitals(db: Session, intake_id: int, payload: VitalsCreate) -> tuple[dict, str]:
+    """
+    Replace the intake's vitals (and its stale summary) in one transaction,
+    bumping its version so readers never see the old vitals while the summary
+    is being made; returns the summary input and vitals fingerprint.
+    """
     intake = db.get(PatientIntake, intake_id)
     if not intake:
         raise HTTPException(status_code=404, detail="Intake not found")
 
     if intake.vitals:
         db.delete(intake.vitals)
-        db.commit()
+    if intake.clinical_summary:
+        db.delete(intake.clinical_summary)
+    # Deletes go out first: vitals_entries.intake_id is unique
+    db.flush()
+    db.expire(intake, ["vitals", "clinical_summary"])
 
     vitals = VitalsEntry(intake_id=intake_id, **payload.model_dump())
     db.add(vitals)
+    touch_intake(db, intake)
+    db.flush()
+    record_event(db, intake, "vitals_submitted")
     db.commit()
+    triage_queue.sync(db)
+    payload_cache.invalidate(intake_id)
     db.refresh(vitals)
 
-    if intake.clinical_summary:
-        db.delete(intake.clinical_summary)
-        db.commit()
+    return summary_payload(intake, vitals), vitals_fingerprint(vitals)
 
-    payload_ai = {
-        "intake": {
-            "full_name": intake.full_name,
-            "age": intake.age,
-            "sex": intake.sex,
-            "chief_complaint": intake.chief_complaint,
-            "symptoms": intake.symptoms,
-            "duration": intake.duration,
-            "severity": intake.severity,
-            "history": intake.history,
-            "medications": intake.medications,
-            "allergies": intake.allergies,
-        },
-        "vitals": {
-            "heart_rate": vitals.heart_rate,
-            "respiratory_rate": vitals.respiratory_rate,
-            "temperature_c": vitals.temperature_c,
-            "spo2": vitals.spo2,
-            "systolic_bp": vitals.systolic_bp,
-            "diastolic_bp": vitals.diastolic_bp,
-        },
-    }
 
-    ai = generate_clinical_summary(payload_ai)
-
-    summary = ClinicalSummary(
-        intake_id=intake_id,
-        short_summary=ai["short_summary"],
-        priority_level=ai["priority_level"],
-        red_flags="\n".join(ai["red_flags"]),
-        differential="\n".join(ai["differential_considerations"]),
-        recommended_questions="\n".join(ai["recommended_questions"]),
-        recommended_next_steps="\n".join(ai["recommended_next_steps"]),
-        decision="PENDING",
-    )
+async def _race_ai_summary(payload_ai: dict) -> tuple[dict | None, asyncio.Task | None]:
+    """(AI result, None) if Gemini answered within the deadline, else (None, task still in flight or None)."""
+    if SUMMARY_AI_DEADLINE_SECONDS <= 0 or not is_gemini_ready():
+        return None, None
+    task = asyncio.create_task(generate_ai_summary_async(payload_ai))
+    done, _ = await asyncio.wait({task}, timeout=SUMMARY_AI_DEADLINE_SECONDS)
+    if not done:
+        return None, task
+    if task.exception() is not None:
+        logger.warning("AI summary failed (%s); using rule-based summary.", task.exception())
+        return None, None
+    return task.result(), None
+
+
+def _store_summary(
+    db: Session, intake_id: int, result: dict, source: str, fingerprint: str, job_delay: float
+) -> tuple[dict, int, int | None]:
+    intake = db.get(PatientIntake, intake_id)
+    summary = ClinicalSummary(intake_id=intake_id, decision="PENDING")
+    apply_summary(summary, result, source)
     db.add(summary)
+    intake.clinical_summary = summary
     
     # Update workflow status to PENDING_DOCTOR
     intake.workflow_status = "PENDING_DOCTOR"
     intake.doctor_status = "PENDING"
     intake.doctor_status_updated_at = datetime.utcnow()
+    touch_intake(db, intake)
     db.add(intake)
+    db.flush()
+    job_id = None
+    if source == SOURCE_RULES and is_gemini_ready():
+        job = enqueue_summary_job(db, summary, fingerprint, delay_seconds=job_delay)
+        db.flush()
+        job_id = job.id
+    elif source == SOURCE_AI:
+        # Final text: warm translations for doctors reading other languages
+        enqueue_pretranslate_job(db, summary)
+    summary_id = summary.id
+    record_event(db, intake, "summary_updated")
     db.commit()
+    triage_queue.sync(db)
+    payload_cache.invalidate(intake_id)
+    return _summary_to_dict(summary), summary_id, job_id
 
-    result = _summary_to_dict(summary)
-    result["message"] = "Vitals successfully sent to Doctor"
-    return result
+
+def _forget(registry: dict, key: int, value: Any) -> None:
+    """Drop a finished registry entry unless a newer one has replaced it."""
+    if registry.get(key) is value:
+        del registry[key]
+
+
+async def _finish_late_summary(task: asyncio.Task, summary_id: int, intake_id: int, fingerprint: str) -> None:
+    try:
+        result = await task
+    except Exception as e:
+        logger.warning("Late AI summary for intake %s failed (%s); the background job will retry.", intake_id, e)
+        return
+    await asyncio.to_thread(_apply_ai_summary, summary_id, intake_id, fingerprint, result)
+
+
+def _apply_ai_summary(
+    summary_id: int, intake_id: int, fingerprint: str, result: dict, claimed_job_id: int | None = None
+) -> dict:
+    """
+    Store an AI result produced in this process (late race winner or stream)
+    and, if it was applied, retire the queued job that would otherwise
+    regenerate the same summary. Jobs for newer vitals are left alone.
+    A job the stream claimed for itself is finished either way.
+    """
+    with SessionLocal() as db:
+        note = upgrade_summary(db, summary_id, intake_id, fingerprint, result)
+        claimed = db.get(BackgroundJob, claimed_job_id) if claimed_job_id else None
+        if claimed is not None and claimed.status == JOB_RUNNING:
+            complete_job(db, claimed, f"{note} by stream")
+        if note == "upgraded":
+            pending = db.execute(
+                select(BackgroundJob).where(
+                    BackgroundJob.intake_id == intake_id,
+                    BackgroundJob.kind == SUMMARY_JOB,
+                    BackgroundJob.status == JOB_QUEUED,
+                )
+            ).scalars().all()
+            for job in pending:
+                data = job_payload(job)
+                if data.get("summary_id") == summary_id and data.get("vitals") == fingerprint:
+                    complete_job(db, job, f"{note} by request")
+        db.commit()
+        triage_queue.sync(db)
+        summary = db.get(ClinicalSummary, summary_id)
+        stored = _summary_to_dict(summary) if summary and summary.intake_id == intake_id else {}
+    payload_cache.invalidate(intake_id)
+    return stored
+
+
+def _load_summary_for_stream(intake_id: int) -> tuple[int, str, dict, dict] | None:
+    """(summary id, vitals fingerprint, stored summary dict, Gemini input) or None if there is nothing to stream."""
+    with SessionLocal() as db:
+        intake = db.get(PatientIntake, intake_id)
+        if not intake or not intake.clinical_summary or not intake.vitals:
+            return None
+        summary = intake.clinical_summary
+        return (
+            summary.id,
+            vitals_fingerprint(intake.vitals),
+            _summary_to_dict(summary),
+            summary_payload(intake, intake.vitals),
+        )
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+# One producer per intake in this process; every doctor streaming that case reads from it
+_SUMMARY_STREAMS: dict[int, tuple[SharedTextStream, asyncio.Task]] = {}
+# How long a stream waits for a summary that a late call or a worker is already generating
+SUMMARY_STREAM_WAIT_SECONDS = GEMINI_GOVERNOR.queue_timeout + GEMINI_TIMEOUT_SECONDS
+_SUMMARY_POLL_SECONDS = 0.5
+_STREAM_WORKER_ID = f"summary-stream:{os.getpid()}"
+
+
+def _open_summary_job(db: Session, intake_id: int, summary_id: int, fingerprint: str) -> BackgroundJob | None:
+    """The queued or running clinical_summary job for exactly this summary and vitals, if any."""
+    jobs = db.execute(
+        select(BackgroundJob).where(
+            BackgroundJob.intake_id == intake_id,
+            BackgroundJob.kind == SUMMARY_JOB,
+            BackgroundJob.status.in_([JOB_QUEUED, JOB_RUNNING]),
+        )
+    ).scalars().all()
+    for job in jobs:
+        data = job_payload(job)
+        if data.get("summary_id") == summary_id and data.get("vitals") == fingerprint:
+            return job
+    return None
+
+
+def _take_summary_job(intake_id: int, summary_id: int, fingerprint: str) -> tuple[bool, int | None]:
+    """
+    (True, job id) once the stream has claimed the summary's runnable job, so no
+    worker repeats the call; (True, None) if there is no open job; (False, None)
+    when a worker, or another process's late call (job still delayed), owns it.
+    """
+    with SessionLocal() as db:
+        job = _open_summary_job(db, intake_id, summary_id, fingerprint)
+        if job is None:
+            return True, None
+        claimed = claim_job_by_id(db, job.id, _STREAM_WORKER_ID)
+        return (True, claimed.id) if claimed is not None else (False, None)
+
+
+def _release_summary_job(job_id: int, error: Exception) -> None:
+    """Hand a claimed job back to the workers after the stream failed, as the worker would."""
+    with SessionLocal() as db:
+        job = db.get(BackgroundJob, job_id)
+        if job is None or job.status != JOB_RUNNING:
+            return
+        if isinstance(error, CircuitOpenError):
+            defer_job(db, job, max(1.0, GEMINI_BREAKER.retry_after()), str(error))
+        else:
+            fail_job(db, job, f"{type(error).__name__}: {error}")
+
+
+def _summary_settled(intake_id: int, summary_id: int, fingerprint: str) -> bool:
+    """True once the summary is AI-written or replaced, or nothing is generating it any more."""
+    with SessionLocal() as db:
+        summary = db.get(ClinicalSummary, summary_id)
+        if summary is None or summary.intake_id != intake_id or summary.source == SOURCE_AI:
+            return True
+        if not is_current_vitals(summary.intake, fingerprint):
+            return True
+        return _open_summary_job(db, intake_id, summary_id, fingerprint) is None
+
+
+def _stored_summary(intake_id: int) -> dict:
+    with SessionLocal() as db:
+        intake = db.get(PatientIntake, intake_id)
+        return _summary_to_dict(intake.clinical_summary) if intake else {}
+
+
+async def _wait_for_summary(intake_id: int, summary_id: int, fingerprint: str) -> None:
+    deadline = time.monotonic() + SUMMARY_STREAM_WAIT_SECONDS
+    while time.monotonic() < deadline:
+        if await asyncio.to_thread(_summary_settled, intake_id, summary_id, fingerprint):
+            return
+        await asyncio.sleep(_SUMMARY_POLL_SECONDS)
+
+
+async def _stream_from_gemini(
+    shared: SharedTextStream, intake_id: int, summary_id: int, fingerprint: str, payload_ai: dict, job_id: int | None
+) -> None:
+    try:
+        async for text in stream_ai_summary_async(payload_ai):
+            shared.push(text)
+        result = parse_summary_output("".join(shared.chunks))
+    except Exception as e:
+        if job_id is not None:
+            await asyncio.to_thread(_release_summary_job, job_id, e)
+        raise
+    await asyncio.to_thread(_apply_ai_summary, summary_id, intake_id, fingerprint, result, job_id)
+
+
+async def _produce_summary_stream(
+    shared: SharedTextStream, intake_id: int, summary_id: int, fingerprint: str, payload_ai: dict
+) -> None:
+    """
+    Feeds every doctor streaming this case. If a late call in this process, a
+    worker, or another process is already generating the summary, wait for it
+    instead of paying for a second call; otherwise take over the queued job and
+    stream from Gemini once.
+    """
+    error = None
+    try:
+        late = _LATE_SUMMARIES.get(intake_id)
+        if late is not None:
+            await asyncio.wait({late}, timeout=SUMMARY_STREAM_WAIT_SECONDS)
+        else:
+            owner, job_id = await asyncio.to_thread(_take_summary_job, intake_id, summary_id, fingerprint)
+            if owner:
+                await _stream_from_gemini(shared, intake_id, summary_id, fingerprint, payload_ai, job_id)
+            else:
+                await _wait_for_summary(intake_id, summary_id, fingerprint)
+    except Exception as e:
+        logger.warning("Streaming AI summary for intake %s failed (%s); keeping rule-based summary.", intake_id, e)
+        error = e
+    try:
+        stored = await asyncio.to_thread(_stored_summary, intake_id)
+    except Exception as e:
+        stored, error = {}, error or e
+    shared.finish(result=stored, error=error)
+
+
+def _summary_stream_for(intake_id: int, summary_id: int, fingerprint: str, payload_ai: dict) -> SharedTextStream:
+    """Join the running stream for this intake's current vitals, or start it."""
+    entry = _SUMMARY_STREAMS.get(intake_id)
+    if entry is not None and entry[0].key == fingerprint:
+        return entry[0]
+    shared = SharedTextStream(key=fingerprint)
+    task = asyncio.create_task(_produce_summary_stream(shared, intake_id, summary_id, fingerprint, payload_ai))
+    entry = _SUMMARY_STREAMS[intake_id] = (shared, task)
+    task.add_done_callback(lambda done: _forget(_SUMMARY_STREAMS, intake_id, entry))
+    return shared
+
+
+async def _summary_stream(request: Request, intake_id: int):
+    loaded = await asyncio.to_thread(_load_summary_for_stream, intake_id)
+    if loaded is None:
+        yield _sse("error", {"reason": "not_found"})
+        return
+    summary_id, fingerprint, stored, payload_ai = loaded
+    if stored["source"] == SOURCE_AI or not is_gemini_ready():
+        yield _sse("done", {"source": stored["source"], "summary": stored})
+        return
+
+    shared = _summary_stream_for(intake_id, summary_id, fingerprint, payload_ai)
+    parser = SummaryStreamParser()
+    async for text in shared.read():
+        if await request.is_disconnected():
+            return
+        for field, value, is_item in parser.feed(text):
+            yield _sse("item" if is_item else "field", {"field": field, "value": value})
+
+    stored = shared.result or {}
+    done = {"source": stored.get("source"), "summary": stored}
+    if shared.error is not None or stored.get("source") != SOURCE_AI:
+        done["fallback"] = True
+    yield _sse("done", done)
+
+
+@router.get("/intakes/{intake_id}/summary/stream")
+async def stream_summary(intake_id: int, request: Request, user: User = Depends(require_staff_stream)):
+    """
+    Server-Sent Events: stream a pending AI summary as Gemini writes it. Requires NURSE or DOCTOR role.
+    Emits `field` (short_summary, priority_level) and `item` (one list entry) events
+    as soon as each value is complete, then `done` with the stored summary.
+    Summaries that are already AI-generated are sent as a single `done` event.
+    Doctors on the same case share one Gemini stream, which takes over the
+    queued summary job; if a late vitals call or a worker is already generating
+    it, the stream just waits for that result and sends `done`.
+    """
+    return StreamingResponse(
+        _summary_stream(request, intake_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.post("/intakes/{intake_id}/decision")
@@ -315,8 +1153,12 @@ def update_decision(intake_id: int, payload: DecisionUpdate, db: Session = Depen
         intake.workflow_status = "COMPLETED"
     intake.doctor_status = new_status
     intake.doctor_status_updated_at = datetime.utcnow()
+    touch_intake(db, intake)
     db.add(intake)
+    record_event(db, intake, "decision_updated")
     db.commit()
+    triage_queue.sync(db)
+    payload_cache.invalidate(intake_id)
 
     if new_status == "ADMITTED":
         message = "Patient admitted successfully"
@@ -329,13 +1171,110 @@ def update_decision(intake_id: int, payload: DecisionUpdate, db: Session = Depen
     return {"status": "ok", "message": message}
 
 
+_QUEUE_STAGE_PATTERN = "^(" + "|".join(OPEN_STAGES) + ")$"
+
+
+@router.get("/queue")
+def get_queue(
+    top: int = Query(default=10, ge=1, le=_INTAKE_PAGE_MAX),
+    stage: str | None = Query(default=None, pattern=_QUEUE_STAGE_PATTERN),
+    db: Session = Depends(get_db),
+    user: User = Depends(require_staff),
+):
+    """
+    Most urgent open cases: priority, then stage (doctor review first), then wait time.
+    Requires NURSE or DOCTOR role. Served from the in-memory triage queue.
+    """
+    triage_queue.sync(db)
+    return {
+        "items": [entry_to_dict(e) for e in triage_queue.top(top, stage)],
+        "open_cases": len(triage_queue),
+    }
+
+
+@router.get("/queue/next")
+def get_queue_next(
+    stage: str | None = Query(default=None, pattern=_QUEUE_STAGE_PATTERN),
+    db: Session = Depends(get_db),
+    user: User = Depends(require_staff),
+):
+    """Next case to see (or null when the queue is empty). Requires NURSE or DOCTOR role."""
+    triage_queue.sync(db)
+    entry = triage_queue.peek(stage)
+    return {"item": entry_to_dict(entry) if entry else None}
+
+
+def _latest_event_id() -> int:
+    with SessionLocal() as db:
+        return latest_event_id(db)
+
+
+def _events_since(last_id: int) -> list[dict]:
+    with SessionLocal() as db:
+        return events_since(db, last_id)
+
+
+async def _event_stream(request: Request, last_event_id: int | None):
+    queue = broadcaster.subscribe()
+    try:
+        if last_event_id is None:
+            last_sent = await asyncio.to_thread(_latest_event_id)
+        else:
+            # Reconnect: replay what was missed before switching to live events.
+            last_sent = last_event_id
+            while True:
+                backlog = await asyncio.to_thread(_events_since, last_sent)
+                for event in backlog:
+                    yield format_sse(event)
+                    last_sent = event["id"]
+                if len(backlog) < EVENT_BATCH_SIZE:
+                    break
+        yield "retry: 3000\n\n"
+        while not await request.is_disconnected():
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if event is None:
+                break
+            if event["id"] <= last_sent:
+                continue
+            yield format_sse(event)
+            last_sent = event["id"]
+    finally:
+        broadcaster.unsubscribe(queue)
+
+
+@router.get("/events")
+async def stream_events(
+    request: Request,
+    last_event_id: str | None = Header(default=None),
+    user: User = Depends(require_staff_stream),
+):
+    """
+    Server-Sent Events stream of intake changes. Requires NURSE or DOCTOR role.
+    Event types: intake_created, intake_translated, vitals_submitted, summary_updated, decision_updated.
+    Browsers pass the token as ?access_token= since EventSource cannot set headers.
+    """
+    try:
+        resume_from = int(last_event_id) if last_event_id else None
+    except ValueError:
+        resume_from = None
+    return StreamingResponse(
+        _event_stream(request, resume_from),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 class TranslateRequest(BaseModel):
     language: str
     fields: dict[str, Any]
 
 
 @router.post("/translate")
-def translate_payload(payload: TranslateRequest = Body(...), user: User = Depends(require_staff)):
+async def translate_payload(payload: TranslateRequest = Body(...), user: User = Depends(require_staff)):
     target_language = (payload.language or "en").lower()
     allowed = {"en", "es", "fr", "ar", "pt"}
     if target_language not in allowed:
@@ -344,25 +1283,14 @@ def translate_payload(payload: TranslateRequest = Body(...), user: User = Depend
     if target_language == "en":
         return {"language": "en", "fields": payload.fields, "translated": False}
 
-    cache_key = _cache_key(target_language, payload.fields or {})
-    if cache_key in _TRANSLATION_CACHE:
-        return {
-            "language": target_language,
-            "fields": _TRANSLATION_CACHE[cache_key],
-            "translated": True,
-            "cached": True,
-        }
-
-    translated, ok, reason = translate_fields_payload(payload.fields or {}, target_language)
+    translated, ok, reason, sent = await translate_fields_cached_async(payload.fields or {}, target_language)
     if ok:
-        if len(_TRANSLATION_CACHE) >= _TRANSLATION_CACHE_MAX:
-            _TRANSLATION_CACHE.clear()
-        _TRANSLATION_CACHE[cache_key] = translated
-        return {"language": target_language, "fields": translated, "translated": True}
+        return {"language": target_language, "fields": translated, "translated": True, "cached": sent == 0}
 
+    # Fragments already in the cache are still shown translated
     return {
         "language": target_language,
-        "fields": payload.fields,
+        "fields": translated,
         "translated": False,
         "reason": reason or "failed",
     }
@@ -421,10 +1349,14 @@ def seed_demo_data(db: Session = Depends(get_db)):
     created_ids = []
     for patient_data in demo_patients:
         intake = PatientIntake(**patient_data)
+        touch_intake(db, intake)
         db.add(intake)
+        db.flush()
+        record_event(db, intake, "intake_created")
         db.commit()
         db.refresh(intake)
         created_ids.append(intake.id)
+    triage_queue.sync(db)
     
     return {"status": "success", "created_patients": len(demo_patients), "ids": created_ids}
 
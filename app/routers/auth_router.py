@@ -10,7 +10,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from ..db import get_db
-from ..schemas import LoginRequest, TokenResponse, UserInfo, RegisterRequest
+from ..schemas import LoginRequest, TokenResponse, UserInfo, RegisterRequest, PreferencesUpdate
 from ..auth import (
     authenticate_user,
     create_access_token,
@@ -139,6 +139,7 @@ def login(request: LoginRequest, db: Session = Depends(get_db)):
         staff_id=user.staff_id,
         role=user.role,
         full_name=user.full_name,
+        preferred_language=user.preferred_language or "en",
     )
 
 
@@ -154,9 +155,25 @@ def get_me(current_user: User = Depends(get_current_user)):
         role=current_user.role,
         full_name=current_user.full_name,
         is_active=current_user.is_active,
+        preferred_language=current_user.preferred_language or "en",
     )
 
 
+@router.patch("/me", response_model=UserInfo)
+def update_me(
+    request: PreferencesUpdate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Update the current user's preferences.
+    A doctor's preferred_language is used to pre-translate new summaries.
+    """
+    current_user.preferred_language = request.preferred_language
+    db.commit()
+    return get_me(current_user)
+
+
 @router.post("/logout")
 def logout():
     """
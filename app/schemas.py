@@ -20,7 +20,8 @@ class IntakeCreate(BaseModel):
     history: str = Field(default="", max_length=2000)
     medications: str = Field(default="", max_length=2000)
     allergies: str = Field(default="", max_length=2000)
-    preferred_language: str = Field(default="en", pattern="^(en|es|fr|ar|pt)$")
+    # Detected from the text when omitted
+    preferred_language: str | None = Field(default=None, pattern="^(en|es|fr|ar|pt)$")
 
 
 class VitalsCreate(BaseModel):
@@ -67,6 +68,7 @@ class TokenResponse(BaseModel):
     staff_id: str
     role: str
     full_name: str
+    preferred_language: str = "en"
 
 
 class UserInfo(BaseModel):
@@ -76,6 +78,7 @@ class UserInfo(BaseModel):
     role: str
     full_name: str
     is_active: bool
+    preferred_language: str = "en"
 
     class Config:
         from_attributes = True
@@ -89,3 +92,6 @@ class UserCreate(BaseModel):
     full_name: str = Field(min_length=1, max_length=120)
 
 
+class PreferencesUpdate(BaseModel):
+    """Request body for updating the signed-in user's preferences."""
+    preferred_language: str = Field(pattern="^(en|es|fr|ar|pt)$")
@@ -3,7 +3,7 @@ ai.py
 Gemini AI Integration for Clinic Co-Pilot
 
 This module:
-1. Calls Google Gemini API
+1. Calls Google Gemini API (blocking, plus *_async variants on the SDK's async client)
 2. Forces structured JSON output
 3. Falls back to rule-based logic if API fails
 """
@@ -11,8 +11,11 @@ This module:
 import os
 import json
 import time
+import hashlib
+import asyncio
 import logging
-from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Dict, Any
 from pathlib import Path
 from dotenv import load_dotenv
 GENAI_IMPORT_ERROR = None
@@ -26,6 +29,10 @@ except Exception as e:
     GENAI_IMPORT_ERROR = str(e)
 
 from .triage_rules import rule_based_flags
+from .rate_limit import AIGovernor, GovernorTimeout
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
+from .prompt_templates import PromptLibrary
+from .single_flight import SingleFlight
 
 # Load environment variables
 load_dotenv(override=True)
@@ -37,14 +44,44 @@ GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 # Use fast Gemini model (good balance for hackathon)
 MODEL_NAME = os.getenv("GEMINI_MODEL_NAME", "gemini-3-flash-preview")
 
+# Per-request HTTP timeout, so a hung call counts as a failure for the breaker
+GEMINI_TIMEOUT_SECONDS = float(os.getenv("GEMINI_TIMEOUT_SECONDS", "30"))
+
 GENAI_CLIENT = None
 if GEMINI_API_KEY and genai:
     try:
-        GENAI_CLIENT = genai.Client(api_key=GEMINI_API_KEY)
+        GENAI_CLIENT = genai.Client(
+            api_key=GEMINI_API_KEY,
+            http_options=genai.types.HttpOptions(timeout=int(GEMINI_TIMEOUT_SECONDS * 1000)),
+        )
     except Exception:
         GENAI_CLIENT = None
 
+# Client-side quota governor shared by every Gemini call in this process.
+# Limits are per process: split the project quota across uvicorn + job workers.
+GEMINI_GOVERNOR = AIGovernor(
+    requests_per_minute=float(os.getenv("GEMINI_RPM", "60")),
+    tokens_per_minute=float(os.getenv("GEMINI_TPM", "250000")),
+    max_concurrency=int(os.getenv("GEMINI_MAX_CONCURRENCY", "8")),
+    queue_timeout=float(os.getenv("GEMINI_QUEUE_TIMEOUT", "20")),
+)
+# Trips after consecutive Gemini errors/timeouts; while open, callers go straight to
+# fallback_summary / original text. Governor queue timeouts are local and don't count.
+GEMINI_BREAKER = CircuitBreaker(
+    "gemini",
+    failure_threshold=int(os.getenv("GEMINI_BREAKER_FAILURES", "5")),
+    cooldown_seconds=float(os.getenv("GEMINI_BREAKER_COOLDOWN", "30")),
+    half_open_max_calls=int(os.getenv("GEMINI_BREAKER_PROBES", "1")),
+    ignore=(GovernorTimeout,),
+)
+# Identical prompts in flight at the same time (same fields + language, or the same
+# intake + vitals) share one Gemini call; followers take no governor slot of their own.
+GEMINI_FLIGHTS = SingleFlight()
+# Rough output allowance added to the prompt estimate (~4 chars per token)
+OUTPUT_TOKEN_ESTIMATE = int(os.getenv("GEMINI_OUTPUT_TOKEN_ESTIMATE", "512"))
+
 PROMPT_DIR = Path(__file__).resolve().parent.parent / "prompts"
+PROMPTS = PromptLibrary(PROMPT_DIR)
 
 LANGUAGE_NAMES = {
     "en": "English",
@@ -62,6 +99,14 @@ def language_name(code_or_name: str) -> str:
     return LANGUAGE_NAMES.get(code, code_or_name)
 
 
+def language_code(code_or_name: str) -> str | None:
+    """"es" or "Spanish" -> "es"; None for languages we don't know."""
+    value = (code_or_name or "").strip().lower()
+    if value in LANGUAGE_NAMES:
+        return value
+    return next((code for code, name in LANGUAGE_NAMES.items() if name.lower() == value), None)
+
+
 def is_gemini_ready() -> bool:
     return bool(GEMINI_API_KEY and genai and GENAI_CLIENT)
 
@@ -73,6 +118,9 @@ def gemini_status() -> dict:
         "client_ready": bool(GENAI_CLIENT),
         "model": MODEL_NAME,
         "import_error": GENAI_IMPORT_ERROR,
+        "governor": GEMINI_GOVERNOR.stats(),
+        "circuit": GEMINI_BREAKER.stats(),
+        "single_flight": GEMINI_FLIGHTS.stats(),
     }
 
 
@@ -89,31 +137,78 @@ def _extract_text_from_response(response: Any) -> str:
     return getattr(response, "text", "") or ""
 
 
-def translate_text(text: str, target_language: str) -> str:
-    if not text or not str(text).strip():
-        return text
-    if not is_gemini_ready():
-        logger.warning("Gemini not configured; translation skipped.")
-        return text
+def estimate_tokens(prompt: str) -> int:
+    return len(prompt) // 4 + OUTPUT_TOKEN_ESTIMATE
+
+
+def _generate_text(prompt: str, timeout: float | None = None) -> str:
+    """
+    Blocking Gemini call; returns the stripped response text.
+    Raises CircuitOpenError at once while the breaker is open, and
+    GovernorTimeout after waiting `timeout` seconds for quota.
+    Concurrent calls with the same prompt wait for the first one's answer.
+    """
+    return GEMINI_FLIGHTS.do(_prompt_key(prompt), lambda: _call_gemini(prompt, timeout))
+
+
+def _prompt_key(prompt: str) -> str:
+    return hashlib.sha256(f"{MODEL_NAME}\n{prompt}".encode("utf-8")).hexdigest()
+
+
+def _call_gemini(prompt: str, timeout: float | None) -> str:
+    with GEMINI_BREAKER.guard(), GEMINI_GOVERNOR.slot(estimate_tokens(prompt), timeout):
+        response = GENAI_CLIENT.models.generate_content(
+            model=MODEL_NAME,
+            contents=prompt,
+        )
+    return _extract_text_from_response(response).strip()
+
+
+async def _generate_text_async(prompt: str, timeout: float | None = None) -> str:
+    """Same as _generate_text via the SDK's async client (no threadpool slot held)."""
+    return await GEMINI_FLIGHTS.do_async(_prompt_key(prompt), lambda: _call_gemini_async(prompt, timeout))
+
+
+async def _call_gemini_async(prompt: str, timeout: float | None) -> str:
+    with GEMINI_BREAKER.guard():
+        async with GEMINI_GOVERNOR.slot_async(estimate_tokens(prompt), timeout):
+            response = await GENAI_CLIENT.aio.models.generate_content(
+                model=MODEL_NAME,
+                contents=prompt,
+            )
+    return _extract_text_from_response(response).strip()
+
+
+def _strip_code_fence(output: str) -> str:
+    # Gemini sometimes wraps JSON in ```json
+    if "```" in output:
+        output = output.split("```")[1]
+        output = output.replace("json", "").strip()
+    return output
+
+
+def _translation_prompt(text: str, target_language: str) -> str:
     language = language_name(target_language)
-    prompt = (
+    return (
         f"Translate the following text to {language}. "
         "Return only the translated text with no extra commentary.\n\n"
         f"Text:\n{text}"
     )
-    try:
-        response = GENAI_CLIENT.models.generate_content(
-            model=MODEL_NAME,
-            contents=prompt,
-        )
-        output = _extract_text_from_response(response)
-        output = output.strip()
-        if not output:
-            logger.warning("Gemini translate returned empty text; using original.")
-        return output or text
-    except Exception as e:
-        logger.warning("Gemini translate failed (%s); using original.", e)
-        return text
+
+
+def _translation_result(text: str, output: str) -> tuple[str, bool]:
+    if not output:
+        logger.warning("Gemini translate returned empty text; using original.")
+        return text, False
+    return output, True
+
+
+def translate_text(text: str, target_language: str) -> str:
+    return translate_text_with_status(text, target_language)[0]
+
+
+async def translate_text_async(text: str, target_language: str) -> str:
+    return (await translate_text_with_status_async(text, target_language))[0]
 
 
 def translate_text_with_status(text: str, target_language: str) -> tuple[str, bool]:
@@ -122,90 +217,161 @@ def translate_text_with_status(text: str, target_language: str) -> tuple[str, bo
     if not is_gemini_ready():
         logger.warning("Gemini not configured; translation skipped.")
         return text, False
-    language = language_name(target_language)
-    prompt = (
-        f"Translate the following text to {language}. "
-        "Return only the translated text with no extra commentary.\n\n"
-        f"Text:\n{text}"
-    )
     try:
-        response = GENAI_CLIENT.models.generate_content(
-            model=MODEL_NAME,
-            contents=prompt,
-        )
-        output = _extract_text_from_response(response)
-        output = output.strip()
-        if not output:
-            logger.warning("Gemini translate returned empty text; using original.")
-            return text, False
-        return output, True
+        output = _generate_text(_translation_prompt(text, target_language))
     except Exception as e:
         logger.warning("Gemini translate failed (%s); using original.", e)
         return text, False
+    return _translation_result(text, output)
 
 
-def translate_fields_payload(fields: Dict[str, Any], target_language: str) -> tuple[Dict[str, Any], bool, str | None]:
-    if not fields:
-        return fields, False, "empty_fields"
+async def translate_text_with_status_async(text: str, target_language: str) -> tuple[str, bool]:
+    if not text or not str(text).strip():
+        return text, False
     if not is_gemini_ready():
         logger.warning("Gemini not configured; translation skipped.")
-        return fields, False, "ai_not_configured"
+        return text, False
+    try:
+        output = await _generate_text_async(_translation_prompt(text, target_language))
+    except Exception as e:
+        logger.warning("Gemini translate failed (%s); using original.", e)
+        return text, False
+    return _translation_result(text, output)
+
+
+_FIELDS_ATTEMPTS = 2
+_FIELDS_RETRY_SECONDS = 1.5
+# Fields payloads above this many JSON characters are split and translated chunk by chunk,
+# concurrently (still under GEMINI_GOVERNOR's cap), so one bad reply only costs its chunk
+_FIELDS_CHUNK_CHARS = int(os.getenv("GEMINI_TRANSLATE_CHUNK_CHARS", "1500"))
+# Threads for the sync path; the governor decides how many calls actually run at once
+_FIELDS_POOL = ThreadPoolExecutor(max_workers=GEMINI_GOVERNOR.max_concurrency, thread_name_prefix="translate-chunk")
+
+
+def _fields_prompt(fields: Dict[str, Any], target_language: str) -> str:
     language = language_name(target_language)
     payload = json.dumps(fields, ensure_ascii=False)
-    prompt = (
+    return (
         f"Translate all string values in the following JSON to {language}. "
         "Preserve keys, structure, numbers, and arrays. Return ONLY valid JSON.\n\n"
         f"JSON:\n{payload}"
     )
-    attempts = 2
-    for idx in range(attempts):
+
+
+def _fields_result(fields: Dict[str, Any], output: str) -> tuple[Dict[str, Any], bool, str | None]:
+    output = _strip_code_fence(output)
+    if not output:
+        logger.warning("Gemini translate returned empty JSON; using original.")
+        return fields, False, "empty_response"
+    parsed = json.loads(output)
+    if not isinstance(parsed, dict):
+        logger.warning("Gemini translate returned non-dict JSON; using original.")
+        return fields, False, "invalid_json"
+    return parsed, True, None
+
+
+def _fields_error(fields: Dict[str, Any], e: Exception, can_retry: bool) -> tuple[Dict[str, Any], bool, str | None] | None:
+    """Map a failed fields translation to its result, or None if the caller should retry."""
+    if isinstance(e, CircuitOpenError):
+        return fields, False, "circuit_open"
+    if isinstance(e, GovernorTimeout):
+        logger.warning("Gemini translate queued past its deadline; using original.")
+        return fields, False, "rate_limited"
+    if isinstance(e, json.JSONDecodeError):
+        logger.warning("Gemini translate returned malformed JSON.")
+        return None if can_retry else (fields, False, "invalid_json")
+    message = str(e)
+    if "RESOURCE_EXHAUSTED" in message or "429" in message:
+        logger.warning("Gemini translate quota exhausted; using original.")
+        return fields, False, "quota_exceeded"
+    if "UNAVAILABLE" in message or "503" in message:
+        logger.warning("Gemini translate unavailable (high demand).")
+        if can_retry:
+            return None
+        return fields, False, "service_unavailable"
+    logger.warning("Gemini translate failed (%s); using original.", e)
+    return fields, False, "failed"
+
+
+def _fields_chunks(fields: Dict[str, Any]) -> list[Dict[str, Any]]:
+    """Split fields into key groups of at most _FIELDS_CHUNK_CHARS JSON characters (a bigger value goes alone)."""
+    chunks: list[Dict[str, Any]] = []
+    current: Dict[str, Any] = {}
+    size = 0
+    for key, value in fields.items():
+        item = len(json.dumps({key: value}, ensure_ascii=False))
+        if current and size + item > _FIELDS_CHUNK_CHARS:
+            chunks.append(current)
+            current, size = {}, 0
+        current[key] = value
+        size += item
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _merge_chunks(
+    chunks: list[Dict[str, Any]], results: list[tuple[Dict[str, Any], bool, str | None]]
+) -> tuple[Dict[str, Any], bool, str | None]:
+    """Join chunk results; a failed chunk keeps its original values and fails the whole call."""
+    if len(results) == 1:
+        return results[0]
+    merged: Dict[str, Any] = {}
+    ok, reason = True, None
+    for chunk, (result, chunk_ok, chunk_reason) in zip(chunks, results):
+        merged.update(result if chunk_ok else chunk)
+        if not chunk_ok and ok:
+            ok, reason = False, chunk_reason
+    return merged, ok, reason
+
+
+def _translate_chunk(fields: Dict[str, Any], target_language: str) -> tuple[Dict[str, Any], bool, str | None]:
+    prompt = _fields_prompt(fields, target_language)
+    for idx in range(_FIELDS_ATTEMPTS):
         try:
-            response = GENAI_CLIENT.models.generate_content(
-                model=MODEL_NAME,
-                contents=prompt,
-            )
-            output = _extract_text_from_response(response)
-            output = output.strip()
-            if "```" in output:
-                output = output.split("```")[1]
-                output = output.replace("json", "").strip()
-            if not output:
-                logger.warning("Gemini translate returned empty JSON; using original.")
-                return fields, False, "empty_response"
-            parsed = json.loads(output)
-            if not isinstance(parsed, dict):
-                logger.warning("Gemini translate returned non-dict JSON; using original.")
-                return fields, False, "invalid_json"
-            return parsed, True, None
+            return _fields_result(fields, _generate_text(prompt))
         except Exception as e:
-            message = str(e)
-            if "RESOURCE_EXHAUSTED" in message or "429" in message:
-                logger.warning("Gemini translate quota exhausted; using original.")
-                return fields, False, "quota_exceeded"
-            if "UNAVAILABLE" in message or "503" in message:
-                logger.warning("Gemini translate unavailable (high demand).")
-                if idx < attempts - 1:
-                    time.sleep(1.5)
-                    continue
-                return fields, False, "service_unavailable"
-            logger.warning("Gemini translate failed (%s); using original.", e)
-            return fields, False, "failed"
-
-
-def _load_prompt(name: str) -> str | None:
-    path = PROMPT_DIR / name
-    try:
-        text = path.read_text(encoding="utf-8").strip()
-    except FileNotFoundError:
-        return None
-    return text if text else None
+            result = _fields_error(fields, e, can_retry=idx < _FIELDS_ATTEMPTS - 1)
+            if result is not None:
+                return result
+            time.sleep(_FIELDS_RETRY_SECONDS)
+
+
+async def _translate_chunk_async(fields: Dict[str, Any], target_language: str) -> tuple[Dict[str, Any], bool, str | None]:
+    prompt = _fields_prompt(fields, target_language)
+    for idx in range(_FIELDS_ATTEMPTS):
+        try:
+            return _fields_result(fields, await _generate_text_async(prompt))
+        except Exception as e:
+            result = _fields_error(fields, e, can_retry=idx < _FIELDS_ATTEMPTS - 1)
+            if result is not None:
+                return result
+            await asyncio.sleep(_FIELDS_RETRY_SECONDS)
+
+
+def translate_fields_payload(fields: Dict[str, Any], target_language: str) -> tuple[Dict[str, Any], bool, str | None]:
+    if not fields:
+        return fields, False, "empty_fields"
+    if not is_gemini_ready():
+        logger.warning("Gemini not configured; translation skipped.")
+        return fields, False, "ai_not_configured"
+    chunks = _fields_chunks(fields)
+    if len(chunks) == 1:
+        return _translate_chunk(fields, target_language)
+    results = list(_FIELDS_POOL.map(lambda chunk: _translate_chunk(chunk, target_language), chunks))
+    return _merge_chunks(chunks, results)
 
 
-def _render_prompt(template: str, context: dict[str, Any]) -> str:
-    rendered = template
-    for key, value in context.items():
-        rendered = rendered.replace(f"{{{{{key}}}}}", str(value))
-    return rendered
+async def translate_fields_payload_async(fields: Dict[str, Any], target_language: str) -> tuple[Dict[str, Any], bool, str | None]:
+    """Async twin of translate_fields_payload; the retry back-off does not block the event loop."""
+    if not fields:
+        return fields, False, "empty_fields"
+    if not is_gemini_ready():
+        logger.warning("Gemini not configured; translation skipped.")
+        return fields, False, "ai_not_configured"
+    chunks = _fields_chunks(fields)
+    results = await asyncio.gather(*(_translate_chunk_async(chunk, target_language) for chunk in chunks))
+    return _merge_chunks(chunks, list(results))
 
 
 def generate_clinical_summary(payload: Dict[str, Any]) -> Dict[str, Any]:
@@ -217,56 +383,92 @@ def generate_clinical_summary(payload: Dict[str, Any]) -> Dict[str, Any]:
     """
 
     try:
-        if not GEMINI_API_KEY or not genai or not GENAI_CLIENT:
-            raise Exception("Gemini client not configured")
+        return generate_ai_summary(payload)
+    except Exception as e:
+        return _summary_fallback(payload, e)
 
-        prompt = build_prompt(payload)
 
-        response = GENAI_CLIENT.models.generate_content(
-            model=MODEL_NAME,
-            contents=prompt,
-        )
-        text_output = _extract_text_from_response(response)
-
-        text_output = text_output.strip()
-        if not text_output:
-            raise ValueError("Gemini response was empty")
-
-        # Gemini sometimes wraps JSON in ```json
-        if "```" in text_output:
-            text_output = text_output.split("```")[1]
-            text_output = text_output.replace("json", "").strip()
-
-        parsed = json.loads(text_output)
-
-        required_keys = {
-            "short_summary",
-            "priority_level",
-            "red_flags",
-            "differential_considerations",
-            "recommended_questions",
-            "recommended_next_steps",
-        }
-        if not required_keys.issubset(parsed):
-            raise ValueError("Gemini response missing required keys")
-        list_keys = [
-            "red_flags",
-            "differential_considerations",
-            "recommended_questions",
-            "recommended_next_steps",
-        ]
-        if not all(isinstance(parsed.get(k), list) for k in list_keys):
-            raise ValueError("Gemini response has invalid list fields")
-
-        return parsed
+async def generate_clinical_summary_async(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Async twin of generate_clinical_summary."""
 
+    try:
+        return await generate_ai_summary_async(payload)
     except Exception as e:
-        try:
-            print(f"Gemini AI failed: {type(e).__name__}: {e}")
-            print("Falling back to rule-based summary for safety.")
-        except Exception:
-            pass
-        return fallback_summary(payload)
+        return _summary_fallback(payload, e)
+
+
+def _summary_fallback(payload: Dict[str, Any], e: Exception) -> Dict[str, Any]:
+    logger.warning("Gemini AI failed (%s: %s); falling back to rule-based summary.", type(e).__name__, e)
+    return fallback_summary(payload)
+
+
+def generate_ai_summary(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Gemini-only summary. Raises on any failure (not configured, bad JSON,
+    missing keys) so background jobs can retry instead of settling for rules.
+    """
+
+    if not is_gemini_ready():
+        raise RuntimeError("Gemini client not configured")
+    return parse_summary_output(_generate_text(build_prompt(payload)))
+
+
+async def generate_ai_summary_async(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Async twin of generate_ai_summary."""
+
+    if not is_gemini_ready():
+        raise RuntimeError("Gemini client not configured")
+    return parse_summary_output(await _generate_text_async(build_prompt(payload)))
+
+
+async def stream_ai_summary_async(payload: Dict[str, Any]) -> AsyncIterator[str]:
+    """
+    Yield raw text deltas from Gemini's streaming API as they arrive.
+    The caller parses incrementally and validates the joined text with
+    parse_summary_output at the end. Breaker and governor apply as usual.
+    """
+
+    if not is_gemini_ready():
+        raise RuntimeError("Gemini client not configured")
+    prompt = build_prompt(payload)
+    with GEMINI_BREAKER.guard():
+        async with GEMINI_GOVERNOR.slot_async(estimate_tokens(prompt)):
+            stream = await GENAI_CLIENT.aio.models.generate_content_stream(
+                model=MODEL_NAME,
+                contents=prompt,
+            )
+            async for chunk in stream:
+                text = _extract_text_from_response(chunk)
+                if text:
+                    yield text
+
+
+def parse_summary_output(text_output: str) -> Dict[str, Any]:
+    if not text_output:
+        raise ValueError("Gemini response was empty")
+
+    parsed = json.loads(_strip_code_fence(text_output))
+
+    required_keys = {
+        "short_summary",
+        "priority_level",
+        "red_flags",
+        "differential_considerations",
+        "recommended_questions",
+        "recommended_next_steps",
+    }
+    if not required_keys.issubset(parsed):
+        raise ValueError("Gemini response missing required keys")
+    list_keys = [
+        "red_flags",
+        "differential_considerations",
+        "recommended_questions",
+        "recommended_next_steps",
+    ]
+    if not all(isinstance(parsed.get(k), list) for k in list_keys):
+        raise ValueError("Gemini response has invalid list fields")
+
+    return parsed
 
 
 def build_prompt(payload: Dict[str, Any]) -> str:
@@ -284,8 +486,8 @@ def build_prompt(payload: Dict[str, Any]) -> str:
     medications = intake.get('medications', '').strip() or "None reported"
     allergies = intake.get('allergies', '').strip() or "None reported"
 
-    base = _load_prompt("intake_summary.md")
-    red_flags_guidance = _load_prompt("red_flags.md") or ""
+    base = PROMPTS.get("intake_summary.md")
+    red_flags_guidance = PROMPTS.text("red_flags.md") or ""
 
     context = {
         "full_name": intake.get("full_name", ""),
@@ -308,7 +510,7 @@ def build_prompt(payload: Dict[str, Any]) -> str:
     }
 
     if base:
-        return _render_prompt(base, context)
+        return base.render(context)
 
     return f"""
 You are a clinical decision-support assistant.
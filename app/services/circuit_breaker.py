@@ -0,0 +1,133 @@
+"""
+circuit_breaker.py
+- Fail-fast guard for the Gemini integration.
+- CLOSED: calls go through; N consecutive failures trip it OPEN.
+- OPEN: calls are refused at once (callers use their deterministic fallback)
+  until the cooldown ends, then HALF_OPEN lets a few probes through.
+- A successful probe closes it again; a failed one re-opens it.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any
+
+CLOSED = "CLOSED"
+OPEN = "OPEN"
+HALF_OPEN = "HALF_OPEN"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a dependency whose circuit is open."""
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int,
+        cooldown_seconds: float,
+        half_open_max_calls: int = 1,
+        ignore: tuple[type[BaseException], ...] = (),
+    ):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown_seconds = cooldown_seconds
+        self.half_open_max_calls = max(1, half_open_max_calls)
+        # Errors that say nothing about the dependency's health (e.g. local queue timeouts)
+        self.ignore = ignore
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._trips = 0
+        self._rejected = 0
+        self._last_error: str | None = None
+
+    def _current_state(self, now: float) -> str:
+        if self._state == OPEN and now - self._opened_at >= self.cooldown_seconds:
+            self._state = HALF_OPEN
+            self._probes = 0
+        return self._state
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state(time.monotonic())
+
+    def retry_after(self) -> float:
+        """Seconds left in the cooldown (0 unless OPEN)."""
+        with self._lock:
+            now = time.monotonic()
+            if self._current_state(now) != OPEN:
+                return 0.0
+            return max(0.0, self.cooldown_seconds - (now - self._opened_at))
+
+    def before_call(self) -> None:
+        with self._lock:
+            state = self._current_state(time.monotonic())
+            if state == CLOSED:
+                return
+            if state == HALF_OPEN and self._probes < self.half_open_max_calls:
+                self._probes += 1
+                return
+            self._rejected += 1
+        raise CircuitOpenError(f"{self.name} circuit is open; using fallback")
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._probes = 0
+
+    def record_failure(self, error: BaseException) -> None:
+        with self._lock:
+            self._last_error = f"{type(error).__name__}: {error}"[:300]
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    self._trips += 1
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+                self._probes = 0
+
+    def _release(self) -> None:
+        # The call ended without a verdict; free its half-open probe slot
+        with self._lock:
+            if self._state == HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    @contextmanager
+    def guard(self):
+        """Wrap one dependency call; usable around awaits too since it never blocks."""
+        self.before_call()
+        try:
+            yield
+        except self.ignore:
+            self._release()
+            raise
+        except Exception as e:
+            self.record_failure(e)
+            raise
+        except BaseException:
+            self._release()
+            raise
+        else:
+            self.record_success()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            now = time.monotonic()
+            state = self._current_state(now)
+            return {
+                "state": state,
+                "consecutive_failures": self._failures,
+                "failure_threshold": self.failure_threshold,
+                "cooldown_seconds": self.cooldown_seconds,
+                "retry_after_seconds": round(max(0.0, self.cooldown_seconds - (now - self._opened_at)), 1)
+                if state == OPEN else 0.0,
+                "trips": self._trips,
+                "rejected": self._rejected,
+                "last_error": self._last_error,
+            }
@@ -0,0 +1,146 @@
+"""
+events.py
+- Change events for the live nurse/doctor queues (Server-Sent Events).
+- Write endpoints append a row to intake_events in the same transaction as the change.
+- Each worker process runs one broadcaster that polls the table and fans new
+  rows out to its connected clients, so multi-worker deployments stay in sync.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from ..db import SessionLocal
+from ..models import IntakeEvent, PatientIntake
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL_SECONDS = float(os.getenv("EVENTS_POLL_SECONDS", "1.0"))
+KEEPALIVE_SECONDS = 15.0
+SUBSCRIBER_QUEUE_MAX = 500
+EVENT_RETENTION = timedelta(days=1)
+_PRUNE_EVERY = 1000
+EVENT_BATCH_SIZE = 500
+
+
+def record_event(db: Session, intake: PatientIntake, event_type: str) -> IntakeEvent:
+    """
+    Queue an event row for this intake write (caller commits).
+    The payload is deliberately compact; clients fetch details if they need them.
+    """
+    return record_events(db, [intake], event_type)[0]
+
+
+def record_events(db: Session, intakes: list[PatientIntake], event_type: str) -> list[IntakeEvent]:
+    """Batch form of record_event: one flush for the whole list."""
+    events = []
+    for intake in intakes:
+        summary = intake.clinical_summary
+        payload = {
+            "intake_id": intake.id,
+            "change_seq": intake.change_seq,
+            "workflow_status": intake.workflow_status,
+            "doctor_status": intake.doctor_status,
+            "priority_level": summary.priority_level if summary else None,
+        }
+        events.append(IntakeEvent(
+            intake_id=intake.id,
+            event_type=event_type,
+            payload=json.dumps(payload, separators=(",", ":")),
+        ))
+    db.add_all(events)
+    db.flush()
+    if events and events[-1].id // _PRUNE_EVERY > (events[0].id - 1) // _PRUNE_EVERY:
+        db.execute(delete(IntakeEvent).where(IntakeEvent.created_at < datetime.utcnow() - EVENT_RETENTION))
+    return events
+
+
+def _event_to_dict(event: IntakeEvent) -> dict[str, Any]:
+    return {"id": event.id, "type": event.event_type, "intake_id": event.intake_id, "data": event.payload}
+
+
+def latest_event_id(db: Session) -> int:
+    return db.execute(select(func.max(IntakeEvent.id))).scalar() or 0
+
+
+def events_since(db: Session, last_id: int, limit: int = EVENT_BATCH_SIZE) -> list[dict[str, Any]]:
+    rows = db.execute(
+        select(IntakeEvent)
+        .where(IntakeEvent.id > last_id)
+        .order_by(IntakeEvent.id.asc())
+        .limit(limit)
+    ).scalars().all()
+    return [_event_to_dict(row) for row in rows]
+
+
+def format_sse(event: dict[str, Any]) -> str:
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {event['data']}\n\n"
+
+
+class EventBroadcaster:
+    """
+    One poller per process, shared by every SSE client connected to it.
+    The poll task only runs while someone is subscribed.
+    """
+
+    def __init__(self, poll_interval: float = POLL_INTERVAL_SECONDS):
+        self.poll_interval = poll_interval
+        self._subscribers: set[asyncio.Queue] = set()
+        self._last_id: int | None = None
+        self._task: asyncio.Task | None = None
+
+    def subscribe(self) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_MAX)
+        self._subscribers.add(queue)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers.discard(queue)
+
+    def _fetch(self) -> list[dict[str, Any]]:
+        with SessionLocal() as db:
+            if self._last_id is None:
+                self._last_id = latest_event_id(db)
+                return []
+            return events_since(db, self._last_id)
+
+    async def poll_once(self) -> int:
+        events = await asyncio.to_thread(self._fetch)
+        if not events:
+            return 0
+        self._last_id = events[-1]["id"]
+        for queue in list(self._subscribers):
+            for event in events:
+                try:
+                    queue.put_nowait(event)
+                except asyncio.QueueFull:
+                    # Slow client: end its stream with a None sentinel. The browser
+                    # reconnects with Last-Event-ID and replays from the table.
+                    self._subscribers.discard(queue)
+                    while not queue.empty():
+                        queue.get_nowait()
+                    queue.put_nowait(None)
+                    break
+        return len(events)
+
+    async def _run(self) -> None:
+        while self._subscribers:
+            try:
+                fetched = await self.poll_once()
+            except Exception as e:
+                logger.warning("Event poll failed (%s); retrying.", e)
+                fetched = 0
+            if fetched < EVENT_BATCH_SIZE:
+                await asyncio.sleep(self.poll_interval)
+        self._task = None
+
+
+broadcaster = EventBroadcaster()
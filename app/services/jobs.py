@@ -0,0 +1,149 @@
+"""
+jobs.py
+- Durable background jobs stored in SQLite (background_jobs table).
+- API requests enqueue inside their own write transaction, so a job exists
+  exactly when the change that needs it was committed.
+- Separate worker processes (`python -m app.worker`) claim jobs with a
+  conditional UPDATE; SQLite's write lock guarantees one winner per job.
+"""
+
+import json
+import os
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.orm import Session
+
+from ..models import BackgroundJob
+
+JOB_QUEUED = "QUEUED"
+JOB_RUNNING = "RUNNING"
+JOB_DONE = "DONE"
+JOB_FAILED = "FAILED"
+
+MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "4"))
+RETRY_BASE_SECONDS = float(os.getenv("JOB_RETRY_BASE_SECONDS", "5"))
+# A RUNNING job whose worker died is handed out again after this long
+LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "300"))
+
+PRIORITY_RANK = {"HIGH": 0, "MED": 1, "LOW": 2}
+
+
+def priority_rank(priority_level: str | None) -> int:
+    return PRIORITY_RANK.get((priority_level or "").upper(), 1)
+
+
+def enqueue_job(
+    db: Session,
+    kind: str,
+    intake_id: int | None = None,
+    payload: dict[str, Any] | None = None,
+    priority: int = 1,
+    delay_seconds: float = 0,
+) -> BackgroundJob:
+    """Add a job to the queue (caller commits); it becomes claimable after delay_seconds."""
+    job = BackgroundJob(
+        kind=kind,
+        intake_id=intake_id,
+        payload=json.dumps(payload or {}, separators=(",", ":")),
+        priority=priority,
+        status=JOB_QUEUED,
+        run_after=datetime.utcnow() + timedelta(seconds=delay_seconds),
+    )
+    db.add(job)
+    return job
+
+
+def _claimable(now: datetime):
+    return or_(
+        and_(BackgroundJob.status == JOB_QUEUED, BackgroundJob.run_after <= now),
+        and_(BackgroundJob.status == JOB_RUNNING, BackgroundJob.locked_at < now - timedelta(seconds=LEASE_SECONDS)),
+    )
+
+
+def claim_job(db: Session, worker_id: str, kinds: list[str] | None = None) -> BackgroundJob | None:
+    """
+    Take the most urgent runnable job, or None if the queue is idle.
+    Another worker may win the race for a candidate; then try the next one.
+    """
+    for _ in range(5):
+        now = datetime.utcnow()
+        stmt = select(BackgroundJob.id).where(_claimable(now))
+        if kinds:
+            stmt = stmt.where(BackgroundJob.kind.in_(kinds))
+        job_id = db.execute(
+            stmt.order_by(BackgroundJob.priority.asc(), BackgroundJob.id.asc()).limit(1)
+        ).scalar_one_or_none()
+        if job_id is None:
+            return None
+
+        job = claim_job_by_id(db, job_id, worker_id)
+        if job is not None:
+            return job
+    return None
+
+
+def claim_job_by_id(db: Session, job_id: int, worker_id: str) -> BackgroundJob | None:
+    """Claim one particular job if it is runnable right now (same rules as claim_job), else None."""
+    now = datetime.utcnow()
+    result = db.execute(
+        update(BackgroundJob)
+        .where(BackgroundJob.id == job_id, _claimable(now))
+        .values(
+            status=JOB_RUNNING,
+            locked_by=worker_id,
+            locked_at=now,
+            attempts=BackgroundJob.attempts + 1,
+        )
+    )
+    db.commit()
+    if result.rowcount == 1:
+        return db.get(BackgroundJob, job_id)
+    return None
+
+
+def complete_job(db: Session, job: BackgroundJob, note: str = "") -> None:
+    """Mark a claimed job finished (caller commits, usually with the job's own writes)."""
+    job.status = JOB_DONE
+    job.last_error = note
+    job.finished_at = datetime.utcnow()
+    job.locked_by = None
+    job.locked_at = None
+
+
+def fail_job(db: Session, job: BackgroundJob, error: str) -> None:
+    """
+    Record a failed attempt and commit. The job is re-queued with
+    exponential backoff until MAX_ATTEMPTS, then parked as FAILED.
+    """
+    job.last_error = error[:2000]
+    job.locked_by = None
+    job.locked_at = None
+    if job.attempts >= MAX_ATTEMPTS:
+        job.status = JOB_FAILED
+        job.finished_at = datetime.utcnow()
+    else:
+        job.status = JOB_QUEUED
+        job.run_after = datetime.utcnow() + timedelta(seconds=RETRY_BASE_SECONDS * 2 ** (job.attempts - 1))
+    db.add(job)
+    db.commit()
+
+
+def defer_job(db: Session, job: BackgroundJob, delay_seconds: float, reason: str) -> None:
+    """Put a claimed job back without using up an attempt (e.g. dependency known to be down)."""
+    job.status = JOB_QUEUED
+    job.attempts = max(0, job.attempts - 1)
+    job.last_error = reason
+    job.locked_by = None
+    job.locked_at = None
+    job.run_after = datetime.utcnow() + timedelta(seconds=delay_seconds)
+    db.add(job)
+    db.commit()
+
+
+def job_payload(job: BackgroundJob) -> dict[str, Any]:
+    try:
+        return json.loads(job.payload or "{}")
+    except ValueError:
+        return {}
@@ -0,0 +1,119 @@
+"""
+language_detect.py
+- Local language identification for the supported languages, so text that is
+  already in the target language never reaches Gemini.
+- Arabic is recognised by script; en/es/fr/pt by a character trigram model
+  built once from the sample texts in app/language_samples.
+- Short or ambiguous text gives None and is translated as before.
+"""
+
+import math
+import os
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Any, Iterator
+
+SAMPLE_DIR = Path(__file__).resolve().parent.parent / "language_samples"
+# Below this many letters (e.g. "2 hours", "None") a guess is not worth trusting
+MIN_LETTERS = int(os.getenv("LANGUAGE_DETECT_MIN_LETTERS", "12"))
+# Required lead of the best language over the runner-up, in mean log-probability per trigram
+MIN_MARGIN = float(os.getenv("LANGUAGE_DETECT_MIN_MARGIN", "0.3"))
+# Long text is scored on its first and last SAMPLE_CHARS, which must agree (catches mixed text)
+SAMPLE_CHARS = 300
+
+_ARABIC_RANGES = ((0x0600, 0x06FF), (0x0750, 0x077F), (0x08A0, 0x08FF), (0xFB50, 0xFDFF), (0xFE70, 0xFEFF))
+
+
+def _is_arabic(ch: str) -> bool:
+    code = ord(ch)
+    return any(start <= code <= end for start, end in _ARABIC_RANGES)
+
+
+def _trigrams(text: str) -> Iterator[str]:
+    """Trigrams of each lower-cased word padded with spaces (" ch", "che", ...)."""
+    cleaned = "".join(ch if ch.isalpha() else " " for ch in text.lower())
+    for word in cleaned.split():
+        padded = f" {word} "
+        for index in range(len(padded) - 2):
+            yield padded[index:index + 3]
+
+
+class LanguageDetector:
+    def __init__(self, sample_dir: Path = SAMPLE_DIR, min_letters: int = MIN_LETTERS, min_margin: float = MIN_MARGIN):
+        self.sample_dir = sample_dir
+        self.min_letters = min_letters
+        self.min_margin = min_margin
+        self._lock = threading.Lock()
+        # language -> (log-probability per trigram, log-probability of an unseen trigram)
+        self._profiles: dict[str, tuple[dict[str, float], float]] | None = None
+        self.checked = 0
+        self.matched = 0
+
+    def _load(self) -> dict[str, tuple[dict[str, float], float]]:
+        if self._profiles is None:
+            with self._lock:
+                if self._profiles is None:
+                    counts = {
+                        path.stem: Counter(_trigrams(path.read_text(encoding="utf-8")))
+                        for path in sorted(self.sample_dir.glob("*.txt"))
+                    }
+                    vocabulary = len(set().union(*counts.values())) + 1 if counts else 1
+                    profiles = {}
+                    for language, grams in counts.items():
+                        # Add-one smoothing so unseen trigrams cost a little instead of everything
+                        denominator = sum(grams.values()) + vocabulary
+                        profiles[language] = (
+                            {gram: math.log((count + 1) / denominator) for gram, count in grams.items()},
+                            math.log(1 / denominator),
+                        )
+                    self._profiles = profiles
+        return self._profiles
+
+    def detect(self, text: str) -> str | None:
+        """Language code of the text, or None when it is too short, mixed or too close to call."""
+        if len(text) > 2 * SAMPLE_CHARS:
+            head = self._detect(text[:SAMPLE_CHARS])
+            return head if head == self._detect(text[-SAMPLE_CHARS:]) else None
+        return self._detect(text)
+
+    def _detect(self, text: str) -> str | None:
+        letters = [ch for ch in text if ch.isalpha()]
+        if len(letters) < self.min_letters:
+            return None
+        arabic = sum(1 for ch in letters if _is_arabic(ch))
+        if arabic:
+            return "ar" if arabic >= 0.6 * len(letters) else None
+
+        grams = list(_trigrams(text))
+        scores = sorted(
+            (
+                (sum(table.get(gram, unseen) for gram in grams) / len(grams), language)
+                for language, (table, unseen) in self._load().items()
+            ),
+            reverse=True,
+        )
+        if not scores:
+            return None
+        if len(scores) > 1 and scores[0][0] - scores[1][0] < self.min_margin:
+            return None
+        return scores[0][1]
+
+    def is_language(self, text: str, language: str) -> bool:
+        """True when the text is confidently already in `language` (a code such as "en")."""
+        matched = self.detect(text) == language
+        with self._lock:
+            self.checked += 1
+            self.matched += matched
+        return matched
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "checked": self.checked,
+                "already_in_target": self.matched,
+                "languages": sorted(self._profiles) + ["ar"] if self._profiles is not None else None,
+            }
+
+
+language_detector = LanguageDetector()
@@ -0,0 +1,80 @@
+"""
+payload_cache.py
+- Bounded LRU of pre-encoded JSON fragments for intake payloads.
+- Keys include the intake's change_seq, so a write makes old entries unreachable;
+  write endpoints also drop them eagerly to free memory.
+- Uses orjson when installed, falling back to the stdlib json module.
+"""
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+ORJSON_IMPORT_ERROR = None
+try:
+    import orjson
+except ModuleNotFoundError as e:
+    orjson = None
+    ORJSON_IMPORT_ERROR = str(e)
+
+PAYLOAD_CACHE_MAX = int(os.getenv("PAYLOAD_CACHE_MAX", "2000"))
+
+
+def dumps_bytes(value: Any) -> bytes:
+    """Encode to compact UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class PayloadCache:
+    """Thread-safe LRU: (view, intake_id, change_seq) -> encoded JSON bytes."""
+
+    def __init__(self, max_entries: int = PAYLOAD_CACHE_MAX):
+        self.max_entries = max_entries
+        self._items: OrderedDict[tuple, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: tuple) -> bytes | None:
+        with self._lock:
+            value = self._items.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: tuple, value: bytes) -> None:
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+
+    def get_or_build(self, key: tuple, build: Callable[[], Any]) -> bytes:
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        encoded = dumps_bytes(build())
+        self.put(key, encoded)
+        return encoded
+
+    def invalidate(self, intake_id: Hashable) -> None:
+        """Drop every cached version of one intake."""
+        with self._lock:
+            for key in [k for k in self._items if k[1] == intake_id]:
+                del self._items[key]
+
+    def stats(self) -> dict:
+        return {"entries": len(self._items), "max_entries": self.max_entries, "hits": self.hits, "misses": self.misses}
+
+
+payload_cache = PayloadCache()
@@ -0,0 +1,82 @@
+"""
+prompt_templates.py
+- Prompt files under app/prompts, compiled once and rendered in a single pass.
+- A template is split into literal text and {{placeholder}} segments at load
+  time, so rendering is one join instead of a str.replace per context key.
+- Files are re-checked by mtime (at most every RELOAD_CHECK_SECONDS), so
+  prompt edits apply without restarting the server.
+"""
+
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+RELOAD_CHECK_SECONDS = float(os.getenv("PROMPT_RELOAD_CHECK_SECONDS", "1.0"))
+
+_PLACEHOLDER = re.compile(r"\{\{(\w+)\}\}")
+
+
+class PromptTemplate:
+    def __init__(self, text: str):
+        self.text = text
+        # Even indexes are literal text, odd indexes are placeholder names
+        self._segments = _PLACEHOLDER.split(text)
+        self.placeholders = frozenset(self._segments[1::2])
+
+    def render(self, context: dict[str, Any]) -> str:
+        """Fill placeholders; unknown ones are left as written. Values are never re-scanned."""
+        segments = self._segments
+        parts = [segments[0]]
+        for index in range(1, len(segments), 2):
+            key = segments[index]
+            parts.append(str(context[key]) if key in context else f"{{{{{key}}}}}")
+            parts.append(segments[index + 1])
+        return "".join(parts)
+
+
+class PromptLibrary:
+    """Caches compiled templates from one directory; missing or blank files give None."""
+
+    def __init__(self, directory: Path, reload_check_seconds: float = RELOAD_CHECK_SECONDS):
+        self.directory = directory
+        self.reload_check_seconds = reload_check_seconds
+        self._lock = threading.Lock()
+        # name -> (mtime_ns or None, checked_at, template or None)
+        self._entries: dict[str, tuple[int | None, float, PromptTemplate | None]] = {}
+
+    def _mtime(self, path: Path) -> int | None:
+        try:
+            return path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _compile(self, path: Path) -> PromptTemplate | None:
+        try:
+            text = path.read_text(encoding="utf-8").strip()
+        except FileNotFoundError:
+            return None
+        return PromptTemplate(text) if text else None
+
+    def get(self, name: str) -> PromptTemplate | None:
+        now = time.monotonic()
+        entry = self._entries.get(name)
+        if entry is not None and now - entry[1] < self.reload_check_seconds:
+            return entry[2]
+
+        path = self.directory / name
+        mtime = self._mtime(path)
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None and entry[0] == mtime:
+                template = entry[2]
+            else:
+                template = self._compile(path) if mtime is not None else None
+            self._entries[name] = (mtime, now, template)
+        return template
+
+    def text(self, name: str) -> str | None:
+        template = self.get(name)
+        return template.text if template else None
@@ -0,0 +1,188 @@
+"""
+rate_limit.py
+- Client-side admission control for Gemini calls.
+- Token buckets for requests/minute and estimated tokens/minute, plus a cap
+  on concurrent calls, so bursts queue here instead of hitting 429s upstream.
+- Usable from worker threads (sync handlers, job worker) and from the event
+  loop (async handlers); callers give up with GovernorTimeout at their deadline.
+"""
+
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any
+
+# Async waiters cannot be woken by the thread condition, so they re-check this often
+_SLOT_POLL_SECONDS = 0.05
+
+
+class GovernorTimeout(RuntimeError):
+    """Raised when a caller could not get a Gemini slot before its deadline."""
+
+
+class TokenBucket:
+    """Refills continuously at per_minute / 60 per second; per_minute <= 0 disables it."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.level = self.capacity
+        self._updated = time.monotonic()
+
+    @property
+    def enabled(self) -> bool:
+        return self.capacity > 0
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def clamp(self, amount: float) -> float:
+        # A single oversized request must still be admissible once the bucket is full
+        return min(amount, self.capacity) if self.enabled else amount
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` is available (0.0 if it is now)."""
+        if not self.enabled:
+            return 0.0
+        self._refill(now)
+        missing = self.clamp(amount) - self.level
+        return missing / self.rate if missing > 0 else 0.0
+
+    def take(self, amount: float) -> None:
+        if self.enabled:
+            self.level -= self.clamp(amount)
+
+
+class AIGovernor:
+    """
+    One per process. acquire() blocks (or awaits) until a request slot, enough
+    request/token budget and a concurrency slot are all available.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float,
+        tokens_per_minute: float,
+        max_concurrency: int,
+        queue_timeout: float,
+    ):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.max_concurrency = max_concurrency
+        self.queue_timeout = queue_timeout
+        self._lock = threading.Lock()
+        self._released = threading.Condition(self._lock)
+        self._in_flight = 0
+        self._waiting = 0
+        self._acquired = 0
+        self._timed_out = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._last_wait = 0.0
+
+    def _try_acquire(self, tokens: float) -> float:
+        """Take budget + a slot and return 0.0, or return how long to wait. Caller holds the lock."""
+        if self.max_concurrency > 0 and self._in_flight >= self.max_concurrency:
+            return _SLOT_POLL_SECONDS
+        now = time.monotonic()
+        wait = max(self.requests.wait_time(1, now), self.tokens.wait_time(tokens, now))
+        if wait > 0:
+            return wait
+        self.requests.take(1)
+        self.tokens.take(tokens)
+        self._in_flight += 1
+        return 0.0
+
+    def _admitted(self, started: float) -> None:
+        waited = time.monotonic() - started
+        self._acquired += 1
+        self._total_wait += waited
+        self._last_wait = waited
+        self._max_wait = max(self._max_wait, waited)
+
+    def _timeout(self, timeout: float) -> GovernorTimeout:
+        self._timed_out += 1
+        return GovernorTimeout(f"No Gemini capacity within {timeout:.1f}s ({self._waiting} queued)")
+
+    def acquire(self, tokens: float = 0, timeout: float | None = None) -> None:
+        timeout = self.queue_timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+        with self._lock:
+            self._waiting += 1
+            try:
+                while True:
+                    wait = self._try_acquire(tokens)
+                    if wait == 0:
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise self._timeout(timeout)
+                    self._released.wait(min(wait, remaining))
+                self._admitted(started)
+            finally:
+                self._waiting -= 1
+
+    async def acquire_async(self, tokens: float = 0, timeout: float | None = None) -> None:
+        timeout = self.queue_timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+        with self._lock:
+            self._waiting += 1
+        try:
+            while True:
+                with self._lock:
+                    wait = self._try_acquire(tokens)
+                    if wait == 0:
+                        self._admitted(started)
+                        return
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise self._timeout(timeout)
+                await asyncio.sleep(min(wait, remaining, _SLOT_POLL_SECONDS))
+        finally:
+            with self._lock:
+                self._waiting -= 1
+
+    def release(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self._released.notify()
+
+    @contextmanager
+    def slot(self, tokens: float = 0, timeout: float | None = None):
+        self.acquire(tokens, timeout)
+        try:
+            yield
+        finally:
+            self.release()
+
+    @asynccontextmanager
+    async def slot_async(self, tokens: float = 0, timeout: float | None = None):
+        await self.acquire_async(tokens, timeout)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            now = time.monotonic()
+            self.requests.wait_time(0, now)
+            self.tokens.wait_time(0, now)
+            return {
+                "in_flight": self._in_flight,
+                "queued": self._waiting,
+                "max_concurrency": self.max_concurrency,
+                "requests_per_minute": self.requests.capacity,
+                "tokens_per_minute": self.tokens.capacity,
+                "requests_available": round(self.requests.level, 2) if self.requests.enabled else None,
+                "tokens_available": round(self.tokens.level) if self.tokens.enabled else None,
+                "acquired": self._acquired,
+                "timed_out": self._timed_out,
+                "avg_wait_ms": round(1000 * self._total_wait / self._acquired, 1) if self._acquired else 0.0,
+                "max_wait_ms": round(1000 * self._max_wait, 1),
+                "last_wait_ms": round(1000 * self._last_wait, 1),
+            }
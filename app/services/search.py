@@ -0,0 +1,104 @@
+"""
+search.py
+- SQLite FTS5 full-text index over intake complaint/history text.
+- The index is an external-content table on patient_intakes, kept in sync by
+  triggers, so every write path (API, batch import, seed data) is covered.
+"""
+
+import logging
+import re
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+SEARCH_TABLE = "intake_search"
+SEARCH_COLUMNS = (
+    "chief_complaint",
+    "symptoms",
+    "history",
+    "medications",
+    "allergies",
+    "chief_complaint_original",
+    "symptoms_original",
+    "history_original",
+    "medications_original",
+    "allergies_original",
+)
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def ensure_search_index(conn: Connection) -> bool:
+    """
+    Create the FTS5 table + sync triggers if missing (backfilling existing rows).
+    Returns False when this SQLite build has no FTS5.
+    """
+    cols = ", ".join(SEARCH_COLUMNS)
+    new_cols = ", ".join(f"new.{c}" for c in SEARCH_COLUMNS)
+    old_cols = ", ".join(f"old.{c}" for c in SEARCH_COLUMNS)
+    exists = conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {"name": SEARCH_TABLE},
+    ).first()
+    if not exists:
+        try:
+            conn.execute(text(
+                f"CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5({cols}, "
+                "content='patient_intakes', content_rowid='id', tokenize='unicode61 remove_diacritics 2')"
+            ))
+        except Exception as e:
+            logger.warning("FTS5 unavailable (%s); intake search disabled.", e)
+            return False
+        conn.execute(text(f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('rebuild')"))
+
+    conn.execute(text(f"""
+        CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_ai AFTER INSERT ON patient_intakes BEGIN
+            INSERT INTO {SEARCH_TABLE}(rowid, {cols}) VALUES (new.id, {new_cols});
+        END
+    """))
+    conn.execute(text(f"""
+        CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_ad AFTER DELETE ON patient_intakes BEGIN
+            INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, {cols}) VALUES ('delete', old.id, {old_cols});
+        END
+    """))
+    conn.execute(text(f"""
+        CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_au AFTER UPDATE OF {cols} ON patient_intakes BEGIN
+            INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, {cols}) VALUES ('delete', old.id, {old_cols});
+            INSERT INTO {SEARCH_TABLE}(rowid, {cols}) VALUES (new.id, {new_cols});
+        END
+    """))
+    return True
+
+
+def build_match_query(query: str) -> str | None:
+    """
+    Turn free text into a safe FTS5 expression: every word must match,
+    the last one as a prefix so results appear while the doctor is typing.
+    """
+    tokens = _TOKEN_RE.findall(query or "")
+    if not tokens:
+        return None
+    quoted = [f'"{token}"' for token in tokens]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def search_intake_ids(db: Session, query: str, limit: int, offset: int = 0) -> list[dict[str, Any]]:
+    """Ranked (best first) intake ids with a highlighted snippet."""
+    match = build_match_query(query)
+    if match is None:
+        return []
+    rows = db.execute(
+        text(
+            f"SELECT rowid AS id, bm25({SEARCH_TABLE}) AS rank, "
+            f"snippet({SEARCH_TABLE}, -1, '[', ']', '...', 12) AS snippet "
+            f"FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH :match "
+            "ORDER BY rank LIMIT :limit OFFSET :offset"
+        ),
+        {"match": match, "limit": limit, "offset": offset},
+    ).all()
+    return [{"id": row.id, "rank": row.rank, "snippet": row.snippet} for row in rows]
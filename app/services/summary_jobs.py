@@ -0,0 +1,137 @@
+"""
+summary_jobs.py
+- Clinical summaries off the request path.
+- submit_vitals stores the rule-based summary immediately (source="rules")
+  and enqueues a clinical_summary job; a worker process asks Gemini and
+  upgrades the same ClinicalSummary row in place (source="ai").
+- Jobs and late results carry a fingerprint of the vitals they were made
+  from and are dropped once the intake has newer vitals (SQLite reuses
+  deleted row ids, so the summary id alone cannot tell).
+- An AI summary, on arrival, queues pre-translation (translation_jobs).
+"""
+
+import logging
+from typing import Any
+
+from sqlalchemy.orm import Session
+
+from ..models import BackgroundJob, ClinicalSummary, PatientIntake, VitalsEntry
+from .ai import generate_ai_summary
+from .events import record_event
+from .jobs import enqueue_job, job_payload, priority_rank
+from .translation_jobs import enqueue_pretranslate_job
+from .versioning import touch_intake
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_JOB = "clinical_summary"
+SOURCE_RULES = "rules"
+SOURCE_AI = "ai"
+
+
+def summary_payload(intake: PatientIntake, vitals: VitalsEntry) -> dict[str, Any]:
+    """Input shape shared by generate_ai_summary / fallback_summary."""
+    return {
+        "intake": {
+            "full_name": intake.full_name,
+            "age": intake.age,
+            "sex": intake.sex,
+            "chief_complaint": intake.chief_complaint,
+            "symptoms": intake.symptoms,
+            "duration": intake.duration,
+            "severity": intake.severity,
+            "history": intake.history,
+            "medications": intake.medications,
+            "allergies": intake.allergies,
+        },
+        "vitals": {
+            "heart_rate": vitals.heart_rate,
+            "respiratory_rate": vitals.respiratory_rate,
+            "temperature_c": vitals.temperature_c,
+            "spo2": vitals.spo2,
+            "systolic_bp": vitals.systolic_bp,
+            "diastolic_bp": vitals.diastolic_bp,
+        },
+    }
+
+
+def vitals_fingerprint(vitals: VitalsEntry) -> str:
+    """Identifies one vitals submission: a replacement may get the same row id, not the same created_at."""
+    return f"{vitals.id}:{vitals.created_at.isoformat()}"
+
+
+def is_current_vitals(intake: PatientIntake, fingerprint: str | None) -> bool:
+    return intake.vitals is not None and fingerprint is not None and vitals_fingerprint(intake.vitals) == fingerprint
+
+
+def apply_summary(summary: ClinicalSummary, result: dict[str, Any], source: str) -> None:
+    """Copy a generated summary onto the row; doctor fields are left alone."""
+    summary.short_summary = result["short_summary"]
+    summary.priority_level = result["priority_level"]
+    summary.red_flags = "\n".join(result["red_flags"])
+    summary.differential = "\n".join(result["differential_considerations"])
+    summary.recommended_questions = "\n".join(result["recommended_questions"])
+    summary.recommended_next_steps = "\n".join(result["recommended_next_steps"])
+    summary.source = source
+
+
+def enqueue_summary_job(db: Session, summary: ClinicalSummary, fingerprint: str, delay_seconds: float = 0) -> BackgroundJob:
+    """
+    Queue the AI upgrade for a freshly flushed rule-based summary made from the
+    vitals with this fingerprint (caller commits).
+    A delay keeps workers off it while this process still has a call in flight.
+    """
+    return enqueue_job(
+        db,
+        SUMMARY_JOB,
+        intake_id=summary.intake_id,
+        payload={"summary_id": summary.id, "vitals": fingerprint},
+        priority=priority_rank(summary.priority_level),
+        delay_seconds=delay_seconds,
+    )
+
+
+def upgrade_summary(db: Session, summary_id: int, intake_id: int, fingerprint: str | None, result: dict[str, Any]) -> str:
+    """
+    Replace a rule-based summary with an AI result made from the vitals with
+    this fingerprint, unless it was superseded by new vitals, already upgraded,
+    or already decided on (caller commits).
+    """
+    summary = db.get(ClinicalSummary, summary_id)
+    if summary is None or summary.intake_id != intake_id or not is_current_vitals(summary.intake, fingerprint):
+        return "superseded"
+    if summary.source == SOURCE_AI:
+        return "already upgraded"
+    if summary.decision != "PENDING":
+        # Keep the summary the doctor actually decided on
+        return "decided"
+
+    apply_summary(summary, result, SOURCE_AI)
+    intake = summary.intake
+    touch_intake(db, intake)
+    db.flush()
+    record_event(db, intake, "summary_updated")
+    enqueue_pretranslate_job(db, summary)
+    return "upgraded"
+
+
+def run_summary_job(db: Session, job: BackgroundJob) -> str:
+    """
+    Worker handler. Returns a short note for the job row; raises to retry.
+    The Gemini call happens outside any transaction, and the row is re-read
+    afterwards so re-submitted vitals or a doctor decision made meanwhile win.
+    """
+    data = job_payload(job)
+    summary_id, fingerprint = data.get("summary_id"), data.get("vitals")
+    summary = db.get(ClinicalSummary, summary_id) if summary_id else None
+    if summary is None or summary.intake_id != job.intake_id or not is_current_vitals(summary.intake, fingerprint):
+        return "superseded"
+    if summary.source == SOURCE_AI:
+        return "already upgraded"
+    intake = summary.intake
+    payload = summary_payload(intake, intake.vitals)
+    db.rollback()
+
+    result = generate_ai_summary(payload)
+
+    return upgrade_summary(db, summary_id, job.intake_id, fingerprint, result)
@@ -0,0 +1,125 @@
+"""
+summary_stream.py
+- Incremental parser for the streamed clinical summary JSON.
+- Gemini returns one flat object of strings and string arrays; as text
+  deltas arrive, each string value and each array item is emitted the
+  moment its closing quote is seen, so the dashboard can show the short
+  summary and first red flags long before the whole object is complete.
+- Anything before the first "{" (e.g. a ```json fence) is skipped.
+- SharedTextStream fans one producer's deltas out to any number of readers,
+  so doctors opening the same case share a single Gemini stream.
+"""
+
+import asyncio
+import json
+from typing import Any, AsyncIterator, Iterator
+
+# Fields the dashboard renders as lists; Gemini calls differential "differential_considerations"
+LIST_FIELDS = ("red_flags", "differential_considerations", "recommended_questions", "recommended_next_steps")
+
+
+class SummaryStreamParser:
+    """
+    feed(text) yields (field, value, is_item) tuples:
+    ("short_summary", "...", False) for string values,
+    ("red_flags", "...", True) for each array item.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0
+        self._started = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._key: str | None = None
+        self._expect_key = True
+        self.finished = False
+
+    def feed(self, text: str) -> Iterator[tuple[str, str, bool]]:
+        self._buffer += text
+        buffer = self._buffer
+        while self._pos < len(buffer) and not self.finished:
+            ch = buffer[self._pos]
+            self._pos += 1
+
+            if not self._started:
+                if ch == "{":
+                    self._started = True
+                    self._depth = 1
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    value = json.loads(buffer[self._string_start:self._pos])
+                    if self._depth == 1 and self._expect_key:
+                        self._key = value
+                        self._expect_key = False
+                    elif self._key is not None and self._depth in (1, 2):
+                        yield self._key, value, self._depth == 2
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                self._string_start = self._pos - 1
+            elif ch in "[{":
+                self._depth += 1
+            elif ch in "]}":
+                self._depth -= 1
+                if self._depth == 0:
+                    self.finished = True
+            elif ch == "," and self._depth == 1:
+                self._expect_key = True
+
+        # Keep only what an unfinished string still needs
+        keep_from = self._string_start if self._in_string else self._pos
+        self._buffer = buffer[keep_from:]
+        self._string_start -= keep_from
+        self._pos -= keep_from
+
+
+class SharedTextStream:
+    """
+    Append-only text deltas from one producer task. Each reader gets every
+    delta from the start (late joiners replay what was already produced),
+    then waits for more until finish(). Event-loop use only.
+    """
+
+    def __init__(self, key: Any = None):
+        self.key = key
+        self.chunks: list[str] = []
+        self.result: Any = None
+        self.error: BaseException | None = None
+        self.finished = False
+        self._changed = asyncio.Event()
+
+    def push(self, text: str) -> None:
+        self.chunks.append(text)
+        self._wake()
+
+    def finish(self, result: Any = None, error: BaseException | None = None) -> None:
+        self.result = result
+        self.error = error
+        self.finished = True
+        self._wake()
+
+    def _wake(self) -> None:
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    async def read(self) -> AsyncIterator[str]:
+        """Yield deltas until the producer finishes; the producer's error is not raised here (see .error)."""
+        index = 0
+        while True:
+            while index < len(self.chunks):
+                index += 1
+                yield self.chunks[index - 1]
+            if self.finished:
+                return
+            await self._changed.wait()
@@ -0,0 +1,208 @@
+"""
+translation_cache.py
+- Two-level translation cache so no worker pays Gemini for a translation
+  any worker has already made.
+- L1: in-process LRU bounded by bytes (no I/O, safe to call on the event loop).
+- L2: translation_cache table in SQLite, shared by all processes and kept
+  across restarts; entries expire after a TTL and the least recently used
+  are evicted once the table passes its byte budget.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Callable
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from ..db import SessionLocal
+from ..models import TranslationCacheEntry
+
+MAX_BYTES = int(os.getenv("TRANSLATION_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+TTL = timedelta(days=float(os.getenv("TRANSLATION_CACHE_TTL_DAYS", "30")))
+L1_MAX_BYTES = int(os.getenv("TRANSLATION_CACHE_L1_MAX_BYTES", str(4 * 1024 * 1024)))
+# Checking the table size costs a scan, so only do it every N stores
+EVICT_CHECK_EVERY = 50
+
+
+def cache_key(language: str, source: str) -> str:
+    return hashlib.sha256(f"{language}\n{source}".encode("utf-8")).hexdigest()
+
+
+class TranslationCache:
+    def __init__(
+        self,
+        max_bytes: int = MAX_BYTES,
+        ttl: timedelta = TTL,
+        l1_max_bytes: int = L1_MAX_BYTES,
+        evict_check_every: int = EVICT_CHECK_EVERY,
+        session_factory: Callable[[], Session] = SessionLocal,
+    ):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.l1_max_bytes = l1_max_bytes
+        self.evict_check_every = evict_check_every
+        self._session_factory = session_factory
+        self._lock = threading.Lock()
+        self._l1: OrderedDict[str, str] = OrderedDict()
+        self._l1_bytes = 0
+        self._stores_since_check = 0
+        self.l1_hits = 0
+        self.l2_hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evicted = 0
+
+    def _remember(self, key: str, value: str) -> None:
+        size = len(value.encode("utf-8"))
+        if size > self.l1_max_bytes:
+            return
+        with self._lock:
+            old = self._l1.pop(key, None)
+            if old is not None:
+                self._l1_bytes -= len(old.encode("utf-8"))
+            self._l1[key] = value
+            self._l1_bytes += size
+            while self._l1_bytes > self.l1_max_bytes:
+                _, dropped = self._l1.popitem(last=False)
+                self._l1_bytes -= len(dropped.encode("utf-8"))
+
+    def get_local(self, language: str, source: str) -> str | None:
+        """L1 only; never touches the database."""
+        return self.get_many(language, [source], local_only=True).get(source)
+
+    def get(self, language: str, source: str) -> str | None:
+        """L1, then the shared table (blocking). A shared hit is promoted into L1."""
+        return self.get_many(language, [source]).get(source)
+
+    def get_many(self, language: str, sources: list[str], local_only: bool = False) -> dict[str, str]:
+        """
+        Look up several source texts at once: L1 first, then one query against
+        the shared table for the rest (skipped with local_only). Returns found items only.
+        """
+        found: dict[str, str] = {}
+        missing: dict[str, str] = {}
+        with self._lock:
+            for source in dict.fromkeys(sources):
+                key = cache_key(language, source)
+                value = self._l1.get(key)
+                if value is None:
+                    missing[key] = source
+                else:
+                    self._l1.move_to_end(key)
+                    found[source] = value
+            self.l1_hits += len(found)
+        if not missing or local_only:
+            return found
+
+        now = datetime.utcnow()
+        shared: dict[str, str] = {}
+        with self._session_factory() as db:
+            keys = list(missing)
+            for start in range(0, len(keys), 500):
+                rows = db.execute(
+                    select(TranslationCacheEntry.key, TranslationCacheEntry.value).where(
+                        TranslationCacheEntry.key.in_(keys[start:start + 500]),
+                        TranslationCacheEntry.created_at >= now - self.ttl,
+                    )
+                ).all()
+                shared.update({key: value for key, value in rows})
+            if shared:
+                db.execute(
+                    update(TranslationCacheEntry)
+                    .where(TranslationCacheEntry.key.in_(list(shared)))
+                    .values(hits=TranslationCacheEntry.hits + 1, last_used_at=now)
+                )
+                db.commit()
+        with self._lock:
+            self.l2_hits += len(shared)
+            self.misses += len(missing) - len(shared)
+        for key, value in shared.items():
+            self._remember(key, value)
+            found[missing[key]] = value
+        return found
+
+    def put(self, language: str, source: str, value: str) -> None:
+        self.put_many(language, {source: value})
+
+    def put_many(self, language: str, items: dict[str, str]) -> None:
+        """Store translations (source text -> translated text) in L1 and the shared table."""
+        if not items:
+            return
+        now = datetime.utcnow()
+        rows = []
+        for source, value in items.items():
+            key = cache_key(language, source)
+            self._remember(key, value)
+            rows.append({
+                "key": key, "language": language, "value": value, "size_bytes": len(value.encode("utf-8")),
+                "hits": 0, "created_at": now, "last_used_at": now,
+            })
+        with self._session_factory() as db:
+            stmt = sqlite_insert(TranslationCacheEntry)
+            db.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[TranslationCacheEntry.key],
+                    set_={
+                        "value": stmt.excluded.value,
+                        "size_bytes": stmt.excluded.size_bytes,
+                        "created_at": stmt.excluded.created_at,
+                        "last_used_at": stmt.excluded.last_used_at,
+                    },
+                ),
+                rows,
+            )
+            with self._lock:
+                self.stores += len(rows)
+                self._stores_since_check += len(rows)
+                check = self._stores_since_check >= self.evict_check_every
+                if check:
+                    self._stores_since_check = 0
+            if check:
+                self._evict(db, now)
+            db.commit()
+
+    def _evict(self, db: Session, now: datetime) -> None:
+        """Drop expired rows, then least recently used ones until under max_bytes (caller commits)."""
+        removed = db.execute(
+            delete(TranslationCacheEntry).where(TranslationCacheEntry.created_at < now - self.ttl)
+        ).rowcount or 0
+        total = db.execute(select(func.coalesce(func.sum(TranslationCacheEntry.size_bytes), 0))).scalar()
+        if total > self.max_bytes:
+            # Oldest-used first, until the running total covers the excess
+            running = func.sum(TranslationCacheEntry.size_bytes).over(
+                order_by=(TranslationCacheEntry.last_used_at.asc(), TranslationCacheEntry.key.asc())
+            )
+            ranked = select(
+                TranslationCacheEntry.key,
+                TranslationCacheEntry.size_bytes,
+                running.label("running"),
+            ).subquery()
+            victims = select(ranked.c.key).where(ranked.c.running - ranked.c.size_bytes < total - self.max_bytes)
+            removed += db.execute(
+                delete(TranslationCacheEntry).where(TranslationCacheEntry.key.in_(victims))
+            ).rowcount or 0
+        with self._lock:
+            self.evicted += removed
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.l1_hits + self.l2_hits + self.misses
+            return {
+                "l1_entries": len(self._l1),
+                "l1_bytes": self._l1_bytes,
+                "l1_hits": self.l1_hits,
+                "l2_hits": self.l2_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.l1_hits + self.l2_hits) / lookups, 3) if lookups else None,
+                "stores": self.stores,
+                "evicted": self.evicted,
+                "max_bytes": self.max_bytes,
+            }
+
+
+translation_cache = TranslationCache()
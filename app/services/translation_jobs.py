@@ -0,0 +1,331 @@
+"""
+translation_jobs.py
+- Per-string cached translation of field payloads (shared by /api/translate
+  and the worker).
+- Strings the local detector (language_detect) finds already in the target
+  language are kept as they are instead of being sent to Gemini.
+- Intake translation: a non-English intake is stored at once with the
+  patient's own text (translation_status=PENDING) and a translate_intake
+  job fills in the English fields afterwards.
+- Pre-translation: once a case has its final summary, a pretranslate_summary
+  job warms the translation cache with the doctor view of that case in every
+  language active doctors have chosen, so switching language is a cache hit.
+"""
+
+import asyncio
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..models import BackgroundJob, ClinicalSummary, PatientIntake, User
+from .ai import (
+    GEMINI_BREAKER,
+    is_gemini_ready,
+    language_code,
+    translate_fields_payload,
+    translate_fields_payload_async,
+)
+from . import jobs
+from .circuit_breaker import CircuitOpenError
+from .events import record_event
+from .jobs import PRIORITY_RANK, enqueue_job, job_payload, priority_rank
+from .language_detect import language_detector
+from .translation_cache import translation_cache
+from .versioning import touch_intake
+
+INTAKE_TRANSLATION_JOB = "translate_intake"
+PRETRANSLATE_JOB = "pretranslate_summary"
+
+TRANSLATION_NOT_NEEDED = "NOT_NEEDED"
+TRANSLATION_PENDING = "PENDING"
+TRANSLATION_DONE = "TRANSLATED"
+TRANSLATION_FAILED = "FAILED"
+
+# Patient-written fields translated to English (originals kept in *_original)
+INTAKE_TEXT_FIELDS = ("chief_complaint", "symptoms", "duration", "history", "medications", "allergies")
+# Warming runs after every pending AI summary
+PRETRANSLATE_PRIORITY_OFFSET = len(PRIORITY_RANK)
+
+
+def translation_fragments(fields: dict[str, Any]) -> list[str]:
+    """Distinct non-blank strings in a translate payload: top-level values and list items."""
+    fragments: dict[str, None] = {}
+    for value in fields.values():
+        for item in value if isinstance(value, list) else [value]:
+            if isinstance(item, str) and item.strip():
+                fragments[item] = None
+    return list(fragments)
+
+
+def reassemble_translation(fields: dict[str, Any], translated: dict[str, str]) -> dict[str, Any]:
+    def swap(item: Any) -> Any:
+        return translated.get(item, item) if isinstance(item, str) else item
+
+    return {
+        key: [swap(item) for item in value] if isinstance(value, list) else swap(value)
+        for key, value in fields.items()
+    }
+
+
+def _already_in_language(texts: list[str], language: str) -> dict[str, str]:
+    """Texts the detector is confident are already in `language` (each maps to itself)."""
+    code = language_code(language)
+    if code is None:
+        return {}
+    return {text: text for text in texts if language_detector.is_language(text, code)}
+
+
+def needs_translation(fields: dict[str, Any], language: str) -> bool:
+    """
+    False when the payload is already in `language`. Strings too short to judge
+    alone ("2 hours", "Lisinopril") are judged together with the rest, as long
+    as none of them is confidently in another language.
+    """
+    fragments = translation_fragments(fields)
+    code = language_code(language)
+    if not fragments:
+        return False
+    if code is None:
+        return True
+    if any(language_detector.detect(text) not in (None, code) for text in fragments):
+        return True
+    return not language_detector.is_language("\n".join(fragments), code)
+
+
+def detect_language(fields: dict[str, Any], default: str = "en") -> str:
+    """Best guess at the language a payload is written in (all strings together)."""
+    return language_detector.detect(" \n".join(translation_fragments(fields))) or default
+
+
+def _model_request(todo: list[str]) -> dict[str, str]:
+    return {str(index): text for index, text in enumerate(todo)}
+
+
+def _model_answers(todo: list[str], result: dict[str, Any], partial: bool = False) -> dict[str, str]:
+    """
+    Translations the model returned, by source text. With partial (some chunks
+    failed), strings handed back unchanged are left out: they were not translated.
+    """
+    fresh = {}
+    for index, text in enumerate(todo):
+        value = result.get(str(index))
+        if isinstance(value, str) and value.strip() and not (partial and value == text):
+            fresh[text] = value
+    return fresh
+
+
+def translate_fields_cached(fields: dict[str, Any], language: str) -> tuple[dict[str, Any], bool, str | None, int]:
+    """
+    Translate a fields payload one string at a time through the shared cache,
+    keyed by (text, language). Only fragments never translated before, and not
+    already in the target language, are sent to Gemini, deduplicated in one
+    call, then put back in the original shape.
+    Returns (fields, ok, reason, number of fragments sent to the model).
+    """
+    if not fields:
+        return fields, False, "empty_fields", 0
+    fragments = translation_fragments(fields)
+    known = translation_cache.get_many(language, fragments)
+
+    todo = [text for text in fragments if text not in known]
+    unchanged = _already_in_language(todo, language)
+    if unchanged:
+        known.update(unchanged)
+        todo = [text for text in todo if text not in unchanged]
+    ok, reason = True, None
+    if todo:
+        result, ok, reason = translate_fields_payload(_model_request(todo), language)
+        # Chunks that succeeded are kept even when another chunk failed
+        fresh = _model_answers(todo, result, partial=not ok)
+        translation_cache.put_many(language, fresh)
+        known.update(fresh)
+        if ok and len(fresh) < len(todo):
+            ok, reason = False, "incomplete_response"
+    return reassemble_translation(fields, known), ok, reason, len(todo)
+
+
+async def translate_fields_cached_async(fields: dict[str, Any], language: str) -> tuple[dict[str, Any], bool, str | None, int]:
+    """Same as translate_fields_cached; cache I/O runs in a thread, L1 hits never leave the loop."""
+    if not fields:
+        return fields, False, "empty_fields", 0
+    fragments = translation_fragments(fields)
+    known = translation_cache.get_many(language, fragments, local_only=True)
+    if len(known) < len(fragments):
+        rest = [text for text in fragments if text not in known]
+        known.update(await asyncio.to_thread(translation_cache.get_many, language, rest))
+
+    todo = [text for text in fragments if text not in known]
+    unchanged = _already_in_language(todo, language)
+    if unchanged:
+        known.update(unchanged)
+        todo = [text for text in todo if text not in unchanged]
+    ok, reason = True, None
+    if todo:
+        result, ok, reason = await translate_fields_payload_async(_model_request(todo), language)
+        fresh = _model_answers(todo, result, partial=not ok)
+        if fresh:
+            await asyncio.to_thread(translation_cache.put_many, language, fresh)
+        known.update(fresh)
+        if ok and len(fresh) < len(todo):
+            ok, reason = False, "incomplete_response"
+    return reassemble_translation(fields, known), ok, reason, len(todo)
+
+
+def intake_original_fields(intake: PatientIntake) -> dict[str, str]:
+    return {field: getattr(intake, f"{field}_original") or "" for field in INTAKE_TEXT_FIELDS}
+
+
+def enqueue_intake_translation_job(db: Session, intake: PatientIntake) -> BackgroundJob | None:
+    """
+    Mark a freshly flushed non-English intake for translation and queue it
+    (caller commits). Text that is already all English needs no job; without
+    Gemini the original text simply stays.
+    """
+    if not needs_translation(intake_original_fields(intake), "en"):
+        intake.translation_status = TRANSLATION_NOT_NEEDED
+        return None
+    if not is_gemini_ready():
+        intake.translation_status = TRANSLATION_FAILED
+        return None
+    intake.translation_status = TRANSLATION_PENDING
+    # Ahead of summaries: the nurse reads the intake before vitals exist
+    return enqueue_job(db, INTAKE_TRANSLATION_JOB, intake_id=intake.id, priority=priority_rank("HIGH"))
+
+
+def _finish_intake_translation(db: Session, intake: PatientIntake, status: str) -> None:
+    intake.translation_status = status
+    touch_intake(db, intake)
+    db.flush()
+    record_event(db, intake, "intake_translated")
+
+
+def run_intake_translation_job(db: Session, job: BackgroundJob) -> str:
+    """
+    Worker handler. Gemini is called outside any transaction; failures are
+    retried with backoff and, on the last attempt, the intake is marked FAILED
+    and keeps the patient's own text.
+    """
+    intake = db.get(PatientIntake, job.intake_id)
+    if intake is None:
+        return "intake deleted"
+    if intake.translation_status != TRANSLATION_PENDING:
+        return "already translated"
+    fields = intake_original_fields(intake)
+    db.rollback()
+
+    translated, ok, reason, sent = translate_fields_cached(fields, "English")
+
+    intake = db.get(PatientIntake, job.intake_id)
+    if intake is None or intake.translation_status != TRANSLATION_PENDING:
+        return "superseded"
+    if not ok:
+        if GEMINI_BREAKER.state == "OPEN":
+            raise CircuitOpenError("gemini circuit is open; intake translation deferred")
+        if job.attempts < jobs.MAX_ATTEMPTS:
+            raise RuntimeError(f"intake translation failed ({reason})")
+        _finish_intake_translation(db, intake, TRANSLATION_FAILED)
+        return f"gave up ({reason}); original text kept"
+
+    for field in INTAKE_TEXT_FIELDS:
+        value = translated.get(field)
+        if isinstance(value, str):
+            setattr(intake, field, value)
+    _finish_intake_translation(db, intake, TRANSLATION_DONE)
+    if intake.clinical_summary is not None:
+        # Vitals came first; doctors' cached views still show the untranslated text
+        enqueue_pretranslate_job(db, intake.clinical_summary)
+    return f"translated ({sent} strings sent)"
+
+
+def doctor_languages(db: Session) -> list[str]:
+    """Display languages (other than English) chosen by active doctors."""
+    rows = db.execute(
+        select(User.preferred_language)
+        .where(User.role == "DOCTOR", User.is_active.is_(True), User.preferred_language != "en")
+        .distinct()
+    ).scalars()
+    return sorted(language for language in rows if language)
+
+
+def _lines(value: str | None) -> list[str]:
+    """Same split as the API's _split_lines, so the cached strings match what the doctor sees."""
+    return [line for line in (value or "").splitlines() if line.strip()]
+
+
+def doctor_view_fields(intake: PatientIntake, summary: ClinicalSummary, language: str) -> dict[str, Any]:
+    """
+    The fields doctor.js sends to /api/translate for this case and language
+    (buildTranslationPayload): the patient's own words when the doctor reads
+    the patient's language, the English intake otherwise, plus the summary.
+    """
+    pref = (intake.preferred_language or "en").lower()
+    originals = {
+        "chief_complaint": intake.chief_complaint_original,
+        "symptoms": intake.symptoms_original,
+        "duration": intake.duration_original,
+        "history": intake.history_original,
+        "medications": intake.medications_original,
+        "allergies": intake.allergies_original,
+    }
+    use_original = language == pref and pref != "en" and any(originals.values())
+
+    def text(field: str, default: str = "") -> str:
+        if use_original:
+            return originals[field] or getattr(intake, field) or default
+        return getattr(intake, field) or default
+
+    return {
+        "chief_complaint": text("chief_complaint"),
+        "symptoms": text("symptoms"),
+        "duration": text("duration"),
+        "severity": intake.severity or "",
+        "history": text("history", "None reported"),
+        "medications": text("medications", "None reported"),
+        "allergies": text("allergies", "None reported"),
+        "short_summary": summary.short_summary or "",
+        "red_flags": _lines(summary.red_flags),
+        "differential": _lines(summary.differential),
+        "recommended_questions": _lines(summary.recommended_questions),
+        "recommended_next_steps": _lines(summary.recommended_next_steps),
+    }
+
+
+def enqueue_pretranslate_job(db: Session, summary: ClinicalSummary) -> BackgroundJob | None:
+    """Queue cache warming for a summary if any doctor reads another language (caller commits)."""
+    if not is_gemini_ready() or not doctor_languages(db):
+        return None
+    return enqueue_job(
+        db,
+        PRETRANSLATE_JOB,
+        intake_id=summary.intake_id,
+        payload={"summary_id": summary.id},
+        priority=PRETRANSLATE_PRIORITY_OFFSET + priority_rank(summary.priority_level),
+    )
+
+
+def run_pretranslate_job(db: Session, job: BackgroundJob) -> str:
+    """
+    Worker handler. Languages are read when the job runs, so a doctor who
+    switched language meanwhile is covered. Raises to retry if any language
+    failed; fragments already cached are not sent again.
+    """
+    summary_id = job_payload(job).get("summary_id")
+    summary = db.get(ClinicalSummary, summary_id) if summary_id else None
+    if summary is None or summary.intake_id != job.intake_id:
+        return "superseded"
+    languages = doctor_languages(db)
+    views = {language: doctor_view_fields(summary.intake, summary, language) for language in languages}
+    db.rollback()
+
+    sent, failed = 0, []
+    for language, fields in views.items():
+        _, ok, reason, count = translate_fields_cached(fields, language)
+        sent += count
+        if not ok:
+            failed.append(f"{language}: {reason}")
+    if failed:
+        if GEMINI_BREAKER.state == "OPEN":
+            raise CircuitOpenError("gemini circuit is open; pre-translation deferred")
+        raise RuntimeError("pre-translation incomplete (" + ", ".join(failed) + ")")
+    return f"warmed {', '.join(languages) or 'no languages'} ({sent} strings translated)"
@@ -0,0 +1,182 @@
+"""
+triage_queue.py
+- In-memory priority queue of open cases (PENDING_NURSE / PENDING_DOCTOR).
+- Ordered by triage priority, then workflow stage, then longest wait.
+- Rebuilt from the DB at startup, then kept current incrementally by replaying
+  intake_events, so writes made by any worker process are picked up.
+"""
+
+import heapq
+import threading
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..db import SessionLocal
+from ..models import ClinicalSummary, PatientIntake
+from .events import events_since, latest_event_id, EVENT_BATCH_SIZE
+
+OPEN_STAGES = ("PENDING_DOCTOR", "PENDING_NURSE")
+PRIORITY_RANK = {"HIGH": 0, "MED": 1, "LOW": 2}
+UNTRIAGED_RANK = 3
+STAGE_RANK = {"PENDING_DOCTOR": 0, "PENDING_NURSE": 1}
+
+_QUEUE_COLUMNS = (
+    PatientIntake.id,
+    PatientIntake.full_name,
+    PatientIntake.age,
+    PatientIntake.sex,
+    PatientIntake.chief_complaint,
+    PatientIntake.workflow_status,
+    PatientIntake.doctor_status_updated_at,
+    PatientIntake.created_at,
+    ClinicalSummary.priority_level,
+)
+
+
+def _queue_select():
+    return select(*_QUEUE_COLUMNS).outerjoin(
+        ClinicalSummary, ClinicalSummary.intake_id == PatientIntake.id
+    )
+
+
+def _row_to_entry(row: Any) -> dict[str, Any]:
+    stage = row.workflow_status
+    # Doctors wait from the moment vitals were submitted, nurses from intake creation
+    queued_at = row.doctor_status_updated_at if stage == "PENDING_DOCTOR" and row.doctor_status_updated_at else row.created_at
+    return {
+        "id": row.id,
+        "full_name": row.full_name,
+        "age": row.age,
+        "sex": row.sex,
+        "chief_complaint": row.chief_complaint,
+        "workflow_status": stage,
+        "priority_level": row.priority_level,
+        "queued_at": queued_at,
+    }
+
+
+def _sort_key(entry: dict[str, Any]) -> tuple:
+    return (
+        PRIORITY_RANK.get(entry["priority_level"] or "", UNTRIAGED_RANK),
+        STAGE_RANK[entry["workflow_status"]],
+        entry["queued_at"],
+        entry["id"],
+    )
+
+
+def entry_to_dict(entry: dict[str, Any], now: datetime | None = None) -> dict[str, Any]:
+    now = now or datetime.utcnow()
+    return {
+        **entry,
+        "queued_at": entry["queued_at"].strftime("%Y-%m-%d %H:%M:%S"),
+        "wait_minutes": max(0, int((now - entry["queued_at"]).total_seconds() // 60)),
+    }
+
+
+class TriageQueue:
+    """
+    One binary heap per open stage with lazy deletion: an update pushes a new
+    heap item and the stale one is skipped when it reaches the top.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: dict[int, dict[str, Any]] = {}
+        self._keys: dict[int, tuple] = {}
+        self._heaps: dict[str, list[tuple]] = {stage: [] for stage in OPEN_STAGES}
+        self._last_event_id = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def rebuild(self, db: Session | None = None) -> None:
+        """Reload every open case from the DB."""
+        if db is None:
+            with SessionLocal() as session:
+                return self.rebuild(session)
+        with self._lock:
+            # Read the event position first so changes made during the load are replayed
+            self._last_event_id = latest_event_id(db)
+            rows = db.execute(_queue_select().where(PatientIntake.workflow_status.in_(OPEN_STAGES))).all()
+            self._entries.clear()
+            self._keys.clear()
+            self._heaps = {stage: [] for stage in OPEN_STAGES}
+            for row in rows:
+                self._upsert(_row_to_entry(row))
+
+    def sync(self, db: Session) -> None:
+        """Apply intake changes recorded since the last sync (from any worker)."""
+        with self._lock:
+            while True:
+                events = events_since(db, self._last_event_id)
+                if not events:
+                    return
+                self._last_event_id = events[-1]["id"]
+                changed_ids = {e["intake_id"] for e in events}
+                rows = db.execute(_queue_select().where(PatientIntake.id.in_(changed_ids))).all()
+                found = set()
+                for row in rows:
+                    found.add(row.id)
+                    if row.workflow_status in OPEN_STAGES:
+                        self._upsert(_row_to_entry(row))
+                    else:
+                        self._discard(row.id)
+                for intake_id in changed_ids - found:
+                    self._discard(intake_id)
+                if len(events) < EVENT_BATCH_SIZE:
+                    return
+
+    def _upsert(self, entry: dict[str, Any]) -> None:
+        key = _sort_key(entry)
+        self._entries[entry["id"]] = entry
+        if self._keys.get(entry["id"]) == key:
+            return
+        self._keys[entry["id"]] = key
+        heap = self._heaps[entry["workflow_status"]]
+        heapq.heappush(heap, (key, entry["id"]))
+        if len(heap) > 2 * len(self._entries) + 64:
+            # Too many stale items left behind by updates; drop them in one pass
+            heap[:] = [item for item in heap if self._keys.get(item[1]) == item[0]]
+            heapq.heapify(heap)
+
+    def _discard(self, intake_id: int) -> None:
+        self._entries.pop(intake_id, None)
+        self._keys.pop(intake_id, None)
+
+    def _clean_top(self, heap: list[tuple]) -> None:
+        while heap and self._keys.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+
+    def peek(self, stage: str | None = None) -> dict[str, Any] | None:
+        """Highest-priority open case, O(log n) amortized."""
+        with self._lock:
+            best = None
+            for name in (stage,) if stage else OPEN_STAGES:
+                heap = self._heaps[name]
+                self._clean_top(heap)
+                if heap and (best is None or heap[0] < best):
+                    best = heap[0]
+            return self._entries[best[1]] if best else None
+
+    def top(self, k: int, stage: str | None = None) -> list[dict[str, Any]]:
+        """The k most urgent open cases, O(k log n): pop valid items then push them back."""
+        with self._lock:
+            popped: list[tuple] = []
+            for name in (stage,) if stage else OPEN_STAGES:
+                heap = self._heaps[name]
+                taken = 0
+                while heap and taken < k:
+                    item = heapq.heappop(heap)
+                    if self._keys.get(item[1]) == item[0]:
+                        popped.append(item)
+                        taken += 1
+            for item in popped:
+                heapq.heappush(self._heaps[self._entries[item[1]]["workflow_status"]], item)
+            popped.sort()
+            return [self._entries[intake_id] for _, intake_id in popped[:k]]
+
+
+triage_queue = TriageQueue()
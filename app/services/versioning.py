@@ -0,0 +1,65 @@
+"""
+versioning.py
+- Cheap, cross-process change versions for intakes.
+- A single counter row in SQLite is bumped inside each write transaction,
+  so every uvicorn worker sees the same monotonic sequence.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from ..models import ChangeCounter, PatientIntake
+
+INTAKES_COUNTER = "intakes"
+
+
+def current_change_seq(db: Session) -> int:
+    """Latest intake change sequence (0 if nothing has been written yet)."""
+    value = db.execute(
+        select(ChangeCounter.value).where(ChangeCounter.name == INTAKES_COUNTER)
+    ).scalar_one_or_none()
+    return value or 0
+
+
+def intake_change_seq(db: Session, intake_id: int) -> int | None:
+    """Change sequence of one intake, or None if it does not exist."""
+    return db.execute(
+        select(PatientIntake.change_seq).where(PatientIntake.id == intake_id)
+    ).scalar_one_or_none()
+
+
+def bump_change_seq(db: Session, count: int = 1) -> int:
+    """
+    Advance the intake counter by `count` within the caller's transaction and
+    return the new value. The UPDATE takes SQLite's write lock, so concurrent
+    writers serialize.
+    """
+    result = db.execute(
+        update(ChangeCounter)
+        .where(ChangeCounter.name == INTAKES_COUNTER)
+        .values(value=ChangeCounter.value + count)
+    )
+    if result.rowcount == 0:
+        db.add(ChangeCounter(name=INTAKES_COUNTER, value=count))
+        db.flush()
+        return count
+    return current_change_seq(db)
+
+
+def touch_intake(db: Session, intake: PatientIntake) -> int:
+    """Stamp an intake with a fresh change sequence + updated_at (caller commits)."""
+    touch_intakes(db, [intake])
+    return intake.change_seq
+
+
+def touch_intakes(db: Session, intakes: list[PatientIntake]) -> None:
+    """Stamp several intakes with consecutive sequences using one counter update."""
+    if not intakes:
+        return
+    last = bump_change_seq(db, len(intakes))
+    now = datetime.utcnow()
+    for offset, intake in enumerate(intakes):
+        intake.change_seq = last - len(intakes) + 1 + offset
+        intake.updated_at = now
@@ -0,0 +1,87 @@
+"""
+worker.py
+- Background job runner for the SQLite job queue.
+- Start one or more next to uvicorn:  python -m app.worker
+- Start the API once first so its startup migrations have run.
+"""
+
+import argparse
+import logging
+import os
+import socket
+import time
+from typing import Callable
+
+from sqlalchemy.orm import Session
+
+from .db import Base, SessionLocal, engine
+from .models import BackgroundJob
+from .services.ai import GEMINI_BREAKER
+from .services.circuit_breaker import CircuitOpenError
+from .services.jobs import claim_job, complete_job, defer_job, fail_job
+from .services.summary_jobs import SUMMARY_JOB, run_summary_job
+from .services.translation_jobs import (
+    INTAKE_TRANSLATION_JOB,
+    PRETRANSLATE_JOB,
+    run_intake_translation_job,
+    run_pretranslate_job,
+)
+
+logger = logging.getLogger("clinic_copilot.worker")
+
+HANDLERS: dict[str, Callable[[Session, BackgroundJob], str]] = {
+    INTAKE_TRANSLATION_JOB: run_intake_translation_job,
+    SUMMARY_JOB: run_summary_job,
+    PRETRANSLATE_JOB: run_pretranslate_job,
+}
+
+
+def run_one(db: Session, worker_id: str) -> bool:
+    """Claim and run a single job. Returns False when nothing was runnable."""
+    job = claim_job(db, worker_id, kinds=list(HANDLERS))
+    if job is None:
+        return False
+    handler = HANDLERS[job.kind]
+    try:
+        note = handler(db, job)
+        complete_job(db, job, note)
+        db.commit()
+        logger.info("job %s (%s, intake %s): %s", job.id, job.kind, job.intake_id, note)
+    except CircuitOpenError as exc:
+        db.rollback()
+        job = db.get(BackgroundJob, job.id)
+        defer_job(db, job, max(1.0, GEMINI_BREAKER.retry_after()), str(exc))
+        logger.info("job %s deferred: %s", job.id, exc)
+    except Exception as exc:
+        db.rollback()
+        job = db.get(BackgroundJob, job.id)
+        fail_job(db, job, f"{type(exc).__name__}: {exc}")
+        logger.warning("job %s failed (attempt %s): %s", job.id, job.attempts, exc)
+    return True
+
+
+def run_worker(poll_seconds: float = 1.0, once: bool = False, worker_id: str | None = None) -> None:
+    """Loop forever (or until the queue is drained with once=True)."""
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+    while True:
+        with SessionLocal() as db:
+            ran = run_one(db, worker_id)
+        if not ran:
+            if once:
+                return
+            time.sleep(poll_seconds)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run Clinic Co-Pilot background jobs.")
+    parser.add_argument("--poll", type=float, default=1.0, help="seconds to sleep when the queue is empty")
+    parser.add_argument("--once", action="store_true", help="drain runnable jobs, then exit")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    Base.metadata.create_all(bind=engine)
+    run_worker(poll_seconds=args.poll, once=args.once)
+
+
+if __name__ == "__main__":
+    main()
@@ -26,7 +26,8 @@ const AUTH = {
     sessionStorage.setItem(this.USER_KEY, JSON.stringify({
       staff_id: tokenResponse.staff_id,
       role: tokenResponse.role,
-      full_name: tokenResponse.full_name
+      full_name: tokenResponse.full_name,
+      preferred_language: tokenResponse.preferred_language || "en"
     }));
   },
   
@@ -54,6 +54,7 @@
   const vitalsSummary = document.getElementById("vitals-summary");
   const vitalsChart = document.getElementById("vitals-chart");
   const aiSummary = document.getElementById("ai-summary");
+  const aiSummarySource = document.getElementById("ai-summary-source");
   const redFlags = document.getElementById("red-flags");
   const differentialList = document.getElementById("differential-list");
   const nextSteps = document.getElementById("next-steps");
@@ -337,7 +338,8 @@
       return;
     }
 
-    const cacheKey = String(currentIntakeId || "default");
+    // Keyed by version too: a background summary or translation changes the source text
+    const cacheKey = `${currentIntakeId || "default"}:${currentIntakeData.updated_at || ""}`;
     if (!translationCache[cacheKey]) translationCache[cacheKey] = {};
     if (translationCache[cacheKey][lang]) {
       applyTranslatedFields(translationCache[cacheKey][lang]);
@@ -619,6 +621,12 @@
     }
 
     setPriority(data.clinical_summary?.priority_level);
+    if (aiSummarySource) {
+      aiSummarySource.classList.toggle("hidden", data.clinical_summary?.source !== "rules");
+    }
+    if (data.clinical_summary?.source === "rules" && streamedIntakeId !== data.id) {
+      streamSummary(data.id);
+    }
     renderVitals(data.vitals);
     applyLanguage(currentViewLanguage);
 
@@ -640,6 +648,53 @@
     }
   };
 
+  // Stream a pending AI summary into the panel as Gemini writes it (once per opened case)
+  let summaryStream = null;
+  let streamedIntakeId = null;
+  const STREAM_LIST_FIELDS = {
+    red_flags: "red_flags",
+    differential_considerations: "differential",
+    recommended_questions: "recommended_questions",
+    recommended_next_steps: "recommended_next_steps",
+  };
+
+  const streamSummary = (id) => {
+    if (typeof EventSource === 'undefined' || typeof AUTH === 'undefined' || !AUTH.getToken()) return;
+    if (summaryStream) summaryStream.close();
+    streamedIntakeId = id;
+    const live = { short_summary: "", red_flags: [], differential: [], recommended_questions: [], recommended_next_steps: [] };
+    let started = false;
+    const render = () => {
+      if (currentIntakeId !== id || currentViewLanguage !== "en") return;
+      applyTranslatedFields({ ...buildTranslationPayload(currentIntakeData, "en"), ...live });
+    };
+    summaryStream = new EventSource(
+      API_BASE + `/api/intakes/${encodeURIComponent(id)}/summary/stream?access_token=${encodeURIComponent(AUTH.getToken())}`
+    );
+    summaryStream.addEventListener("field", (event) => {
+      const data = JSON.parse(event.data || "{}");
+      started = true;
+      if (data.field === "short_summary") live.short_summary = data.value;
+      if (data.field === "priority_level" && currentIntakeId === id) setPriority(data.value);
+      render();
+    });
+    summaryStream.addEventListener("item", (event) => {
+      const data = JSON.parse(event.data || "{}");
+      const key = STREAM_LIST_FIELDS[data.field];
+      if (!key) return;
+      started = true;
+      live[key].push(data.value);
+      render();
+    });
+    const finish = () => {
+      if (summaryStream) summaryStream.close();
+      summaryStream = null;
+      if (currentIntakeId === id && started) loadCase(id).catch(console.error);
+    };
+    summaryStream.addEventListener("done", finish);
+    summaryStream.addEventListener("error", finish);
+  };
+
   const loadCase = async (id) => {
     const res = await fetch(API_BASE + `/api/intakes/${encodeURIComponent(id)}`, {
       headers: getHeaders()
@@ -656,17 +711,33 @@
     loadQueue();
   };
 
+  // The list endpoint pages with next_cursor; follow it so older cases stay on the board
+  const fetchQueueItems = async () => {
+    const items = [];
+    let cursor = null;
+    do {
+      const params = new URLSearchParams({ view: "card", limit: "500" });
+      if (cursor) params.set("cursor", cursor);
+      const res = await fetch(API_BASE + "/api/intakes?" + params.toString(), {
+        headers: getHeaders()
+      });
+      if (res.status === 401) return null;
+      if (!res.ok) throw new Error("Failed to load queue");
+      const data = await res.json();
+      if (Array.isArray(data)) return data;
+      items.push(...(data.items || []));
+      cursor = data.next_cursor;
+    } while (cursor);
+    return items;
+  };
+
   const loadQueue = async () => {
-    const res = await fetch(API_BASE + "/api/intakes", {
-      headers: getHeaders()
-    });
-    if (res.status === 401) {
+    const items = await fetchQueueItems();
+    if (items === null) {
       console.log('[Doctor.js] 401 - redirecting to login');
       if (typeof AUTH !== 'undefined') AUTH.logout(LOGIN_URL);
       return;
     }
-    const data = await res.json();
-    const items = Array.isArray(data) ? data : data.items || [];
 
     const pending = items.filter((i) => i.workflow_status === "PENDING_DOCTOR");
     const admitted = items.filter((i) => getDoctorStatus(i) === "ADMITTED");
@@ -783,13 +854,65 @@
     queueToggleDelayed.addEventListener("click", () => setViewMode("delayed"));
   }
 
+  // Remembered on the server so new cases are pre-translated into this language
+  const saveLanguagePreference = async (lang) => {
+    if (typeof AUTH === 'undefined' || !AUTH.getToken()) return;
+    try {
+      const res = await fetch(API_BASE + "/auth/me", {
+        method: "PATCH",
+        headers: getHeaders(),
+        body: JSON.stringify({ preferred_language: lang }),
+      });
+      if (!res.ok) return;
+      const user = AUTH.getUser();
+      if (user) {
+        user.preferred_language = lang;
+        sessionStorage.setItem(AUTH.USER_KEY, JSON.stringify(user));
+      }
+    } catch (err) {
+      console.warn("[Doctor.js] Could not save language preference", err);
+    }
+  };
+
   if (doctorLanguageSelect) {
+    const savedLanguage = typeof AUTH !== 'undefined' ? AUTH.getUser()?.preferred_language : null;
+    if (savedLanguage && doctorLanguageSelect.querySelector(`option[value="${savedLanguage}"]`)) {
+      doctorLanguageSelect.value = savedLanguage;
+    }
     doctorLanguageSelect.addEventListener("change", () => {
       const lang = doctorLanguageSelect.value || "en";
       applyLanguage(lang);
+      saveLanguagePreference(lang);
     });
   }
 
+  // Live queue updates: reload when another user changes an intake (Server-Sent Events)
+  const connectEvents = () => {
+    if (typeof EventSource === 'undefined' || typeof AUTH === 'undefined' || !AUTH.getToken()) return;
+    const source = new EventSource(API_BASE + `/api/events?access_token=${encodeURIComponent(AUTH.getToken())}`);
+    let reloadTimer = null;
+    const scheduleReload = () => {
+      if (reloadTimer) return;
+      reloadTimer = setTimeout(() => {
+        reloadTimer = null;
+        loadQueue().catch(console.error);
+      }, 250);
+    };
+    ["intake_created", "intake_translated", "vitals_submitted", "decision_updated", "summary_updated"].forEach((type) => {
+      source.addEventListener(type, scheduleReload);
+    });
+    // Background AI summary or English translation landed for the open case
+    ["summary_updated", "intake_translated"].forEach((type) => {
+      source.addEventListener(type, (event) => {
+        const data = JSON.parse(event.data || "{}");
+        if (currentIntakeId && data.intake_id === currentIntakeId) {
+          loadCase(currentIntakeId).catch(console.error);
+        }
+      });
+    });
+  };
+
   setViewMode(viewMode);
   loadQueue().catch(console.error);
+  connectEvents();
 })();
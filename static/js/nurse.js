@@ -105,6 +105,7 @@
                 </div>
                 <p class="text-sm text-slate-600 mt-0.5">${i.age} years old - ${i.sex || 'N/A'}</p>
                 <p class="text-xs text-slate-500 mt-1 truncate"><span class="font-medium">CC:</span> ${i.chief_complaint}</p>
+                ${i.translation_status === 'PENDING' ? '<p class="text-xs text-amber-600 mt-1">Translating to English...</p>' : ''}
                 <div class="flex items-center gap-2 mt-2">
                   <span class="material-symbols-outlined text-slate-400 text-xs">schedule</span>
                   <span class="text-xs text-slate-400">${localTime}</span>
@@ -145,24 +146,38 @@
     loadQueue();
   };
 
+  // The list endpoint pages with next_cursor; follow it so older cases stay on the board
+  const fetchQueueItems = async () => {
+    const items = [];
+    let cursor = null;
+    do {
+      const params = new URLSearchParams({ view: "card", limit: "500" });
+      if (cursor) params.set("cursor", cursor);
+      const res = await fetch(API_BASE + "/api/intakes?" + params.toString(), {
+        headers: getHeaders()
+      });
+      if (res.status === 401) return null;
+      if (!res.ok) throw new Error("Failed to load queue");
+      const data = await res.json();
+      if (Array.isArray(data)) return data;
+      items.push(...(data.items || []));
+      cursor = data.next_cursor;
+    } while (cursor);
+    return items;
+  };
+
   const loadQueue = async () => {
     console.log('[Nurse.js] loadQueue called');
     try {
-      const res = await fetch(API_BASE + "/api/intakes", {
-        headers: getHeaders()
-      });
-      console.log('[Nurse.js] API response status:', res.status);
-      
+      const items = await fetchQueueItems();
+
       // Handle auth errors
-      if (res.status === 401) {
+      if (items === null) {
         if (typeof AUTH !== 'undefined') AUTH.clearAuth();
         window.location.href = LOGIN_URL;
         return;
       }
-      
-      const data = await res.json();
-      console.log('[Nurse.js] API data:', data);
-      const items = Array.isArray(data) ? data : data.items || [];
+
       console.log('[Nurse.js] Items count:', items.length);
       const pendingItems = items.filter(i => !i.has_vitals || i.workflow_status === 'PENDING_NURSE');
       const historyItems = items.filter(i => i.has_vitals && i.workflow_status !== 'PENDING_NURSE');
@@ -345,6 +360,24 @@
     queueToggleHistory.addEventListener("click", () => setViewMode("history"));
   }
 
+  // Live queue updates: reload when another user changes an intake (Server-Sent Events)
+  const connectEvents = () => {
+    if (typeof EventSource === 'undefined' || typeof AUTH === 'undefined' || !AUTH.getToken()) return;
+    const source = new EventSource(API_BASE + `/api/events?access_token=${encodeURIComponent(AUTH.getToken())}`);
+    let reloadTimer = null;
+    const scheduleReload = () => {
+      if (reloadTimer) return;
+      reloadTimer = setTimeout(() => {
+        reloadTimer = null;
+        loadQueue();
+      }, 250);
+    };
+    ["intake_created", "intake_translated", "vitals_submitted", "decision_updated", "summary_updated"].forEach((type) => {
+      source.addEventListener(type, scheduleReload);
+    });
+  };
+
   setViewMode(viewMode);
   loadQueue();
+  connectEvents();
 })();
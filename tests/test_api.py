@@ -1,10 +1,39 @@
+import asyncio
+import csv
+import io
+import json
+import os
+import threading
+import time
 import uuid
+from datetime import datetime, timedelta
 
+import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 
 from app.main import app
-from app.db import SessionLocal
-from app.models import User, PatientIntake
+from app.db import SessionLocal, engine
+from app.models import User, PatientIntake, IntakeEvent, ClinicalSummary, BackgroundJob, TranslationCacheEntry
+from app.services.events import EventBroadcaster, format_sse, latest_event_id
+from app.services.payload_cache import PayloadCache
+from app.services.rate_limit import AIGovernor, GovernorTimeout
+from app.services.circuit_breaker import CircuitBreaker, CircuitOpenError
+from app.services.prompt_templates import PromptLibrary
+from app.services.summary_stream import SummaryStreamParser
+from app.services.translation_cache import TranslationCache
+from app.services.single_flight import SingleFlight
+from app.services.language_detect import LanguageDetector
+from app.services.versioning import current_change_seq
+from app.routers import api as api_module
+from app.services import ai as ai_module
+from app.services import jobs as jobs_module
+from app.services import summary_jobs as summary_jobs_module
+from app.services import translation_jobs as translation_jobs_module
+from app import main as main_module
+from app import worker as worker_module
 from app.auth import hash_password
 
 
@@ -45,7 +74,7 @@ def _auth_headers(token: str) -> dict:
     return {"Authorization": f"Bearer {token}"}
 
 
-def _create_intake(client: TestClient) -> int:
+def _intake_payload(**overrides) -> dict:
     payload = {
         "full_name": "Test Patient",
         "age": 38,
@@ -59,7 +88,12 @@ def _create_intake(client: TestClient) -> int:
         "medications": "Lisinopril",
         "allergies": "None",
     }
-    res = client.post("/api/intakes", json=payload)
+    payload.update(overrides)
+    return payload
+
+
+def _create_intake(client: TestClient) -> int:
+    res = client.post("/api/intakes", json=_intake_payload())
     assert res.status_code == 200, res.text
     return res.json()["id"]
 
@@ -82,6 +116,23 @@ def _submit_vitals(client: TestClient, intake_id: int, token: str):
     return res.json()
 
 
+class _QueryCounter:
+    """Counts SQL statements sent through the shared engine."""
+
+    def __init__(self):
+        self.count = 0
+
+    def _on_execute(self, *args, **kwargs):
+        self.count += 1
+
+    def __enter__(self):
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(engine, "before_cursor_execute", self._on_execute)
+
+
 def _cleanup(db, intake_ids: list[int], user_ids: list[int]):
     for intake_id in intake_ids:
         intake = db.get(PatientIntake, intake_id)
@@ -256,3 +307,1615 @@ def test_status_transitions_and_invalid_transition():
     finally:
         with SessionLocal() as db:
             _cleanup(db, intake_ids, created_user_ids)
+
+
+def test_list_intakes_keyset_pagination_and_filters():
+    created_user_ids = []
+    intake_ids = []
+    try:
+        with SessionLocal() as db:
+            nurse_user_id, nurse_id, nurse_pw = _create_user(db, "NURSE")
+            created_user_ids.append(nurse_user_id)
+
+        with TestClient(app) as client:
+            nurse_token = _login(client, nurse_id, nurse_pw)
+            started_at = (datetime.utcnow() - timedelta(seconds=1)).isoformat()
+
+            for _ in range(3):
+                intake_ids.append(_create_intake(client))
+            _submit_vitals(client, intake_ids[0], nurse_token)
+
+            params = {"limit": 2, "created_after": started_at}
+            res = client.get("/api/intakes", params=params, headers=_auth_headers(nurse_token))
+            assert res.status_code == 200, res.text
+            page = res.json()
+            assert [i["id"] for i in page["items"]] == [intake_ids[2], intake_ids[1]]
+            assert page["next_cursor"]
+
+            res = client.get(
+                "/api/intakes",
+                params={**params, "cursor": page["next_cursor"]},
+                headers=_auth_headers(nurse_token),
+            )
+            assert res.status_code == 200, res.text
+            page = res.json()
+            assert [i["id"] for i in page["items"]] == [intake_ids[0]]
+            assert page["next_cursor"] is None
+
+            res = client.get(
+                "/api/intakes",
+                params={"created_after": started_at, "workflow_status": "PENDING_DOCTOR"},
+                headers=_auth_headers(nurse_token),
+            )
+            assert [i["id"] for i in res.json()["items"]] == [intake_ids[0]]
+
+            res = client.get(
+                "/api/intakes",
+                params={"cursor": "not-a-cursor"},
+                headers=_auth_headers(nurse_token),
+            )
+            assert res.status_code == 400
+    finally:
+        with SessionLocal() as db:
+            _cleanup(db, intake_ids, created_user_ids)
+
+
+def test_list_intakes_query_count_is_flat():
+    created_user_ids = []
+    intake_ids = []
+    try:
+        with SessionLocal() as db:
+            nurse_user_id, nurse_id, nurse_pw = _create_user(db, "NURSE")
+            created_user_ids.append(nurse_user_id)
+
+        with TestClient(app) as client:
+            nurse_token = _login(client, nurse_id, nurse_pw)
+            params = {"created_after": (datetime.utcnow() - timedelta(seconds=1)).isoformat()}
+
+            def count_list_queries() -> int:
+                with _QueryCounter() as counter:
+                    res = client.get("/api/intakes", params=params, headers=_auth_headers(nurse_token))
+                    assert res.status_code == 200, res.text
+                return counter.count
+
+            intake_ids.append(_create_intake(client))
+            _submit_vitals(client, intake_ids[-1], nurse_token)
+            single = count_list_queries()
+
+            for _ in range(4):
+                intake_ids.append(_create_intake(client))
+                _submit_vitals(client, intake_ids[-1], nurse_token)
+            assert count_list_queries() == single
+
+            with _QueryCounter() as counter:
+                res = client.get(f"/api/intakes/{intake_ids[0]}", headers=_auth_headers(nurse_token))
+                assert res.status_code == 200, res.text
+            assert counter.count <= single
+    finally:
+        with SessionLocal() as db:
+            _cleanup(db, intake_ids, created_user_ids)
+
+
+def test_list_intakes_card_view_is_compact():
+    created_user_ids = []
+    intake_ids = []
+    try:
+        with SessionLocal() as db:
+            nurse_user_id, nurse_id, nurse_pw = _create_user(db, "NURSE")
+            created_user_ids.append(nurse_user_id)
+
+        with TestClient(app) as client:
+            nurse_token = _login(client, nurse_id, nurse_pw)
+            params = {"created_after": (datetime.utcnow() - timedelta(seconds=1)).isoformat()}
+            intake_ids.append(_create_intake(client))
+            intake_ids.append(_create_intake(client))
+            _submit_vitals(client, intake_ids[0], nurse_token)
+
+            full = client.get("/api/intakes", params=params, headers=_auth_headers(nurse_token)).json()
+            res = client.get(
+                "/api/intakes",
+                params={**params, "view": "card", "priority_level": full["items"][1]["priority_level"]},
+                headers=_auth_headers(nurse_token),
+            )
+            assert res.status_code == 200, res.text
+            cards = res.json()["items"]
+            assert [c["id"] for c in cards] == [intake_ids[0]]
+            card, detail = cards[0], full["items"][1]
+            assert "symptoms" not in card and "symptoms_original" not in card
+            for key in ("full_name", "chief_complaint", "workflow_status", "doctor_status", "priority_level", "created_at", "vitals"):
+                assert card[key] == detail[key]
+            assert card["clinical_summary"]["created_at"] == detail["clinical_summary"]["created_at"]
+
+            res = client.get("/api/intakes", params={**params, "view": "card"}, headers=_auth_headers(nurse_token))
+            pending = res.json()["items"][0]
+            assert pending["id"] == intake_ids[1]
+            assert pending["has_vitals"] is False and pending["vitals"] is None
+            assert pending["clinical_summary"] == {}
+    finally:
+        with SessionLocal() as db:
+            _cleanup(db, intake_ids, created_user_ids)
+
+
+def test_intake_etags_return_304_until_a_write():
+    created_user_ids = []
+    intake_ids = []
+    try:
+        with SessionLocal() as db:
+            nurse_user_id, nurse_id, nurse_pw = _create_user(db, "NURSE")
+            created_user_ids.append(nurse_user_id)
+
+        with TestClient(app) as client:
+            nurse_token = _login(client, nurse_id, nurse_pw)
+            headers = _auth_headers(nurse_token)
+            intake_ids.append(_create_intake(client))
+
+            res = client.get("/api/intakes", params={"view": "card"}, headers=headers)
+            list_etag = res.headers["ETag"]
+            res = client.get(f"/api/intakes/{intake_ids[0]}", headers=headers)
+            detail_etag = res.headers["ETag"]
+
+            with _QueryCounter() as counter:
+                res = client.get(
+                    "/api/intakes",
+                    params={"view": "card"},
+                    headers={**headers, "If-None-Match": list_etag},
+                )
+            assert res.status_code == 304
+            assert res.content == b""
+            not_modified_queries = counter.count
+
+            with _QueryCounter() as counter:
+                res = client.get(
+                    f"/api/intakes/{intake_ids[0]}",
+                    headers={**headers, "If-None-Match": detail_etag},
+                )
+            assert res.status_code == 304
+            assert counter.count == not_modified_queries
+
+            # Same version, different query -> different representation
+            res = client.get("/api/intakes", headers={**headers, "If-None-Match": list_etag})
+            assert res.status_code == 200
+
+            _submit_vitals(client, intake_ids[0], nurse_token)
+
+            res = client.get(
+                "/api/intakes",
+                params={"view": "card"},
+                headers={**headers, "If-None-Match": list_etag},
+            )
+            assert res.status_code == 200
+            assert res.headers["ETag"] != list_etag
+            res = client.get(
+                f"/api/intakes/{intake_ids[0]}",
+                headers={**headers, "If-None-Match": detail_etag},
+            )
+            assert res.status_code == 200
+            assert res.json()["has_vitals"] is True
+    finally:
+        with SessionLocal() as db:
+            _cleanup(db, intake_ids, created_user_ids)
+
+
+def test_intake_changes_returns_only_deltas():
+    created_user_ids = []
+    intake_ids = []
+    try:
+        with SessionLocal() as db:
+            nurse_user_id, nurse_id, nurse_pw = _create_user(db, "NURSE")
+            created_user_ids.append(nurse_user_id)
+
+        with TestClient(app) as client:
+            nurse_token = _login(client, nurse_id, nurse_pw)
+            headers = _auth_headers(nurse_token)
+            intake_ids.append(_create_intake(client))
+            intake_ids.append(_create_intake(client))
+
+            res = client.get("/api/intakes/changes", params={"since": "0", "limit": 1}, headers=headers)
+            assert res.status_code == 200, res.text
+            assert res.json()["has_more"] is True
+
+            # Drain the backlog to get a current token
+            while res.json()["has_more"]:
+                res = client.get("/api/intakes/changes", params={"since": res.json()["next_token"]}, headers=headers)
+            token = res.json()["next_token"]
+
+            _submit_vitals(client, intake_ids[0], nurse_token)
+            intake_ids.append(_create_intake(client))
+
+            res = client.get("/api/intakes/changes", params={"since": token, "view": "card"}, headers=headers)
+            assert res.status_code == 200, res.text
+            data = res.json()
+            assert [i["id"] for i in data["items"]] == [intake_ids[0], intake_ids[2]]
+            assert data["items"][0]["has_vitals"] is True
+            assert data["items"][0]["updated_at"]
+            assert int(data["next_token"]) > int(token)
+
+            res = client.get("/api/intakes/changes", params={"since": data["next_token"]}, headers=headers)
+            assert res.json() == {"items": [], "next_token": data["next_token"], "has_more": False}
+
+            res = client.get("/api/intakes/changes", params={"since": "abc"}, headers=headers)
+            assert res.status_code == 400
+    finally:
+        with SessionLocal() as db:
+            _cleanup(db, intake_ids, created_user_ids)
+
+
+def test_change_seq_backfill_puts_old_rows_in_delta_sync():
+    created_user_ids = []
+    intake_ids = []
+    try:
+        with SessionLocal() as db:
+            nurse_user_id, nurse_id, nurse_pw = _create_user(db, "NURSE")
+            created_user_ids.append(nurse_user_id)
+
+        with TestClient(app) as client:
+            headers = _auth_headers(_login(client, nurse_id, nurse_pw))
+            intake_ids.append(_create_intake(client))
+            token = client.get("/api/intakes/changes", params={"since": "0", "limit": 1}, headers=headers).json()
+            while token["has_more"]:
+                token = client.get("/api/intakes/changes", params={"since": token["next_token"]}, headers=headers).json()
+
+            # A row written before the change_seq column existed
+            with SessionLocal() as db:
+                db.get(PatientIntake, intake_ids[0]).change_seq = 0
+                db.commit()
+            main_module._ensure_change_counter()
+
+            res = client.get("/api/intakes/changes", params={"since": token["next_token"]}, headers=headers).json()
+            assert [item["id"] for item in res["items"]] == [intake_ids[0]]
+            with SessionLocal() as db:
+                seq = db.get(PatientIntake, intake_ids[0]).change_seq
+                assert seq > int(token["next_token"])
+                assert current_change_seq(db) >= seq
+    finally:
+        with SessionLocal() as db:
+            _cleanup(db, intake_ids, created_user_ids)
+
+
+def test_write_endpoints_record_intake_events():
+    created_user_ids = []
+    intake_ids = []
+    try:
+        with SessionLocal() as db:
+            nurse_user_id, nurse_id, nurse_pw = _create_user(db, "NURSE")
+            doctor_user_id, doctor_id, doctor_pw = _create_user(db, "DOCTOR")
+            created_user_ids.extend([nurse_user_id, doctor_user_id])
+
+            # Intake ids can be reused after cleanup, so only look at events from this test
+            first_event_id = latest_event_id(db)
+
+        with TestClient(app) as client:
+            assert client.get("/api/events").status_code == 401
+
+            nurse_token = _login(client, nurse_id, nurse_pw)
+            doctor_token = _login(client, doctor_id, doctor_pw)
+            intake_ids.append(_create_intake(client))
+            summary = _submit_vitals(client, intake_ids[0], nurse_token)
+            res = client.post(
+                f"/api/intakes/{intake_ids[0]}/decision",
+                json={"decision": "ADMIT", "doctor_note": "Admit"},
+                headers=_auth_headers(doctor_token),
+            )
+            assert res.status_code == 200, res.text
+
+        with SessionLocal() as db:
+            events = db.execute(
+                select(IntakeEvent)
+                .where(IntakeEvent.intake_id == intake_ids[0], IntakeEvent.id > first_event_id)
+                .order_by(IntakeEvent.id)
+            ).scalars().all()
+        assert [e.event_type for e in events] == [
+            "intake_created", "vitals_submitted", "summary_updated", "decision_updated"
+        ]
+        # Vitals are announced as soon as they are saved, the summary when it is stored
+        assert json.loads(events[1].payload)["priority_level"] is None
+        summary_payload = json.loads(events[2].payload)
+        assert summary_payload["workflow_status"] == "PENDING_DOCTOR"
+        assert summary_payload["priority_level"] == summary["priority_level"]
+        assert json.loads(events[3].payload)["doctor_status"] == "ADMITTED"
+        assert format_sse({"id": events[0].id, "type": "intake_created", "data": "{}"}).startswith(
+            f"id: {events[0].id}\nevent: intake_created\n"
+        )
+    finally:
+        with SessionLocal() as db:
+            _cleanup(db, intake_ids, created_user_ids)
+
+
+def test_event_broadcaster_fans_out_to_all_subscribers():
+    intake_ids = []
+
+    async def scenario():
+        broadcaster = EventBroadcaster(poll_interval=60)
+        first, second = broadcaster.subscribe(), broadcaster.subscribe()
+        await asyncio.sleep(0.2)  # initial poll records the starting event id
+
+        with TestClient(app) as client:
+            intake_ids.append(_create_intake(client))
+
+        assert await broadcaster.poll_once() >= 1
+        received = [first.get_nowait(), second.get_nowait()]
+        broadcaster.unsubscribe(first)
+        broadcaster.unsubscribe(second)
+        broadcaster._task.cancel()
+        return received
+
+    try:
+        received = asyncio.run(scenario())
+        for event in received:
+            assert event["type"] == "intake_created"
+            assert json.loads(event["data"])["intake_id"] == intake_ids[0]
+    finally:
+        with SessionLocal() as db:
+            _cleanup(db, intake_ids, [])
+
+
+def test_triage_queue_orders_open_cases_and_drops_closed_ones():
+    created_user_ids = []
+    intake_ids = []
+    try:
+        with SessionLocal() as db:
+            nurse_user_id, nurse_id, nurse_pw = _create_user(db, "NURSE")
+            doctor_user_id, doctor_id, doctor_pw = _create_user(db, "DOCTOR")
+            created_user_ids.extend([nurse_user_id, doctor_user_id])
+
+        with TestClient(app) as client:
+            nurse_token = _login(client, nurse_id, nurse_pw)
+            doctor_token = _login(client, doctor_id, doctor_pw)
+            headers = _auth_headers(nurse_token)
+
+            intake_ids.append(_create_intake(client))
+            intake_ids.append(_create_intake(client))
+            summary = _submit_vitals(client, intake_ids[1], nurse_token)
+            assert summary["priority_level"] == "HIGH"
+
+            res = client.get("/api/queue", params={"top": 500}, headers=headers)
+            assert res.status_code == 200, res.text
+            ids = [i["id"] for i in res.json()["items"]]
+            assert ids.index(intake_ids[1]) < ids.index(intake_ids[0])
+            triaged = res.json()["items"][ids.index(intake_ids[1])]
+            assert triaged["workflow_status"] == "PENDING_DOCTOR"
+            assert triaged["priority_level"] == "HIGH"
+
+            res = client.get("/api/queue", params={"top": 500, "stage": "PENDING_NURSE"}, headers=headers)
+            nurse_ids = [i["id"] for i in res.json()["items"]]
+            assert intake_ids[0] in nurse_ids and intake_ids[1] not in nurse_ids
+
+            res = client.get("/api/queue/next", params={"stage": "PENDING_DOCTOR"}, headers=headers)
+            assert res.json()["item"]["priority_level"] == "HIGH"
+
+            res = client.post(
+                f"/api/intakes/{intake_ids[1]}/decision",
+                json={"decision": "ADMIT", "doctor_note": "Admit"},
+                headers=_auth_headers(doctor_token),
+            )
+            assert res.status_code == 200, res.text
+            res = client.get("/api/queue", params={"top": 500}, headers=headers)
+            ids = [i["id"] for i in res.json()["items"]]
+            assert intake_ids[1] not in ids and intake_ids[0] in ids
+
+            assert client.get("/api/queue", params={"stage": "COMPLETED"}, headers=headers).status_code == 422
+    finally:
+        with SessionLocal() as db:
+            _cleanup(db, intake_ids, created_user_ids)
+
+
+def test_intake_payloads_are_served_from_versioned_cache():
+    created_user_ids = []
+    intake_ids = []
+    try:
+        with SessionLocal() as db:
+            nurse_user_id, nurse_id, nurse_pw = _create_user(db, "NURSE")
+            created_user_ids.append(nurse_user_id)
+
+        with TestClient(app) as client:
+            nurse_token = _login(client, nurse_id, nurse_pw)
+            headers = _auth_headers(nurse_token)
+            intake_ids.append(_create_intake(client))
+
+            with _QueryCounter() as miss:
+                first = client.get(f"/api/intakes/{intake_ids[0]}", headers=headers)
+            with _QueryCounter() as hit:
+                second = client.get(f"/api/intakes/{intake_ids[0]}", headers=headers)
+            assert second.json() == first.json()
+            assert hit.count < miss.count
+
+            _submit_vitals(client, intake_ids[0], nurse_token)
+            with _QueryCounter() as counter:
+                res = client.get(f"/api/intakes/{intake_ids[0]}", headers=headers)
+            assert res.json()["has_vitals"] is True
+            assert counter.count > hit.count
+    finally:
+        with SessionLocal() as db:
+            _cleanup(db, intake_ids, created_user_ids)
+
+
+def test_payload_cache_evicts_least_recently_used():
+    cache = PayloadCache(max_entries=2)
+    cache.put(("full", 1, 1), b"{}")
+    cache.put(("full", 2, 1), b"{}")
+    assert cache.get(("full", 1, 1)) == b"{}"
+    cache.put(("full", 3, 1), b"{}")
+    assert cache.get(("full", 2, 1)) is None
+    assert cache.get(("full", 1, 1)) is not None
+    cache.invalidate(1)
+    assert cache.get(("full", 1, 1)) is None
+    assert len(cache) == 1
+
+
+def test_export_streams_ndjson_and_csv():
+    created_user_ids = []
+    intake_ids = []
+    try:
+        with SessionLocal() as db:
+            nurse_user_id, nurse_id, nurse_pw = _create_user(db, "NURSE")
+            created_user_ids.append(nurse_user_id)
+
+        with TestClient(app) as client:
+            assert client.get("/api/intakes/export").status_code == 401
+            nurse_token = _login(client, nurse_id, nurse_pw)
+            headers = _auth_headers(nurse_token)
+            params = {"created_after": (datetime.utcnow() - timedelta(seconds=1)).isoformat()}
+            intake_ids.append(_create_intake(client))
+            intake_ids.append(_create_intake(client))
+            _submit_vitals(client, intake_ids[0], nurse_token)
+
+            res = client.get("/api/intakes/export", params=params, headers=headers)
+            assert res.status_code == 200, res.text
+            assert res.headers["content-type"].startswith("application/x-ndjson")
+            records = [json.loads(line) for line in res.text.splitlines()]
+            assert [r["id"] for r in records] == intake_ids
+            assert records[0]["vitals"]["heart_rate"] == 118
+            assert records[0]["clinical_summary"]["short_summary"]
+            assert records[1]["vitals"] is None
+
+            res = client.get(
+                "/api/intakes/export",
+                params={**params, "format": "csv", "workflow_status": "PENDING_DOCTOR"},
+                headers=headers,
+            )
+            assert res.status_code == 200, res.text
+            rows = list(csv.DictReader(io.StringIO(res.text)))
+            assert [int(r["id"]) for r in rows] == [intake_ids[0]]
+            assert rows[0]["vitals_spo2"] == "96"
+            assert rows[0]["summary_priority_level"] == "HIGH"
+    finally:
+        with SessionLocal() as db:
+            _cleanup(db, intake_ids, created_user_ids)
+
+
+def test_batch_import_reports_per_item_results(monkeypatch):
+    created_user_ids = []
+    intake_ids = []
+    translate_calls = []
+
+    def fake_translate(fields, target_language):
+        translate_calls.append(fields)
+        return {key: {**value, "symptoms": f"EN {value['symptoms']}"} for key, value in fields.items()}, True, None
+
+    monkeypatch.setattr(api_module, "translate_fields_payload", fake_translate)
+    try:
+        with SessionLocal() as db:
+            nurse_user_id, nurse_id, nurse_pw = _create_user(db, "NURSE")
+            created_user_ids.append(nurse_user_id)
+
+        with TestClient(app) as client:
+            nurse_token = _login(client, nurse_id, nurse_pw)
+            batch = [
+                _intake_payload(full_name="Batch English"),
+                _intake_payload(full_name="Batch Spanish 1", preferred_language="es", symptoms="dolor"),
+                _intake_payload(age=500),
+                _intake_payload(full_name="Batch Spanish 2", preferred_language="es", symptoms="fiebre"),
+                _intake_payload(full_name="Batch French", preferred_language="fr", symptoms="toux"),
+            ]
+            res = client.post("/api/intakes/batch", json=batch, headers=_auth_headers(nurse_token))
+            assert res.status_code == 200, res.text
+            data = res.json()
+            intake_ids.extend(r["id"] for r in data["results"] if r["status"] == "created")
+            assert data["created"] == 4 and data["failed"] == 1
+            assert [r["status"] for r in data["results"]] == ["created", "created", "error", "created", "created"]
+            assert data["results"][2]["errors"][0]["loc"] == ["age"]
+
+            # One call per source language, not per intake
+            assert len(translate_calls) == 2
+            spanish = client.get(f"/api/intakes/{data['results'][3]['id']}", headers=_auth_headers(nurse_token)).json()
+            assert spanish["symptoms"] == "EN fiebre"
+            assert spanish["symptoms_original"] == "fiebre"
+
+            assert client.post("/api/intakes/batch", json=batch).status_code == 401
+    finally:
+        with SessionLocal() as db:
+            _cleanup(db, intake_ids, created_user_ids)
+
+
+def test_intake_search_ranks_matches_and_follows_writes():
+    created_user_ids = []
+    intake_ids = []
+    marker = f"zq{uuid.uuid4().hex[:10]}"
+    try:
+        with SessionLocal() as db:
+            doctor_user_id, doctor_id, doctor_pw = _create_user(db, "DOCTOR")
+            created_user_ids.append(doctor_user_id)
+
+        with TestClient(app) as client:
+            headers = _auth_headers(_login(client, doctor_id, doctor_pw))
+            res = client.post("/api/intakes", json=_intake_payload(allergies=f"Penicillin {marker}"))
+            intake_ids.append(res.json()["id"])
+            res = client.post(
+                "/api/intakes",
+                json=_intake_payload(chief_complaint=f"{marker} rash", symptoms=f"{marker} itching after {marker}"),
+            )
+            intake_ids.append(res.json()["id"])
+
+            res = client.get("/api/intakes/search", params={"q": marker}, headers=headers)
+            assert res.status_code == 200, res.text
+            items = res.json()["items"]
+            assert [i["id"] for i in items] == [intake_ids[1], intake_ids[0]]
+            assert f"[{marker}]" in items[0]["snippet"]
+            assert "symptoms" not in items[0]
+
+            res = client.get("/api/intakes/search", params={"q": f"penicil {marker[:6]}"}, headers=headers)
+            assert intake_ids[0] not in [i["id"] for i in res.json()["items"]]
+            res = client.get("/api/intakes/search", params={"q": f"{marker} penicil"}, headers=headers)
+            assert [i["id"] for i in res.json()["items"]] == [intake_ids[0]]
+
+            res = client.get("/api/intakes/search", params={"q": f'{marker} "OR'}, headers=headers)
+            assert res.status_code == 200
+
+        with SessionLocal() as db:
+            _cleanup(db, [intake_ids[1]], [])
+        with TestClient(app) as client:
+            res = client.get("/api/intakes/search", params={"q": marker}, headers=headers)
+            assert [i["id"] for i in res.json()["items"]] == [intake_ids[0]]
+    finally:
+        with SessionLocal() as db:
+            _cleanup(db, intake_ids, created_user_ids)
+
+
+def test_vitals_store_rules_summary_and_worker_upgrades_it(monkeypatch):
+    created_user_ids = []
+    intake_ids = []
+    kind = f"test_{uuid.uuid4().hex[:8]}"
+    try:
+        with SessionLocal() as db:
+            nurse_user_id, nurse_id, nurse_pw = _create_user(db, "NURSE")
+            created_user_ids.append(nurse_user_id)
+
+        monkeypatch.setattr(api_module, "is_gemini_ready", lambda: True)
+        with TestClient(app) as client:
+            nurse_token = _login(client, nurse_id, nurse_pw)
+            intake_ids.append(_create_intake(client))
+            summary = _submit_vitals(client, intake_ids[0], nurse_token)
+        assert summary["source"] == "rules"
+
+        ai_result = {
+            "short_summary": "AI summary",
+            "priority_level": "HIGH",
+            "red_flags": ["Tachycardia"],
+            "differential_considerations": ["ACS"],
+            "recommended_questions": ["Radiation?"],
+            "recommended_next_steps": ["ECG"],
+        }
+        monkeypatch.setattr(summary_jobs_module, "generate_ai_summary", lambda payload: ai_result)
+        with SessionLocal() as db:
+            job = db.execute(
+                select(BackgroundJob).where(BackgroundJob.intake_id == intake_ids[0])
+            ).scalar_one()
+            assert job.kind == summary_jobs_module.SUMMARY_JOB and job.status == jobs_module.JOB_QUEUED
+            seq_before = db.get(PatientIntake, intake_ids[0]).change_seq
+            first_event_id = latest_event_id(db)
+
+            assert summary_jobs_module.run_summary_job(db, job) == "upgraded"
+            jobs_module.complete_job(db, job)
+            db.commit()
+
+        with SessionLocal() as db:
+            intake = db.get(PatientIntake, intake_ids[0])
+            stored = intake.clinical_summary
+            assert (stored.source, stored.short_summary, stored.priority_level) == ("ai", "AI summary", "HIGH")
+            assert stored.decision == "PENDING"
+            assert intake.change_seq > seq_before
+            events = db.execute(select(IntakeEvent).where(IntakeEvent.id > first_event_id)).scalars().all()
+            assert [(e.intake_id, e.event_type) for e in events] == [(intake_ids[0], "summary_updated")]
+
+            # Once upgraded (or superseded) a rerun is a no-op
+            job = db.execute(select(BackgroundJob).where(BackgroundJob.intake_id == intake_ids[0])).scalar_one()
+            assert summary_jobs_module.run_summary_job(db, job) == "already upgraded"
+
+            # Claims go most urgent first; failures are retried with backoff, then parked
+            low = jobs_module.enqueue_job(db, kind, priority=jobs_module.priority_rank("LOW"))
+            high = jobs_module.enqueue_job(db, kind, priority=jobs_module.priority_rank("HIGH"))
+            db.commit()
+            claimed = jobs_module.claim_job(db, "test-worker", kinds=[kind])
+            assert claimed.id == high.id and claimed.status == jobs_module.JOB_RUNNING
+            jobs_module.complete_job(db, claimed)
+            db.commit()
+
+            def boom(db, job):
+                raise RuntimeError("Gemini down")
+
+            monkeypatch.setitem(worker_module.HANDLERS, kind, boom)
+            monkeypatch.setattr(jobs_module, "MAX_ATTEMPTS", 2)
+            assert worker_module.run_one(db, "test-worker")
+            db.refresh(low)
+            assert (low.status, low.attempts, low.last_error) == ("QUEUED", 1, "RuntimeError: Gemini down")
+            assert low.run_after > datetime.utcnow()
+            assert jobs_module.claim_job(db, "test-worker", kinds=[kind]) is None
+
+            low.run_after = datetime.utcnow()
+            db.commit()
+            assert worker_module.run_one(db, "test-worker")
+            db.refresh(low)
+            assert (low.status, low.attempts) == ("FAILED", 2)
+    finally:
+        with SessionLocal() as db:
+            db.query(BackgroundJob).filter(
+                (BackgroundJob.intake_id.in_(intake_ids)) | (BackgroundJob.kind == kind)
+            ).delete(synchronize_session=False)
+            db.commit()
+            _cleanup(db, intake_ids, created_user_ids)
+
+
+def test_stale_summary_job_is_dropped_after_vitals_resubmit(monkeypatch):
+    created_user_ids = []
+    intake_ids = []
+    try:
+        with SessionLocal() as db:
+            nurse_user_id, nurse_id, nurse_pw = _create_user(db, "NURSE")
+            created_user_ids.append(nurse_user_id)
+
+        monkeypatch.setattr(api_module, "is_gemini_ready", lambda: True)
+        monkeypatch.setattr(api_module, "SUMMARY_AI_DEADLINE_SECONDS", 0)
+        with TestClient(app) as client:
+            nurse_token = _login(client, nurse_id, nurse_pw)
+            intake_ids.append(_create_intake(client))
+            _submit_vitals(client, intake_ids[0], nurse_token)
+            # Resubmitting deletes the old summary; SQLite may hand its id to the new one
+            _submit_vitals(client, intake_ids[0], nurse_token)
+
+        monkeypatch.setattr(summary_jobs_module, "generate_ai_summary", lambda payload: {
+            "short_summary": "AI summary",
+            "priority_level": "HIGH",
+            "red_flags": [],
+            "differential_considerations": [],
+            "recommended_questions": [],
+            "recommended_next_steps": [],
+        })
+        with SessionLocal() as db:
+            stale, current = db.execute(
+                select(BackgroundJob).where(BackgroundJob.intake_id == intake_ids[0]).order_by(BackgroundJob.id)
+            ).scalars().all()
+            assert jobs_module.job_payload(stale)["vitals"] != jobs_module.job_payload(current)["vitals"]
+
+            assert summary_jobs_module.run_summary_job(db, stale) == "superseded"
+            summary = db.execute(
+                select(ClinicalSummary).where(ClinicalSummary.intake_id == intake_ids[0])
+            ).scalar_one()
+            assert summary.source == "rules"
+
+            assert summary_jobs_module.run_summary_job(db, current) == "upgraded"
+            db.commit()
+            db.refresh(summary)
+            assert (summary.source, summary.short_summary) == ("ai", "AI summary")
+    finally:
+        with SessionLocal() as db:
+            db.query(BackgroundJob).filter(BackgroundJob.intake_id.in_(intake_ids)).delete(synchronize_session=False)
+            db.commit()
+            _cleanup(db, intake_ids, created_user_ids)
+
+
+def test_async_translation_path_for_intakes_and_translate(monkeypatch):
+    created_user_ids = []
+    intake_ids = []
+    prompts = []
+
+    async def fake_generate(prompt):
+        prompts.append(prompt)
+        if len(prompts) == 1:
+            raise RuntimeError("503 UNAVAILABLE")
+        await asyncio.sleep(0)
+        return '```json\n{"symptoms": "EN fever"}\n```'
+
+    monkeypatch.setattr(ai_module, "is_gemini_ready", lambda: True)
+    monkeypatch.setattr(ai_module, "_generate_text_async", fake_generate)
+    monkeypatch.setattr(ai_module, "_FIELDS_RETRY_SECONDS", 0)
+
+    # Unavailable is retried once (with a non-blocking sleep), quota errors are not
+    assert asyncio.run(ai_module.translate_fields_payload_async({"symptoms": "fiebre"}, "en")) == (
+        {"symptoms": "EN fever"}, True, None
+    )
+    assert len(prompts) == 2
+
+    async def quota(prompt):
+        raise RuntimeError("429 RESOURCE_EXHAUSTED")
+
+    monkeypatch.setattr(ai_module, "_generate_text_async", quota)
+    assert asyncio.run(ai_module.translate_fields_payload_async({"a": "b"}, "es")) == ({"a": "b"}, False, "quota_exceeded")
+
+    async def fake_translate(fields, target_language):
+        return {key: f"{target_language}: {value}" for key, value in fields.items()}, True, None
+
+    monkeypatch.setattr(translation_jobs_module, "translate_fields_payload_async", fake_translate)
+    # Fake translations must never reach the app's shared translation_cache table
+    memory = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    TranslationCacheEntry.__table__.create(memory)
+    cache = TranslationCache(session_factory=sessionmaker(bind=memory))
+    monkeypatch.setattr(translation_jobs_module, "translation_cache", cache)
+    monkeypatch.setattr(api_module, "translation_cache", cache)
+    try:
+        with SessionLocal() as db:
+            doctor_user_id, doctor_id, doctor_pw = _create_user(db, "DOCTOR")
+            created_user_ids.append(doctor_user_id)
+
+        with TestClient(app) as client:
+            # The kiosk submit never waits on Gemini: original text now, English later
+            def not_on_request_path(fields, target_language):
+                raise AssertionError("create_intake must not call Gemini")
+
+            monkeypatch.setattr(translation_jobs_module, "is_gemini_ready", lambda: True)
+            monkeypatch.setattr(translation_jobs_module, "translate_fields_payload", not_on_request_path)
+            res = client.post("/api/intakes", json=_intake_payload(preferred_language="es", symptoms="fiebre"))
+            assert res.status_code == 200, res.text
+            intake_ids.append(res.json()["id"])
+            headers = _auth_headers(_login(client, doctor_id, doctor_pw))
+            intake = client.get(f"/api/intakes/{intake_ids[0]}", headers=headers).json()
+            assert (intake["symptoms"], intake["translation_status"]) == ("fiebre", "PENDING")
+
+            def sync_translate(fields, target_language):
+                return {key: f"{target_language}: {value}" for key, value in fields.items()}, True, None
+
+            monkeypatch.setattr(translation_jobs_module, "translate_fields_payload", sync_translate)
+            with SessionLocal() as db:
+                job = db.execute(select(BackgroundJob).where(BackgroundJob.intake_id == intake_ids[0])).scalar_one()
+                assert job.kind == translation_jobs_module.INTAKE_TRANSLATION_JOB
+                first_event_id = latest_event_id(db)
+                assert translation_jobs_module.run_intake_translation_job(db, job).startswith("translated")
+                jobs_module.complete_job(db, job)
+                db.commit()
+                events = db.execute(select(IntakeEvent).where(IntakeEvent.id > first_event_id)).scalars().all()
+                assert [e.event_type for e in events] == ["intake_translated"]
+                assert translation_jobs_module.run_intake_translation_job(db, job) == "already translated"
+            intake = client.get(f"/api/intakes/{intake_ids[0]}", headers=headers).json()
+            assert (intake["symptoms"], intake["symptoms_original"]) == ("English: fiebre", "fiebre")
+            assert intake["translation_status"] == "TRANSLATED"
+
+            res = client.post(
+                "/api/translate",
+                json={"language": "fr", "fields": {"symptoms": f"cough {uuid.uuid4().hex}"}},
+                headers=headers,
+            )
+            assert res.status_code == 200, res.text
+            assert res.json()["fields"]["symptoms"].startswith("fr: cough")
+            assert cache.stats()["stores"] >= 2
+    finally:
+        with SessionLocal() as db:
+            db.query(BackgroundJob).filter(BackgroundJob.intake_id.in_(intake_ids)).delete(synchronize_session=False)
+            db.commit()
+            _cleanup(db, intake_ids, created_user_ids)
+
+
+def test_ai_governor_queues_callers_until_deadline():
+    governor = AIGovernor(requests_per_minute=0, tokens_per_minute=600, max_concurrency=1, queue_timeout=0.05)
+
+    # Concurrency cap: the second caller times out while the first holds the slot
+    governor.acquire(tokens=600)
+    with pytest.raises(GovernorTimeout):
+        governor.acquire()
+    governor.release()
+
+    # Token bucket: 600/min refills 10 tokens per second, so 5 tokens take ~0.5s
+    with governor.slot(tokens=5, timeout=2):
+        pass
+    stats = governor.stats()
+    assert stats["last_wait_ms"] >= 400
+    assert (stats["acquired"], stats["timed_out"], stats["in_flight"], stats["queued"]) == (2, 1, 0, 0)
+
+    async def hold_and_wait():
+        async def holder():
+            async with governor.slot_async():
+                await asyncio.sleep(0.1)
+
+        async def waiter():
+            await asyncio.sleep(0.01)
+            assert governor.stats()["in_flight"] == 1
+            async with governor.slot_async(timeout=1):
+                return governor.stats()["in_flight"]
+
+        return await asyncio.gather(holder(), waiter())
+
+    assert asyncio.run(hold_and_wait())[1] == 1
+    assert governor.stats()["queued"] == 0
+
+    with TestClient(app) as client:
+        governor_stats = client.get("/api/health").json()["ai"]["governor"]
+    assert {"queued", "in_flight", "avg_wait_ms", "timed_out"} <= set(governor_stats)
+
+
+def test_circuit_breaker_trips_fails_fast_and_recovers(monkeypatch):
+    breaker = CircuitBreaker("test", failure_threshold=2, cooldown_seconds=0.05, ignore=(GovernorTimeout,))
+
+    def call(error=None):
+        with breaker.guard():
+            if error:
+                raise error
+
+    with pytest.raises(GovernorTimeout):
+        call(GovernorTimeout("queue"))
+    with pytest.raises(RuntimeError):
+        call(RuntimeError("503 UNAVAILABLE"))
+    assert breaker.state == "CLOSED"
+    with pytest.raises(RuntimeError):
+        call(RuntimeError("503 UNAVAILABLE"))
+    assert breaker.state == "OPEN"
+    with pytest.raises(CircuitOpenError):
+        call()
+
+    # After the cooldown one half-open probe is let through; a failed probe re-opens
+    time.sleep(0.06)
+    assert breaker.state == "HALF_OPEN"
+    with pytest.raises(RuntimeError):
+        call(RuntimeError("timeout"))
+    assert breaker.state == "OPEN"
+    time.sleep(0.06)
+    call()
+    assert breaker.state == "CLOSED"
+    assert breaker.stats()["trips"] == 2
+
+    # While open, Gemini callers get the fallback without touching the client
+    tripped = CircuitBreaker("gemini", failure_threshold=1, cooldown_seconds=60)
+    tripped.record_failure(RuntimeError("down"))
+
+    class NoClient:
+        def __getattr__(self, name):
+            raise AssertionError("client must not be called while the circuit is open")
+
+    monkeypatch.setattr(ai_module, "GEMINI_BREAKER", tripped)
+    monkeypatch.setattr(ai_module, "GENAI_CLIENT", NoClient())
+    monkeypatch.setattr(ai_module, "is_gemini_ready", lambda: True)
+    assert ai_module.translate_fields_payload({"a": "b"}, "es") == ({"a": "b"}, False, "circuit_open")
+    assert ai_module.translate_text("hola", "en") == "hola"
+    assert ai_module.generate_clinical_summary({
+        "intake": _intake_payload(),
+        "vitals": {"heart_rate": 80, "respiratory_rate": 16, "temperature_c": 37.0, "spo2": 98,
+                   "systolic_bp": 120, "diastolic_bp": 80},
+    })["short_summary"]
+
+    with TestClient(app) as client:
+        circuit = client.get("/api/health").json()["ai"]["circuit"]
+    assert circuit["state"] == "OPEN" and circuit["retry_after_seconds"] > 0
+
+
+def test_vitals_race_ai_summary_against_deadline(monkeypatch):
+    created_user_ids = []
+    intake_ids = []
+    delays = [0, 0.3]
+
+    async def fake_ai(payload):
+        await asyncio.sleep(delays.pop(0))
+        return {
+            "short_summary": f"AI for {payload['intake']['full_name']}",
+            "priority_level": "HIGH",
+            "red_flags": [],
+            "differential_considerations": [],
+            "recommended_questions": [],
+            "recommended_next_steps": [],
+        }
+
+    monkeypatch.setattr(api_module, "is_gemini_ready", lambda: True)
+    monkeypatch.setattr(api_module, "generate_ai_summary_async", fake_ai)
+    monkeypatch.setattr(api_module, "SUMMARY_AI_DEADLINE_SECONDS", 0.1)
+    try:
+        with SessionLocal() as db:
+            nurse_user_id, nurse_id, nurse_pw = _create_user(db, "NURSE")
+            created_user_ids.append(nurse_user_id)
+
+        with TestClient(app) as client:
+            nurse_token = _login(client, nurse_id, nurse_pw)
+            intake_ids.extend([_create_intake(client), _create_intake(client)])
+
+            # AI inside the budget: stored directly, nothing queued
+            fast = _submit_vitals(client, intake_ids[0], nurse_token)
+            assert (fast["source"], fast["fallback"], fast["ai_pending"]) == ("ai", False, False)
+
+            # AI misses the budget: rules now, then the late result upgrades in place
+            slow = _submit_vitals(client, intake_ids[1], nurse_token)
+            assert (slow["source"], slow["fallback"], slow["ai_pending"]) == ("rules", True, True)
+            for _ in range(50):
+                with SessionLocal() as db:
+                    if db.get(PatientIntake, intake_ids[1]).clinical_summary.source == "ai":
+                        break
+                time.sleep(0.05)
+
+        with SessionLocal() as db:
+            assert db.get(PatientIntake, intake_ids[1]).clinical_summary.short_summary == "AI for Test Patient"
+            jobs = db.execute(select(BackgroundJob).where(BackgroundJob.intake_id.in_(intake_ids))).scalars().all()
+            assert [(j.intake_id, j.status) for j in jobs] == [(intake_ids[1], "DONE")]
+            assert jobs[0].run_after > jobs[0].created_at
+    finally:
+        with SessionLocal() as db:
+            db.query(BackgroundJob).filter(BackgroundJob.intake_id.in_(intake_ids)).delete(synchronize_session=False)
+            db.commit()
+            _cleanup(db, intake_ids, created_user_ids)
+
+
+def test_resubmitted_vitals_are_visible_while_ai_summary_runs(monkeypatch):
+    created_user_ids = []
+    intake_ids = []
+    release = threading.Event()
+
+    async def held_ai(payload):
+        while not release.is_set():
+            await asyncio.sleep(0.01)
+        raise RuntimeError("503 UNAVAILABLE")
+
+    monkeypatch.setattr(api_module, "is_gemini_ready", lambda: True)
+    monkeypatch.setattr(api_module, "generate_ai_summary_async", held_ai)
+    monkeypatch.setattr(api_module, "SUMMARY_AI_DEADLINE_SECONDS", 0)
+    try:
+        with SessionLocal() as db:
+            nurse_user_id, nurse_id, nurse_pw = _create_user(db, "NURSE")
+            created_user_ids.append(nurse_user_id)
+
+        with TestClient(app) as client:
+            nurse_token = _login(client, nurse_id, nurse_pw)
+            headers = _auth_headers(nurse_token)
+            intake_ids.append(_create_intake(client))
+            _submit_vitals(client, intake_ids[0], nurse_token)
+            before = client.get(f"/api/intakes/{intake_ids[0]}", headers=headers)
+            assert before.json()["vitals"]["heart_rate"] == 118
+
+            # Gemini now holds the vitals request open past what the nurse waits for
+            monkeypatch.setattr(api_module, "SUMMARY_AI_DEADLINE_SECONDS", 5)
+            vitals = {
+                "heart_rate": 90, "respiratory_rate": 16, "temperature_c": 36.8,
+                "spo2": 99, "systolic_bp": 120, "diastolic_bp": 80,
+            }
+            responses = []
+            submit = threading.Thread(target=lambda: responses.append(
+                client.post(f"/api/intakes/{intake_ids[0]}/vitals", json=vitals, headers=headers)
+            ))
+            submit.start()
+            try:
+                res = None
+                for _ in range(100):
+                    res = client.get(
+                        f"/api/intakes/{intake_ids[0]}",
+                        headers={**headers, "If-None-Match": before.headers["ETag"]},
+                    )
+                    if res.status_code == 200:
+                        break
+                    time.sleep(0.02)
+                assert res.status_code == 200 and res.headers["ETag"] != before.headers["ETag"]
+                assert res.json()["vitals"]["heart_rate"] == 90
+                assert res.json()["has_summary"] is False
+                assert not responses
+            finally:
+                release.set()
+                submit.join(10)
+            assert responses[0].status_code == 200, responses[0].text
+    finally:
+        release.set()
+        with SessionLocal() as db:
+            db.query(BackgroundJob).filter(BackgroundJob.intake_id.in_(intake_ids)).delete(synchronize_session=False)
+            db.commit()
+            _cleanup(db, intake_ids, created_user_ids)
+
+
+def test_late_ai_summary_for_replaced_vitals_is_discarded(monkeypatch):
+    created_user_ids = []
+    intake_ids = []
+    calls = []
+
+    async def fake_ai(payload):
+        calls.append(payload["vitals"]["heart_rate"])
+        if len(calls) > 1:
+            raise RuntimeError("503 UNAVAILABLE")
+        await asyncio.sleep(0.3)
+        return {
+            "short_summary": "AI for the old vitals",
+            "priority_level": "HIGH",
+            "red_flags": [],
+            "differential_considerations": [],
+            "recommended_questions": [],
+            "recommended_next_steps": [],
+        }
+
+    monkeypatch.setattr(api_module, "is_gemini_ready", lambda: True)
+    monkeypatch.setattr(api_module, "generate_ai_summary_async", fake_ai)
+    monkeypatch.setattr(api_module, "SUMMARY_AI_DEADLINE_SECONDS", 0.05)
+    try:
+        with SessionLocal() as db:
+            nurse_user_id, nurse_id, nurse_pw = _create_user(db, "NURSE")
+            created_user_ids.append(nurse_user_id)
+
+        with TestClient(app) as client:
+            nurse_token = _login(client, nurse_id, nurse_pw)
+            intake_ids.append(_create_intake(client))
+            assert _submit_vitals(client, intake_ids[0], nurse_token)["ai_pending"] is True
+            # New vitals while the first Gemini call is still running
+            resubmitted = _submit_vitals(client, intake_ids[0], nurse_token)
+            assert resubmitted["source"] == "rules"
+            for _ in range(50):
+                if not api_module._LATE_SUMMARIES:
+                    break
+                time.sleep(0.05)
+            assert not api_module._LATE_SUMMARIES
+
+        with SessionLocal() as db:
+            summary = db.get(PatientIntake, intake_ids[0]).clinical_summary
+            assert (summary.source, summary.short_summary) == ("rules", resubmitted["short_summary"])
+            jobs = db.execute(
+                select(BackgroundJob).where(BackgroundJob.intake_id == intake_ids[0]).order_by(BackgroundJob.id)
+            ).scalars().all()
+            # Neither job was retired by the stale result; the worker will supersede the first
+            assert [job.status for job in jobs] == ["QUEUED", "QUEUED"]
+            assert summary_jobs_module.run_summary_job(db, jobs[0]) == "superseded"
+    finally:
+        with SessionLocal() as db:
+            db.query(BackgroundJob).filter(BackgroundJob.intake_id.in_(intake_ids)).delete(synchronize_session=False)
+            db.commit()
+            _cleanup(db, intake_ids, created_user_ids)
+
+
+def test_prompt_templates_render_in_one_pass_and_hot_reload(tmp_path):
+    path = tmp_path / "summary.md"
+    path.write_text("Hi {{name}}, age {{age}} {{unknown}}\n", encoding="utf-8")
+    library = PromptLibrary(tmp_path, reload_check_seconds=0)
+
+    template = library.get("summary.md")
+    assert template.placeholders == {"name", "age", "unknown"}
+    # Values are inserted verbatim, even if they look like placeholders
+    assert template.render({"name": "{{age}}", "age": 40}) == "Hi {{age}}, age 40 {{unknown}}"
+    assert library.get("summary.md") is template
+
+    path.write_text("Bye {{name}}", encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert library.get("summary.md").render({"name": "Ann"}) == "Bye Ann"
+
+    assert library.get("missing.md") is None
+    (tmp_path / "blank.md").write_text("  \n", encoding="utf-8")
+    assert library.text("blank.md") is None
+
+    prompt = ai_module.build_prompt({
+        "intake": _intake_payload(history=""),
+        "vitals": {"heart_rate": 118, "respiratory_rate": 22, "temperature_c": 37.9, "spo2": 96,
+                   "systolic_bp": 128, "diastolic_bp": 84},
+    })
+    assert "Chief Complaint: Chest pain" in prompt and "History: None reported" in prompt
+    assert "Blood Pressure: 128/84" in prompt and "{{" not in prompt
+
+
+_STREAMED_SUMMARY = (
+    '```json\n{"short_summary": "Tachycardic \\"chest\\" pain", "priority_level": "HIGH", '
+    '"red_flags": ["HR 118", "SpO2 96%"], "differential_considerations": ["ACS"], '
+    '"recommended_questions": [], "recommended_next_steps": ["ECG now"]}\n```'
+)
+
+
+def test_summary_stream_parser_emits_fields_as_they_complete():
+    parser = SummaryStreamParser()
+    events = []
+    seen_at = {}
+    for index, ch in enumerate(_STREAMED_SUMMARY):
+        for event in parser.feed(ch):
+            events.append(event)
+            seen_at.setdefault(event[0], index)
+    assert events == [
+        ("short_summary", 'Tachycardic "chest" pain', False),
+        ("priority_level", "HIGH", False),
+        ("red_flags", "HR 118", True),
+        ("red_flags", "SpO2 96%", True),
+        ("differential_considerations", "ACS", True),
+        ("recommended_next_steps", "ECG now", True),
+    ]
+    assert parser.finished
+    # The summary is available well before the rest of the object has arrived
+    assert seen_at["short_summary"] < len(_STREAMED_SUMMARY) // 4
+
+
+def test_summary_stream_endpoint_pushes_fields_then_stores_result(monkeypatch):
+    created_user_ids = []
+    intake_ids = []
+
+    async def fake_stream(payload):
+        for start in range(0, len(_STREAMED_SUMMARY), 16):
+            yield _STREAMED_SUMMARY[start:start + 16]
+
+    monkeypatch.setattr(api_module, "is_gemini_ready", lambda: True)
+    monkeypatch.setattr(api_module, "SUMMARY_AI_DEADLINE_SECONDS", 0)
+    monkeypatch.setattr(api_module, "stream_ai_summary_async", fake_stream)
+    try:
+        with SessionLocal() as db:
+            nurse_user_id, nurse_id, nurse_pw = _create_user(db, "NURSE")
+            doctor_user_id, doctor_id, doctor_pw = _create_user(db, "DOCTOR")
+            created_user_ids.extend([nurse_user_id, doctor_user_id])
+
+        with TestClient(app) as client:
+            intake_ids.append(_create_intake(client))
+            assert _submit_vitals(client, intake_ids[0], _login(client, nurse_id, nurse_pw))["source"] == "rules"
+            token = _login(client, doctor_id, doctor_pw)
+            url = f"/api/intakes/{intake_ids[0]}/summary/stream"
+            assert client.get(url).status_code == 401
+
+            def read_events():
+                res = client.get(url, params={"access_token": token})
+                assert res.status_code == 200
+                return [
+                    (block.split("\n")[0][len("event: "):], json.loads(block.split("\n")[1][len("data: "):]))
+                    for block in res.text.strip().split("\n\n")
+                ]
+
+            events = read_events()
+            assert events[0] == ("field", {"field": "short_summary", "value": 'Tachycardic "chest" pain'})
+            assert [e[1]["value"] for e in events if e[0] == "item"][:2] == ["HR 118", "SpO2 96%"]
+            kind, done = events[-1]
+            assert kind == "done" and done["source"] == "ai"
+            assert done["summary"]["recommended_next_steps"] == ["ECG now"]
+
+            # Stored now, so a second stream just replays it
+            events = read_events()
+            assert [e[0] for e in events] == ["done"]
+
+        with SessionLocal() as db:
+            job = db.execute(select(BackgroundJob).where(BackgroundJob.intake_id == intake_ids[0])).scalar_one()
+            assert job.status == "DONE"
+    finally:
+        with SessionLocal() as db:
+            db.query(BackgroundJob).filter(BackgroundJob.intake_id.in_(intake_ids)).delete(synchronize_session=False)
+            db.commit()
+            _cleanup(db, intake_ids, created_user_ids)
+
+
+def test_summary_stream_is_shared_and_defers_to_a_running_job(monkeypatch):
+    created_user_ids = []
+    intake_ids = []
+    calls = []
+
+    async def slow_stream(payload):
+        calls.append(payload["intake"]["full_name"])
+        for start in range(0, len(_STREAMED_SUMMARY), 16):
+            await asyncio.sleep(0.01)
+            yield _STREAMED_SUMMARY[start:start + 16]
+
+    class OpenRequest:
+        async def is_disconnected(self):
+            return False
+
+    async def read(intake_id):
+        blocks = [block async for block in api_module._summary_stream(OpenRequest(), intake_id)]
+        return [(b.split("\n")[0][len("event: "):], json.loads(b.split("\n")[1][len("data: "):])) for b in blocks]
+
+    monkeypatch.setattr(api_module, "is_gemini_ready", lambda: True)
+    monkeypatch.setattr(api_module, "SUMMARY_AI_DEADLINE_SECONDS", 0)
+    monkeypatch.setattr(api_module, "stream_ai_summary_async", slow_stream)
+    monkeypatch.setattr(api_module, "_SUMMARY_POLL_SECONDS", 0.02)
+    try:
+        with SessionLocal() as db:
+            nurse_user_id, nurse_id, nurse_pw = _create_user(db, "NURSE")
+            created_user_ids.append(nurse_user_id)
+        with TestClient(app) as client:
+            nurse_token = _login(client, nurse_id, nurse_pw)
+            intake_ids.extend([_create_intake(client), _create_intake(client)])
+            for intake_id in intake_ids:
+                _submit_vitals(client, intake_id, nurse_token)
+
+        # Two doctors, the second joining mid-stream: one Gemini call, same events for both
+        async def two_doctors():
+            first = asyncio.create_task(read(intake_ids[0]))
+            await asyncio.sleep(0.03)
+            return await asyncio.gather(first, read(intake_ids[0]))
+
+        first, second = asyncio.run(two_doctors())
+        assert first == second
+        assert first[-1][0] == "done" and first[-1][1]["source"] == "ai"
+        assert len(calls) == 1
+        with SessionLocal() as db:
+            job = db.execute(select(BackgroundJob).where(BackgroundJob.intake_id == intake_ids[0])).scalar_one()
+            assert (job.status, job.last_error) == ("DONE", "upgraded by stream")
+
+        # A worker already holds the job: the stream waits for its result instead of calling Gemini
+        with SessionLocal() as db:
+            job = db.execute(select(BackgroundJob).where(BackgroundJob.intake_id == intake_ids[1])).scalar_one()
+            assert jobs_module.claim_job_by_id(db, job.id, "test-worker") is not None
+            job_id = job.id
+
+        def worker_finishes():
+            time.sleep(0.1)
+            with SessionLocal() as db:
+                job = db.get(BackgroundJob, job_id)
+                data = jobs_module.job_payload(job)
+                result = ai_module.parse_summary_output(_STREAMED_SUMMARY)
+                note = summary_jobs_module.upgrade_summary(db, data["summary_id"], intake_ids[1], data["vitals"], result)
+                jobs_module.complete_job(db, job, note)
+                db.commit()
+
+        async def doctor_while_worker_runs():
+            events, _ = await asyncio.gather(read(intake_ids[1]), asyncio.to_thread(worker_finishes))
+            return events
+
+        events = asyncio.run(doctor_while_worker_runs())
+        assert [kind for kind, _ in events] == ["done"]
+        assert events[0][1]["source"] == "ai" and "fallback" not in events[0][1]
+        assert len(calls) == 1
+        assert not api_module._SUMMARY_STREAMS
+    finally:
+        with SessionLocal() as db:
+            db.query(BackgroundJob).filter(BackgroundJob.intake_id.in_(intake_ids)).delete(synchronize_session=False)
+            db.commit()
+            _cleanup(db, intake_ids, created_user_ids)
+
+
+def test_translation_cache_is_shared_bounded_and_expiring(monkeypatch):
+    memory = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    TranslationCacheEntry.__table__.create(memory)
+    factory = sessionmaker(bind=memory)
+
+    worker_a = TranslationCache(max_bytes=30, l1_max_bytes=12, evict_check_every=1, session_factory=factory)
+    worker_b = TranslationCache(max_bytes=30, evict_check_every=1, session_factory=factory)
+
+    worker_a.put("es", "hello", "hola")
+    assert worker_a.get_local("es", "hello") == "hola"
+    # Another process finds it in the shared table, then serves it from L1
+    assert worker_b.get_local("es", "hello") is None
+    assert worker_b.get("es", "hello") == "hola"
+    assert worker_b.get_local("es", "hello") == "hola"
+    assert worker_b.get("fr", "hello") is None
+
+    # L1 is bounded by bytes
+    worker_a.put("es", "x", "123456789")
+    assert worker_a.get_local("es", "hello") is None
+
+    # Shared table: least recently used goes first once over max_bytes
+    assert TranslationCache(session_factory=factory).get("es", "hello") == "hola"
+    worker_a.put("es", "big", "y" * 20)
+    fresh = TranslationCache(session_factory=factory)
+    assert fresh.get("es", "x") is None
+    assert fresh.get("es", "hello") == "hola"
+    assert fresh.stats()["l2_hits"] == 1 and worker_a.stats()["evicted"] == 1
+    assert worker_b.stats()["hit_rate"] == round(2 / 3, 3)
+
+    expired = TranslationCache(ttl=timedelta(0), session_factory=factory)
+    assert expired.get("es", "big") is None
+
+    calls = []
+
+    async def fake_translate(fields, target_language):
+        calls.append(fields)
+        return {key: f"[{target_language}] {value}" for key, value in fields.items()}, True, None
+
+    monkeypatch.setattr(translation_jobs_module, "translate_fields_payload_async", fake_translate)
+    monkeypatch.setattr(translation_jobs_module, "translation_cache", TranslationCache(session_factory=factory))
+    with SessionLocal() as db:
+        doctor_user_id, doctor_id, doctor_pw = _create_user(db, "DOCTOR")
+    try:
+        with TestClient(app) as client:
+            headers = _auth_headers(_login(client, doctor_id, doctor_pw))
+            body = {"language": "es", "fields": {"short_summary": "Chest pain"}}
+            first = client.post("/api/translate", json=body, headers=headers).json()
+            second = client.post("/api/translate", json=body, headers=headers).json()
+            assert first["fields"] == second["fields"] == {"short_summary": "[es] Chest pain"}
+            assert second["cached"] is True
+
+            # A worker that never saw the request still skips Gemini
+            monkeypatch.setattr(translation_jobs_module, "translation_cache", TranslationCache(session_factory=factory))
+            third = client.post("/api/translate", json=body, headers=headers).json()
+            assert third["cached"] is True and len(calls) == 1
+            assert "translation_cache" in client.get("/api/health").json()
+    finally:
+        with SessionLocal() as db:
+            _cleanup(db, [], [doctor_user_id])
+
+
+def test_translate_memoizes_individual_fragments(monkeypatch):
+    memory = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    TranslationCacheEntry.__table__.create(memory)
+    monkeypatch.setattr(translation_jobs_module, "translation_cache", TranslationCache(session_factory=sessionmaker(bind=memory)))
+    sent = []
+
+    async def fake_translate(fields, target_language):
+        sent.append(sorted(fields.values()))
+        return {key: f"<{value}>" for key, value in fields.items()}, True, None
+
+    monkeypatch.setattr(translation_jobs_module, "translate_fields_payload_async", fake_translate)
+    with SessionLocal() as db:
+        doctor_user_id, doctor_id, doctor_pw = _create_user(db, "DOCTOR")
+    try:
+        with TestClient(app) as client:
+            headers = _auth_headers(_login(client, doctor_id, doctor_pw))
+            steps = ["Follow hospital triage protocol.", "Obtain ECG."]
+            first = client.post("/api/translate", headers=headers, json={"language": "es", "fields": {
+                "short_summary": "Chest pain for 2 hours.",
+                "recommended_next_steps": steps + ["Obtain ECG."],
+                "severity": "",
+                "age": 38,
+            }}).json()
+            assert first["translated"] is True and first["cached"] is False
+            assert first["fields"] == {
+                "short_summary": "<Chest pain for 2 hours.>",
+                "recommended_next_steps": ["<Follow hospital triage protocol.>", "<Obtain ECG.>", "<Obtain ECG.>"],
+                "severity": "",
+                "age": 38,
+            }
+            # Duplicates and blanks never reach the model
+            assert sent == [["Chest pain for 2 hours.", "Follow hospital triage protocol.", "Obtain ECG."]]
+
+            # A new note and one new red flag: only those two strings are translated
+            second = client.post("/api/translate", headers=headers, json={"language": "es", "fields": {
+                "short_summary": "Chest pain for 2 hours.",
+                "recommended_next_steps": steps,
+                "red_flags": ["Tachycardia"],
+                "doctor_note": "Admit to observation",
+            }}).json()
+            assert sent[1] == ["Admit to observation", "Tachycardia"]
+            assert second["fields"]["recommended_next_steps"] == ["<Follow hospital triage protocol.>", "<Obtain ECG.>"]
+            assert second["fields"]["red_flags"] == ["<Tachycardia>"]
+
+            third = client.post("/api/translate", headers=headers, json={"language": "es", "fields": {
+                "recommended_next_steps": steps,
+            }}).json()
+            assert third["cached"] is True and len(sent) == 2
+    finally:
+        with SessionLocal() as db:
+            _cleanup(db, [], [doctor_user_id])
+
+
+def test_single_flight_coalesces_identical_concurrent_calls(monkeypatch):
+    import threading
+
+    flights = SingleFlight()
+    calls = []
+    gate = threading.Event()
+
+    def slow(value):
+        calls.append(value)
+        gate.wait(1)
+        if value == "boom":
+            raise RuntimeError("503 UNAVAILABLE")
+        return value.upper()
+
+    results, errors = [], []
+
+    def worker(value):
+        try:
+            results.append(flights.do(value, lambda: slow(value)))
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    threads = [threading.Thread(target=worker, args=(v,)) for v in ["a"] * 4 + ["boom"] * 2]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)
+    gate.set()
+    for thread in threads:
+        thread.join()
+    assert sorted(calls) == ["a", "boom"]
+    assert results == ["A"] * 4 and len(errors) == 2
+    assert flights.stats() == {"in_flight": 0, "calls": 2, "coalesced": 4}
+    # Nothing is cached once the call is done
+    assert flights.do("a", lambda: slow("a")) == "A" and len(calls) == 3
+
+    # Identical translations over the async client share one Gemini call
+    class FakeResponse:
+        def __init__(self, text):
+            self.text = text
+
+    class FakeModels:
+        def __init__(self):
+            self.prompts = []
+
+        async def generate_content(self, model, contents):
+            self.prompts.append(contents)
+            await asyncio.sleep(0.05)
+            return FakeResponse(json.dumps({"symptoms": "Fever"}))
+
+    class FakeClient:
+        def __init__(self):
+            self.aio = type("Aio", (), {"models": FakeModels()})()
+
+    client = FakeClient()
+    monkeypatch.setattr(ai_module, "GENAI_CLIENT", client)
+    monkeypatch.setattr(ai_module, "is_gemini_ready", lambda: True)
+    monkeypatch.setattr(ai_module, "GEMINI_FLIGHTS", SingleFlight())
+
+    async def translate_together():
+        same = [ai_module.translate_fields_payload_async({"symptoms": "Fiebre"}, "English") for _ in range(3)]
+        other = ai_module.translate_fields_payload_async({"symptoms": "Tos"}, "English")
+        return await asyncio.gather(*same, other)
+
+    outcomes = asyncio.run(translate_together())
+    assert [fields for fields, ok, _ in outcomes[:3]] == [{"symptoms": "Fever"}] * 3
+    assert len(client.aio.models.prompts) == 2
+    assert ai_module.GEMINI_FLIGHTS.stats()["coalesced"] == 2
+
+
+def test_new_ai_summary_is_pretranslated_for_doctor_languages(monkeypatch):
+    memory = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    TranslationCacheEntry.__table__.create(memory)
+    monkeypatch.setattr(translation_jobs_module, "translation_cache", TranslationCache(session_factory=sessionmaker(bind=memory)))
+    created_user_ids = []
+    intake_ids = []
+    try:
+        with SessionLocal() as db:
+            doctor_user_id, doctor_id, doctor_pw = _create_user(db, "DOCTOR")
+            nurse_user_id, nurse_id, nurse_pw = _create_user(db, "NURSE")
+            created_user_ids += [doctor_user_id, nurse_user_id]
+
+        with TestClient(app) as client:
+            headers = _auth_headers(_login(client, doctor_id, doctor_pw))
+            assert client.patch("/auth/me", headers=headers, json={"preferred_language": "de"}).status_code == 422
+            res = client.patch("/auth/me", headers=headers, json={"preferred_language": "es"})
+            assert res.status_code == 200 and res.json()["preferred_language"] == "es"
+            login = client.post("/auth/login", json={"staff_id": doctor_id, "password": doctor_pw}).json()
+            assert login["preferred_language"] == "es"
+
+            intake_ids.append(_create_intake(client))
+            summary = _submit_vitals(client, intake_ids[0], _login(client, nurse_id, nurse_pw))
+            assert summary["source"] == "rules"
+
+            ai_result = {
+                "short_summary": "Possible acute coronary syndrome.",
+                "priority_level": "HIGH",
+                "red_flags": ["Tachycardia"],
+                "differential_considerations": ["ACS"],
+                "recommended_questions": ["Radiation?"],
+                "recommended_next_steps": ["ECG"],
+            }
+            monkeypatch.setattr(translation_jobs_module, "is_gemini_ready", lambda: True)
+            with SessionLocal() as db:
+                intake = db.get(PatientIntake, intake_ids[0])
+                fingerprint = summary_jobs_module.vitals_fingerprint(intake.vitals)
+                assert summary_jobs_module.upgrade_summary(
+                    db, intake.clinical_summary.id, intake_ids[0], fingerprint, ai_result
+                ) == "upgraded"
+                db.commit()
+                job = db.execute(
+                    select(BackgroundJob).where(BackgroundJob.intake_id == intake_ids[0])
+                ).scalar_one()
+                assert job.kind == translation_jobs_module.PRETRANSLATE_JOB
+                assert job.priority == translation_jobs_module.PRETRANSLATE_PRIORITY_OFFSET
+
+                sent = []
+
+                def fake_translate(fields, target_language):
+                    sent.append(target_language)
+                    return {key: f"<{value}>" for key, value in fields.items()}, True, None
+
+                monkeypatch.setattr(translation_jobs_module, "translate_fields_payload", fake_translate)
+                note = translation_jobs_module.run_pretranslate_job(db, job)
+                assert "es" in sent and note.startswith("warmed")
+
+            async def no_gemini(fields, target_language):
+                raise AssertionError("pre-translated case must be served from the cache")
+
+            monkeypatch.setattr(translation_jobs_module, "translate_fields_payload_async", no_gemini)
+            detail = client.get(f"/api/intakes/{intake_ids[0]}", headers=headers).json()
+            # Same payload doctor.js builds when the case is opened in Spanish
+            fields = {
+                "chief_complaint": detail["chief_complaint"],
+                "symptoms": detail["symptoms"],
+                "duration": detail["duration"],
+                "severity": detail["severity"],
+                "history": detail["history"] or "None reported",
+                "medications": detail["medications"] or "None reported",
+                "allergies": detail["allergies"] or "None reported",
+                "short_summary": detail["clinical_summary"]["short_summary"],
+                "red_flags": detail["clinical_summary"]["red_flags"],
+                "differential": detail["clinical_summary"]["differential"],
+                "recommended_questions": detail["clinical_summary"]["recommended_questions"],
+                "recommended_next_steps": detail["clinical_summary"]["recommended_next_steps"],
+            }
+            view = client.post("/api/translate", headers=headers, json={"language": "es", "fields": fields}).json()
+            assert view["translated"] is True and view["cached"] is True
+            assert view["fields"]["short_summary"] == "<Possible acute coronary syndrome.>"
+            assert view["fields"]["red_flags"] == ["<Tachycardia>"]
+    finally:
+        with SessionLocal() as db:
+            db.query(BackgroundJob).filter(BackgroundJob.intake_id.in_(intake_ids)).delete(synchronize_session=False)
+            db.commit()
+            _cleanup(db, intake_ids, created_user_ids)
+
+
+def test_local_language_detection_skips_text_already_in_target(monkeypatch):
+    detector = LanguageDetector()
+    assert detector.detect("Chest tightness with mild shortness of breath") == "en"
+    assert detector.detect("Tengo fiebre y dolor de cabeza desde ayer") == "es"
+    assert detector.detect("J'ai de la fièvre et mal à la tête") == "fr"
+    assert detector.detect("Estou com febre e dor de cabeça") == "pt"
+    assert detector.detect("ألم في الصدر منذ ساعتين") == "ar"
+    assert detector.detect("2 hours") is None
+
+    memory = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    TranslationCacheEntry.__table__.create(memory)
+    monkeypatch.setattr(translation_jobs_module, "translation_cache", TranslationCache(session_factory=sessionmaker(bind=memory)))
+    sent = []
+
+    async def fake_translate(fields, target_language):
+        sent.append(sorted(fields.values()))
+        return {key: f"<{value}>" for key, value in fields.items()}, True, None
+
+    monkeypatch.setattr(translation_jobs_module, "translate_fields_payload_async", fake_translate)
+    monkeypatch.setattr(translation_jobs_module, "is_gemini_ready", lambda: True)
+    created_user_ids = []
+    intake_ids = []
+    try:
+        with SessionLocal() as db:
+            doctor_user_id, doctor_id, doctor_pw = _create_user(db, "DOCTOR")
+            created_user_ids.append(doctor_user_id)
+        with TestClient(app) as client:
+            headers = _auth_headers(_login(client, doctor_id, doctor_pw))
+            res = client.post("/api/translate", headers=headers, json={"language": "es", "fields": {
+                "symptoms": "Tengo fiebre y dolor de cabeza desde ayer",
+                "short_summary": "Chest tightness with mild shortness of breath",
+            }}).json()
+            assert sent == [["Chest tightness with mild shortness of breath"]]
+            assert res["fields"]["symptoms"] == "Tengo fiebre y dolor de cabeza desde ayer"
+
+            # Spanish picked in the form but typed in English: nothing to translate
+            res = client.post("/api/intakes", json=_intake_payload(preferred_language="es"))
+            intake_ids.append(res.json()["id"])
+            # No language given: detected from the text
+            spanish = _intake_payload(
+                chief_complaint="Dolor en el pecho",
+                symptoms="Tengo dolor en el pecho desde esta mañana y me falta el aire",
+            )
+            res = client.post("/api/intakes", json=spanish)
+            intake_ids.append(res.json()["id"])
+
+            english, detected = (client.get(f"/api/intakes/{i}", headers=headers).json() for i in intake_ids)
+            assert (english["preferred_language"], english["translation_status"]) == ("es", "NOT_NEEDED")
+            assert (detected["preferred_language"], detected["translation_status"]) == ("es", "PENDING")
+        with SessionLocal() as db:
+            queued = db.execute(
+                select(BackgroundJob.intake_id).where(BackgroundJob.intake_id.in_(intake_ids))
+            ).scalars().all()
+            assert queued == [intake_ids[1]]
+    finally:
+        with SessionLocal() as db:
+            db.query(BackgroundJob).filter(BackgroundJob.intake_id.in_(intake_ids)).delete(synchronize_session=False)
+            db.commit()
+            _cleanup(db, intake_ids, created_user_ids)
+
+
+def test_large_fields_payload_is_translated_in_parallel_chunks(monkeypatch):
+    prompts = []
+    running = 0
+    peak = 0
+
+    async def fake_generate(prompt):
+        nonlocal running, peak
+        chunk = json.loads(prompt.split("JSON:\n", 1)[1])
+        prompts.append(sorted(chunk))
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.02)
+        running -= 1
+        if "history" in chunk and prompts.count(sorted(chunk)) == 1:
+            return '{"history": "truncated'
+        return json.dumps({key: f"EN {value}" for key, value in chunk.items()})
+
+    monkeypatch.setattr(ai_module, "is_gemini_ready", lambda: True)
+    monkeypatch.setattr(ai_module, "_generate_text_async", fake_generate)
+    monkeypatch.setattr(ai_module, "_FIELDS_RETRY_SECONDS", 0)
+    monkeypatch.setattr(ai_module, "_FIELDS_CHUNK_CHARS", 120)
+
+    fields = {"symptoms": "s" * 100, "history": "h" * 100, "medications": "m" * 40, "allergies": "a" * 40}
+    translated, ok, reason = asyncio.run(ai_module.translate_fields_payload_async(fields, "English"))
+
+    assert ok and reason is None
+    assert translated == {key: f"EN {value}" for key, value in fields.items()}
+    # Three chunks at once; only the malformed one was sent again
+    assert sorted(map(tuple, prompts)) == [("allergies", "medications"), ("history",), ("history",), ("symptoms",)]
+    assert peak == 3
+
+    # A chunk that keeps failing fails the call, but the other chunks' work is returned
+    async def history_down(prompt):
+        chunk = json.loads(prompt.split("JSON:\n", 1)[1])
+        if "history" in chunk:
+            raise RuntimeError("503 UNAVAILABLE")
+        return json.dumps({key: f"EN {value}" for key, value in chunk.items()})
+
+    monkeypatch.setattr(ai_module, "_generate_text_async", history_down)
+    translated, ok, reason = asyncio.run(ai_module.translate_fields_payload_async(fields, "English"))
+    assert (ok, reason) == (False, "service_unavailable")
+    assert translated["history"] == fields["history"]
+    assert translated["symptoms"] == f"EN {fields['symptoms']}"